@@ -7,7 +7,6 @@ from pathlib import Path
 
 import click
 import rich.logging
-from mlf_core.common.load_yaml import load_yaml_file
 from mlf_core.custom_cli.click import (
     CustomArg,
     CustomHelpSubcommand,
@@ -15,23 +14,18 @@ from mlf_core.custom_cli.click import (
     print_mlfcore_version,
     print_project_version,
 )
-from mlf_core.custom_cli.questionary import mlf_core_questionary_or_dot_mlf_core
 from rich import print, traceback
 
-from mlf_core.bump_version.bump_version import VersionBumper
-from mlf_core.config.config import ConfigCommand
-from mlf_core.create.create import choose_domain
-from mlf_core.info.info import TemplateInfo
-from mlf_core.lint.lint import lint_project
-from mlf_core.list.list import TemplateLister
-from mlf_core.sync.sync import TemplateSync
-from mlf_core.upgrade.upgrade import UpgradeCommand
+# The modules of the subcommands pull in heavy dependencies like GitPython, PyGithub and cookiecutter.
+# They are therefore only imported by the invoked command to keep the startup of mlf-core fast.
 
 WD = os.path.dirname(__file__)
 log = logging.getLogger()
 
 
 def main():
+    from mlf_core.upgrade.upgrade import BackgroundUpgradeCheck
+
     traceback.install(width=200, word_wrap=True)
     print(
         r"""[bold blue]
@@ -46,10 +40,13 @@ def main():
 
     print("[bold blue]Run [green]mlf-core --help [blue]for an overview of all commands\n")
 
-    # Is the latest mlf-core version installed? Upgrade if not!
-    if not UpgradeCommand.check_mlf_core_latest():
-        print("[bold blue]Run [green]mlf-core upgrade [blue]to get the latest version.")
-    mlf_core_cli()
+    # Is the latest mlf-core version installed? Checked concurrently with the command and reported afterwards.
+    upgrade_check = BackgroundUpgradeCheck().start() if BackgroundUpgradeCheck.is_enabled() else None
+    try:
+        mlf_core_cli()
+    finally:
+        if upgrade_check is not None:
+            upgrade_check.report()
 
 
 @click.group(cls=HelpErrorHandling)
@@ -96,7 +93,16 @@ def mlf_core_cli(ctx, verbose, log_file):
     type=click.Choice(["cli", "lib", "gui", "web", "pub"]),
     help="The projects domain with currently cli, lib, gui, web and pub supported.",
 )
-def create(path: Path, domain: str) -> None:
+@click.option(
+    "--batch",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Create all projects listed in the projects section of this YAML file in PATH without any prompts.",
+)
+@click.option(
+    "--workers", "-w", type=click.IntRange(min=1), default=4, help="Number of projects of a batch created concurrently."
+)
+@click.option("--lint", "lint_projects", is_flag=True, help="Lint every project of a batch after creating it.")
+def create(path: Path, domain: str, batch, workers, lint_projects) -> None:
     """
     Create a new project using one of our templates.
 
@@ -105,19 +111,68 @@ def create(path: Path, domain: str) -> None:
     Template specific prompts follow. If you do not yet have a mlf-core config file you may be asked to create one first.
     Next, you will be asked whether you want to use mlf-core's Github support create a repository, push your template and enable a few settings.
     After the project has been created it will be linted and you will be notified of any TODOs.
+    Pass --batch to create many projects at once from a YAML file, which are only linted if --lint is passed.
     """
+    if batch:
+        from mlf_core.create.batch_create import BatchCreate
+
+        log.debug(f"Creating all projects of the batch file {batch} with {workers} workers.")
+        BatchCreate(batch, path, workers=workers, lint=lint_projects).create()
+        sys.exit(0)
+
+    from mlf_core.create.create import choose_domain
+
     choose_domain(path, domain, None)
 
 
 @mlf_core_cli.command(short_help="Lint your existing mlf-core project.", cls=CustomHelpSubcommand)
 @click.argument(  # type: ignore
-    "project_dir",
+    "project_dirs",
     type=click.Path(),
-    default=Path(str(Path.cwd())),
-    helpmsg="Relative path to projects directory.",
+    nargs=-1,
+    helpmsg="Relative paths to the projects directories. Default is the current working directory.",
     cls=CustomArg,
 )
-def lint(project_dir) -> None:
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of lint checks to run concurrently. Defaults to a worker count based on the available CPUs.",
+)
+@click.option("--offline", is_flag=True, help="Do not query PyPI or Anaconda and only use cached package metadata.")
+@click.option(
+    "--package-snapshot",
+    "-ps",
+    type=click.Path(),
+    default=None,
+    help="Use a local package snapshot instead of PyPI and Anaconda. Defaults to $MLF_CORE_PACKAGE_SNAPSHOT.",
+)
+@click.option(
+    "--incremental",
+    "-i",
+    is_flag=True,
+    help="Only rerun checks whose input files changed. Results are cached in .mlf_core_lint_cache inside the project.",
+)
+@click.option(
+    "--format",
+    "-f",
+    "output_format",
+    type=click.Choice(["text", "json", "sarif"]),
+    default="text",
+    help="Format of the lint results.",
+)
+@click.option(
+    "--output", "-o", type=click.Path(dir_okay=False), default=None, help="Write JSON or SARIF results to a file."
+)
+@click.option(
+    "--processes",
+    "-p",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of projects to lint concurrently. Defaults to the number of CPUs.",
+)
+def lint(project_dirs, jobs, offline, package_snapshot, incremental, output_format, output, processes) -> None:
     """
     Lint your existing mlf-core project.
 
@@ -126,8 +181,68 @@ def lint(project_dir) -> None:
     Examples include a consistent project version, the existence of documentation and whether cookiecutter statements are still left.
     Afterwards, template specific linting is invoked. cli-python for example may check for the existence of a setup.py file.
     Both results are collected and displayed.
+    Independent checks run concurrently, which can be controlled using --jobs.
+    Package metadata is cached on disk. Pass --offline to not query PyPI or Anaconda at all.
+    Alternatively, pass a package snapshot created by package-snapshot to lint without network access.
+    Pass --incremental to replay the cached results of all checks whose input files did not change.
+    Several projects may be passed at once, which are linted concurrently in separate processes.
+    Results can be written as JSON or SARIF for further processing using --format and --output.
+    """
+    from mlf_core.lint.lint import lint_project, lint_projects, print_lint_results_of_projects
+    from mlf_core.lint.report import lint_results_to_json, lint_results_to_sarif
+
+    project_dirs = [str(project_dir) for project_dir in project_dirs] or [str(Path.cwd())]
+    if output_format == "text" and len(project_dirs) == 1:
+        lint_project(project_dirs[0], jobs, offline, package_snapshot, incremental)
+        return
+
+    results = lint_projects(project_dirs, processes, jobs, offline, package_snapshot, incremental)
+    if output_format == "text":
+        print_lint_results_of_projects(results)
+    else:
+        report = lint_results_to_json(results) if output_format == "json" else lint_results_to_sarif(results)
+        if output:
+            Path(output).write_text(report)
+            print(f"[bold blue]Wrote {output_format.upper()} lint results of {len(results)} projects to {output}")
+        else:
+            click.echo(report)
+    if not all(result.ok for result in results):
+        sys.exit(1)
+
+
+@mlf_core_cli.command(
+    short_help="Create or refresh a local snapshot of the latest package versions for offline linting.",
+    cls=CustomHelpSubcommand,
+)
+@click.argument(  # type: ignore
+    "project_dirs",
+    type=click.Path(exists=True, file_okay=False),
+    nargs=-1,
+    helpmsg="Projects whose dependencies should be added to the snapshot.",
+    cls=CustomArg,
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Path of the snapshot. Defaults to $MLF_CORE_PACKAGE_SNAPSHOT or the mlf-core configuration directory.",
+)
+def package_snapshot(project_dirs, output) -> None:
     """
-    lint_project(project_dir)
+    Create or refresh a local snapshot of the latest versions of PyPI and conda packages.
+
+    All packages already contained in the snapshot are refreshed and the dependencies of all passed projects are added.
+    Lint can then use the snapshot instead of PyPI and Anaconda by passing --package-snapshot or
+    by setting the MLF_CORE_PACKAGE_SNAPSHOT environment variable, for example on build nodes without internet access.
+    """
+    from mlf_core.lint.package_index import PACKAGE_SNAPSHOT_ENV_VAR, PACKAGE_SNAPSHOT_PATH, refresh_package_snapshot
+
+    snapshot_path = output or os.environ.get(PACKAGE_SNAPSHOT_ENV_VAR) or PACKAGE_SNAPSHOT_PATH
+    refreshed, failed = refresh_package_snapshot(snapshot_path, project_dirs)
+    print(f"[bold blue]Refreshed {refreshed} packages in package snapshot {snapshot_path}")
+    if failed:
+        print(f"[bold yellow]{failed} packages could not be looked up and kept their previous version.")
 
 
 @mlf_core_cli.command(short_help="List all available mlf-core templates.", cls=CustomHelpSubcommand)
@@ -139,6 +254,8 @@ def list() -> None:
     The output only consists of a short description for all templates.
     To get a detailed overview of a specific subset of templates use info.
     """
+    from mlf_core.list.list import TemplateLister
+
     TemplateLister.list_available_templates()
 
 
@@ -155,6 +272,8 @@ def info(ctx, handle: str) -> None:
     Info provides a long description for a specific subset of templates.
     Pass a domain, language or full handle (e.g. cli-python).
     """
+    from mlf_core.info.info import TemplateInfo
+
     if not handle:
         HelpErrorHandling.args_not_provided(ctx, "info")
     else:
@@ -190,16 +309,34 @@ def info(ctx, handle: str) -> None:
 @click.option(
     "--check-update", "-ch", is_flag=True, help="Check whether a new template version is available for your project."
 )
-def sync(project_dir, set_token, pat, username, check_update) -> None:
+@click.option(
+    "--fleet",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Sync all local project clones listed in the projects section of this YAML manifest instead of PROJECT_DIR.",
+)
+@click.option(
+    "--workers", "-w", type=click.IntRange(min=1), default=8, help="Number of projects of a fleet synced concurrently."
+)
+def sync(project_dir, set_token, pat, username, check_update, fleet, workers) -> None:
     """
     Sync your project with the latest template release.
     mlf_core regularly updates its templates.
     To ensure that you have the latest changes you can invoke sync, which submits a pull request to your Github repository (if existing).
     If no repository exists the TEMPLATE branch will be updated and you can merge manually.
     """
+    from mlf_core.common.load_yaml import load_yaml_file_read_only
+    from mlf_core.sync.sync import TemplateSync
+
+    if fleet:
+        from mlf_core.sync.fleet_sync import FleetSync
+
+        log.debug(f"Syncing all projects of the fleet manifest {fleet} with {workers} workers.")
+        FleetSync(fleet, workers=workers, token=pat, gh_username=username).sync()
+        sys.exit(0)
+
     project_dir_path = Path(project_dir).resolve()
     log.debug(f"Loading project information from .mlf_core.yml file located at {project_dir}")
-    project_data = load_yaml_file(f"{project_dir}/.mlf_core.yml")
+    project_data = load_yaml_file_read_only(f"{project_dir}/.mlf_core.yml")
     log.debug(f"Set project top level path to given path argument {project_dir_path}")
     # if set_token flag is set, update the sync token value and exit
     if set_token:
@@ -289,6 +426,17 @@ def sync(project_dir, set_token, pat, username, check_update) -> None:
     cls=CustomArg,
 )
 @click.option("--downgrade", "-d", is_flag=True, help="Set this flag to downgrade a version.")
+@click.option("--dry-run", is_flag=True, help="Print the diff of all changes without changing any file.")
+@click.option(
+    "--batch", is_flag=True, help="Bump all mlf-core projects below the path, for example of a monorepo, at once."
+)
+@click.option(
+    "--processes",
+    "-p",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of projects to bump concurrently in batch mode. Defaults to the number of CPUs.",
+)
 @click.option(
     "--project-version",
     is_flag=True,
@@ -298,7 +446,7 @@ def sync(project_dir, set_token, pat, username, check_update) -> None:
     help="Print your projects version and exit",
 )
 @click.pass_context
-def bump_version(ctx, new_version, project_dir, downgrade) -> None:
+def bump_version(ctx, new_version, project_dir, downgrade, dry_run, batch, processes) -> None:
     """
     Bump the version of an existing mlf-core project.
 
@@ -310,7 +458,14 @@ def bump_version(ctx, new_version, project_dir, downgrade) -> None:
 
     Unless the user uses downgrade mode via the -d flag, a downgrade of a version is never allowed. Note that bump-version with the new version
     equals the current version is never allowed, either with or without -d.
+
+    All files are only written once every change is known and are rolled back if writing any of them fails.
+    Using --dry-run prints the diff of all changes instead.
+    Using --batch bumps all mlf-core projects below the path concurrently and commits them at once.
     """
+    from mlf_core.bump_version.bump_version import VersionBumper, bump_projects
+    from mlf_core.custom_cli.questionary import mlf_core_questionary_or_dot_mlf_core
+
     if not new_version:
         HelpErrorHandling.args_not_provided(ctx, "bump-version")
     else:
@@ -318,6 +473,10 @@ def bump_version(ctx, new_version, project_dir, downgrade) -> None:
         if str(project_dir).endswith("/"):
             project_dir = Path(str(project_dir).replace(str(project_dir)[len(str(project_dir)) - 1 :], ""))
 
+        if batch:
+            bump_projects(str(project_dir), new_version, downgrade, dry_run, processes)
+            return
+
         version_bumper = VersionBumper(project_dir, downgrade)
         # lint before run bump-version
         version_bumper.lint_before_bump()
@@ -329,7 +488,7 @@ def bump_version(ctx, new_version, project_dir, downgrade) -> None:
                 if version_bumper.check_bump_range(
                     version_bumper.CURRENT_VERSION.split("-")[0], new_version.split("-")[0]
                 ):
-                    version_bumper.bump_template_version(new_version, project_dir)
+                    version_bumper.bump_template_version(new_version, project_dir, dry_run)
                 elif mlf_core_questionary_or_dot_mlf_core(
                     function="confirm",
                     question=f"Bumping from {version_bumper.CURRENT_VERSION} to {new_version} seems not reasonable.\n"
@@ -337,9 +496,9 @@ def bump_version(ctx, new_version, project_dir, downgrade) -> None:
                     default="n",
                 ):
                     print("\n")
-                    version_bumper.bump_template_version(new_version, project_dir)
+                    version_bumper.bump_template_version(new_version, project_dir, dry_run)
             else:
-                version_bumper.bump_template_version(new_version, project_dir)
+                version_bumper.bump_template_version(new_version, project_dir, dry_run)
         else:
             sys.exit(1)
 
@@ -360,6 +519,8 @@ def config(ctx, view: bool, section: str) -> None:
     - pat: set your Github personal access token for Github repository creation
     - all: calls general and pat
     """
+    from mlf_core.config.config import ConfigCommand
+
     if view:
         ConfigCommand.view_current_config()
         sys.exit(0)
@@ -419,6 +580,8 @@ def upgrade() -> None:
     Checks whether the locally installed version of mlf-core is the latest.
     If not pip will be invoked to upgrade mlf-core to the latest version.
     """
+    from mlf_core.upgrade.upgrade import UpgradeCommand
+
     UpgradeCommand.check_upgrade_mlf_core()
 
 
@@ -1,24 +1,189 @@
+import difflib
+import io
 import logging
 import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from configparser import ConfigParser
+from dataclasses import dataclass, field
 from datetime import datetime
-from os import fdopen, remove
+from functools import partial
 from pathlib import Path
-from shutil import copymode, move
-from tempfile import mkstemp
-from typing import Tuple
+from typing import Dict, List, Optional, Tuple
 
-from git import Repo
+from git import InvalidGitRepositoryError, NoSuchPathError, Repo
+from mlf_core.common.version import VERSION_PATTERN
+from mlf_core.common.version_index import VersionOccurrence, load_version_index, scan_versions
 from mlf_core.create.github_support import is_git_repo
 from mlf_core.custom_cli.questionary import mlf_core_questionary_or_dot_mlf_core
 from mlf_core.lint.template_linter import TemplateLinter
+from mlf_core.util.dir_util import write_file_atomically
+from mlf_core.util.rich import console
 from packaging import version
 from rich import print
+from rich.text import Text
 
 log = logging.getLogger(__name__)
 
+# maximum number of files, which are bumped concurrently
+MAX_CONCURRENT_BUMPS = 16
+DOWNGRADE_CHANGELOG_WARNING = (
+    "[bold yellow]WARNING: Running bump-version in downgrade mode will not add a new changelog section currently!"
+)
+
+
+@dataclass
+class FileBump:
+    """
+    The result of bumping the versions of a single file.
+    """
+
+    file_path: str
+    changed_lines: List[Tuple[str, str]] = field(default_factory=list)  # pairs of the original and the bumped line
+    content: str = ""  # the original content of the file
+    bumped_content: str = ""  # the content of the file with all versions bumped
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.changed_lines)
+
+
+def bump_file(
+    file_path: str, new_version: str, blacklisted: bool, occurrences: Optional[List[VersionOccurrence]] = None
+) -> FileBump:
+    """
+    Bump all versions of a file in a single pass. The file itself is not written, the bumped content is returned instead.
+    Files without versions to bump according to their indexed version occurrences are not read at all.
+
+    :param file_path: The path of the file where the version should be updated
+    :param new_version: The new version that replaces the old one
+    :param blacklisted: Whether the file is blacklisted, so only lines marked with <<MLF-CORE_FORCE_BUMP>> are bumped
+    :param occurrences: The indexed version occurrences of the file or None to scan the file
+    :return: The bumped lines and content of the file (if any line was bumped)
+    """
+    bump = FileBump(file_path)
+    if occurrences is not None and not any(occurrence.is_bumped(blacklisted) for occurrence in occurrences):
+        return bump
+
+    with open(file_path, newline="") as file:
+        bump.content = bump.bumped_content = file.read()
+    lines = list(io.StringIO(bump.content, newline=""))
+    # rescan the file if it changed after it was indexed
+    if occurrences is None or any(
+        len(lines) < occurrence.line_number or lines[occurrence.line_number - 1] != occurrence.line
+        for occurrence in occurrences
+    ):
+        occurrences = scan_versions(bump.content)
+
+    for occurrence in occurrences:
+        # update version if tags were found (and were in the right section)
+        if occurrence.is_bumped(blacklisted):
+            line = lines[occurrence.line_number - 1]
+            bumped_line = VERSION_PATTERN.sub(new_version, line)
+            if bumped_line != line:
+                bump.changed_lines.append((line, bumped_line))
+                lines[occurrence.line_number - 1] = bumped_line
+    if bump.changed:
+        bump.bumped_content = "".join(lines)
+    return bump
+
+
+class BumpTransaction:
+    """
+    Stages the new contents of all files changed by a version bump, so that nothing is written before all changes are known.
+    Committing writes all staged files. If writing any of them fails, all files written so far are restored from a journal
+    of their original contents, so that a project is never left partially bumped.
+    """
+
+    def __init__(self, project_dir: str):
+        """
+        :param project_dir: The top level directory of the project, which the paths of the diff are relative to
+        """
+        self.project_dir = os.path.abspath(project_dir)
+        # the original and the new content of all staged files by their absolute path in the order they were staged
+        self.staged: Dict[str, Tuple[str, str]] = {}
+
+    def read(self, file_path: str) -> str:
+        """
+        :param file_path: Path to the file
+        :return: The staged content of the file or its current content if no changes are staged
+        """
+        file_path = os.path.abspath(file_path)
+        if file_path in self.staged:
+            return self.staged[file_path][1]
+        with open(file_path, newline="") as file:
+            return file.read()
+
+    def stage(self, file_path: str, content: str) -> None:
+        """
+        Stage the new content of a file replacing any previously staged content.
+
+        :param file_path: Path to the file
+        :param content: The new content of the file
+        """
+        file_path = os.path.abspath(file_path)
+        original = self.staged[file_path][0] if file_path in self.staged else self.read(file_path)
+        if content == original:
+            self.staged.pop(file_path, None)
+        else:
+            self.staged[file_path] = (original, content)
+
+    @property
+    def changed_files(self) -> List[str]:
+        """
+        The absolute paths of all files with staged changes
+        """
+        return list(self.staged)
+
+    def diff(self) -> str:
+        """
+        :return: The unified diff of all staged changes
+        """
+        diff = []
+        for file_path, (original, content) in self.staged.items():
+            relative_path = os.path.relpath(file_path, self.project_dir)
+            for line in difflib.unified_diff(
+                original.splitlines(keepends=True),
+                content.splitlines(keepends=True),
+                fromfile=f"a/{relative_path}",
+                tofile=f"b/{relative_path}",
+            ):
+                diff.append(line if line.endswith("\n") else f"{line}\n\\ No newline at end of file\n")
+        return "".join(diff)
+
+    def update(self, transaction: "BumpTransaction") -> None:
+        """
+        Stage all changes of another transaction, for example of another project.
+
+        :param transaction: The other transaction
+        """
+        self.staged.update(transaction.staged)
+
+    def commit(self) -> None:
+        """
+        Write all staged changes concurrently. Every file is replaced atomically and its original content is journaled before,
+        so that all files can be rolled back if writing any file fails.
+        """
+        journal: List[Tuple[str, bytes]] = []
+
+        def write(file_path: str, content: str) -> None:
+            with open(file_path, "rb") as file:
+                journal.append((file_path, file.read()))
+            write_file_atomically(file_path, content)
+
+        try:
+            # leaving the executor waits for all writes, so that none is still running when rolling back
+            with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_BUMPS) as executor:
+                writes = [executor.submit(write, file_path, content) for file_path, (_, content) in self.staged.items()]
+            for future in writes:
+                future.result()
+        except BaseException:
+            log.debug(f"Rolling back {len(journal)} files.")
+            for file_path, original in reversed(journal):
+                write_file_atomically(file_path, original)
+            raise
+
 
 class VersionBumper:
     """
@@ -32,9 +197,11 @@ class VersionBumper:
         self.downgrade_mode = downgrade
         self.top_level_dir = project_dir
 
-    def bump_template_version(self, new_version: str, project_dir: Path) -> None:
+    def bump_template_version(self, new_version: str, project_dir: Path, dry_run: bool = False) -> None:
         """
         Update the version number for all files that are whitelisted in the config file.
+        All changes are staged first and only written, if every file could be bumped. If writing any file fails, all
+        files are rolled back. The written files are then committed at once, if the project is a git repository.
 
         INFO on valid versions: All versions must match the format like 1.0.0 or 1.1.0-SNAPSHOT; these are the only valid
         version formats mlf-core allows. A valid version therefore contains a three digits (in the range from 0 to however large it will grow)
@@ -46,113 +213,118 @@ class VersionBumper:
         :param project_dir: The default value is the current working directory, so we´re initially assuming the user
                              bumps the version from the projects top level directory. If this is not the case this parameter
                              shows the path where the projects top level directory is and bumps the version there
+        :param dry_run: Whether to only print the diff of all changes without writing or committing any file
         """
         log.debug(f"Current version: {self.CURRENT_VERSION} --- New version: {new_version}")
-        sections = ["bumpversion_files_whitelisted", "bumpversion_files_blacklisted"]
-
-        # if project_dir was given as handle use cwd since we need it for git add
-        ct_cfg_path = (
-            f"{str(project_dir)}/mlf_core.cfg"
-            if str(project_dir).startswith(str(Path.cwd()))
-            else f"{str(Path.cwd())}/{project_dir}/mlf_core.cfg"
-        )
-        # path to CHANGELOG.rst file
-        changelog_path = (
-            f"{str(project_dir)}/CHANGELOG.rst"
-            if str(project_dir).startswith(str(Path.cwd()))
-            else f"{str(Path.cwd())}/{project_dir}/CHANGELOG.rst"
-        )
-
-        # keep path of all files that were changed during bump version
-        changed_files = [ct_cfg_path, changelog_path]
 
         print(
             f"[bold blue]Changing version number.\nCurrent version is {self.CURRENT_VERSION}."
             f"\nNew version will be {new_version}\n"
         )
 
-        # for each section (whitelisted and blacklisted files) bump the version (if allowed)
-        for section in sections:
-            log.debug(f"Bumping files of section: {section}.")
-            for _, path in self.parser.items(section):
-                not_changed, file_path = self.replace(f"{project_dir}/{path}", new_version, section)
-                # only add file if the version(s) in the file were bumped
-                if not not_changed:
-                    path_changed = (
-                        file_path if file_path.startswith(str(Path.cwd())) else f"{str(Path.cwd())}/{file_path}"
-                    )
-                    changed_files.append(path_changed)
+        transaction = BumpTransaction(str(project_dir))
+        try:
+            bumps = self.stage_bump(new_version, project_dir, transaction)
+        except OSError as e:
+            print(f"[bold red]Unable to bump the version: {e}\nNo files were changed.")
+            sys.exit(1)
+        # report the bumped lines in the order of the config file
+        if not dry_run:
+            for bump in bumps:
+                self.print_bump(bump)
+        if self.downgrade_mode:
+            print(DOWNGRADE_CHANGELOG_WARNING)
 
-        # update new version in mlf_core.cfg file
-        log.debug("Updating version in mlf_core.cfg file.")
-        self.parser.set("bumpversion", "current_version", new_version)
-        with open(f"{project_dir}/mlf_core.cfg", "w") as configfile:
-            self.parser.write(configfile)
+        if dry_run:
+            self.print_diff(transaction.diff())
+            print("[bold blue]Dry run: no files were changed.")
+            return
 
-        # add a new changelog section when downgrade mode is disabled
-        self.add_changelog_section(new_version)
+        try:
+            transaction.commit()
+        except OSError as e:
+            print(f"[bold red]Unable to write the bumped files: {e}\nAll files were rolled back.")
+            sys.exit(1)
 
         # check if a project is a git repository and if so, commit bumped version changes
         if is_git_repo(project_dir):
             repo = Repo(project_dir)
 
-            # git add
+            # git add only the files, which were actually changed
             print("[bold blue]Staging template")
-            repo.git.add(changed_files)
+            repo.git.add(transaction.changed_files)
 
             # git commit
             print("[bold blue]Committing changes to local git repository.")
             repo.index.commit(f"Bump version from {self.CURRENT_VERSION} to {new_version}")
 
-    def replace(self, file_path: str, subst: str, section: str) -> Tuple[bool, str]:
-        """
-        Replace a version with the new version unless the line is explicitly excluded (marked with
-        <<MLF-CORE_NO_BUMP>>).
-        Or, in case of blacklisted files, it ignores all lines with version numbers unless they´re explicitly marked
-        for bump with tag <<MLF-CORE_FORCE_BUMP>>.
-
-        :param file_path: The path of the file where the version should be updated
-        :param subst: The new version that replaces the old one
-        :param section: The current section (whitelisted or blacklisted files)
-
-        :return: Whether a file has been changed during bumped and the path of changed file
-        """
-        # flag that indicates whether no changes were made inside a file
-        file_is_unchanged = True
-        path_changed = ""
-
-        # Create temp file
-        fh, abs_path = mkstemp()
-        with fdopen(fh, "w") as new_file:
-            with open(file_path) as old_file:
-                for line in old_file:
-                    # update version if tags were found (and were in the right section)
-                    if (
-                        "<<MLF-CORE_NO_BUMP>>" not in line and not section == "bumpversion_files_blacklisted"
-                    ) or "<<MLF-CORE_FORCE_BUMP>>" in line:
-                        # for info on this regex, see bump_template docstring above
-                        tmp = re.sub(r"(?<!\.)\d+(?:\.\d+){2}(?:-SNAPSHOT)?(?!\.)", subst, line)
-                        new_file.write(tmp)
-                        if tmp != line:
-                            if file_is_unchanged:
-                                print(f"[bold blue]Updating version number in {file_path}")
-                                file_is_unchanged = False
-                                path_changed = file_path
-                            print(
-                                f'[bold red]- {line.strip().replace("<!-- <<MLF-CORE_FORCE_BUMP>> -->", "")}\n'
-                                + f'[bold green]+ {tmp.strip().replace("<!-- <<MLF-CORE_FORCE_BUMP>> -->", "")}'
-                            )
-                            print()
-                    else:
-                        new_file.write(line)
-        # Copy the file permissions from the old file to the new file
-        copymode(file_path, abs_path)
-        # Remove original file
-        remove(file_path)
-        # Move new file
-        move(abs_path, file_path)
-
-        return file_is_unchanged, path_changed
+    def stage_bump(self, new_version: str, project_dir: Path, transaction: BumpTransaction) -> List[FileBump]:
+        """
+        Stage all changes of bumping the version of the project without writing or printing anything.
+        This includes the bumped files, the mlf_core.cfg file and, unless in downgrade mode, the new changelog section.
+
+        :param new_version: The new version number that should replace the old one in a mlf-core project
+        :param project_dir: The top level directory of the project
+        :param transaction: The transaction to stage the changes to
+        :return: The bumps of all files listed in the mlf_core.cfg file in their order
+        :raises OSError: If a file could not be read
+        """
+        # bump the version of all files of both sections (whitelisted and blacklisted files) concurrently (if allowed)
+        version_index = load_version_index(str(project_dir))
+        log.debug(f"Bumping {len(version_index.files)} files.")
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_BUMPS) as executor:
+            bumps = list(
+                executor.map(
+                    lambda file: bump_file(file.file_path, new_version, file.blacklisted, file.occurrences),
+                    version_index.files,
+                )
+            )
+        # only stage files if the version(s) in the file were bumped
+        for bump in bumps:
+            if bump.changed:
+                transaction.stage(bump.file_path, bump.bumped_content)
+
+        # update new version in mlf_core.cfg file
+        log.debug("Updating version in mlf_core.cfg file.")
+        self.parser.set("bumpversion", "current_version", new_version)
+        config = io.StringIO()
+        self.parser.write(config)
+        transaction.stage(f"{project_dir}/mlf_core.cfg", config.getvalue())
+
+        # add a new changelog section when downgrade mode is disabled
+        if not self.downgrade_mode:
+            self.add_changelog_section(new_version, transaction)
+        return bumps
+
+    @staticmethod
+    def print_bump(bump: FileBump) -> None:
+        """
+        Print all bumped lines of a file.
+
+        :param bump: The result of bumping the file
+        """
+        if not bump.changed:
+            return
+        print(f"[bold blue]Updating version number in {bump.file_path}")
+        for line, bumped_line in bump.changed_lines:
+            print(
+                f'[bold red]- {line.strip().replace("<!-- <<MLF-CORE_FORCE_BUMP>> -->", "")}\n'
+                + f'[bold green]+ {bumped_line.strip().replace("<!-- <<MLF-CORE_FORCE_BUMP>> -->", "")}'
+            )
+            print()
+
+    @staticmethod
+    def print_diff(diff: str) -> None:
+        """
+        Print a unified diff with removed lines in red and added lines in green.
+
+        :param diff: The unified diff
+        """
+        for line in diff.splitlines():
+            style = (
+                "bold" if line.startswith(("---", "+++")) else {"-": "red", "+": "green", "@": "cyan"}.get(line[:1], "")
+            )
+            print(Text(line, style=style))
 
     def can_run_bump_version(self, new_version: str, project_dir: str) -> bool:
         """
@@ -166,37 +338,45 @@ class VersionBumper:
         :param project_dir: The directory of the project
         :return: True if bump version can be run, false otherwise.
         """
+        error = self.bump_version_error(new_version, project_dir)
+        if error:
+            print(error)
+            return False
+        return True
+
+    def bump_version_error(self, new_version: str, project_dir: str) -> Optional[str]:
+        """
+        Check the requirements of can_run_bump_version without printing anything.
+
+        :param new_version: The new version
+        :param project_dir: The directory of the project
+        :return: The reason why bump version cannot be run or None if it can be run
+        """
         # ensure that the entered version number matches correct format like 1.1.0 or 1.1.0-SNAPSHOT but not 1.2 or 1.2.3.4
         if not re.match(r"(?<!\.)\d+(?:\.\d+){2}((?!.)|-SNAPSHOT)(?!.)", new_version):
-            print(
+            return (
                 "[bold red]Invalid version specified!\nEnsure your version number has the form "
                 "of 0.0.0 or 15.100.239-SNAPSHOT"
             )
-            return False
 
         # ensure the version is bumped within a project created by mlf-core
         elif not Path(f"{project_dir}/mlf_core.cfg").is_file():
-            print(
+            return (
                 "[bold red]Did not find a mlf_core.cfg file. Make sure you are in the right directory "
                 "or specify the path to your projects bump_version.cfg file"
             )
-            return False
 
         # equal versions won't be accepted for bump-version
         elif new_version == self.CURRENT_VERSION:
-            print(
-                f"[bold red]The new version {new_version} cannot be equal to the current version {self.CURRENT_VERSION}."
-            )
-            return False
+            return f"[bold red]The new version {new_version} cannot be equal to the current version {self.CURRENT_VERSION}."
 
         # only allow bump from a SNAPSHOT version to its correspondence with -SNAPSHOT removed (like 1.0.0-SNAPSHOT to 1.0.0 but not 2.0.0)
         elif self.CURRENT_VERSION.endswith("-SNAPSHOT") and not self.CURRENT_VERSION.split("-")[0] == new_version:
-            print(
+            return (
                 f"[bold red]Cannot bump {self.CURRENT_VERSION} to {new_version}."
                 + f"[blue]\n{self.CURRENT_VERSION} as a SNAPSHOT version can only be bumped to its non-snapshot equivalent "
                 f'{self.CURRENT_VERSION.split("-")[0]}.'
             )
-            return False
 
         # ensure the new version is greater than the current one, if not the user wants to explicitly downgrade it
         elif not self.downgrade_mode:
@@ -205,30 +385,28 @@ class VersionBumper:
 
             # bump from x.x.x to x.x.x-SNAPSHOT should be only allowed when using the downgrade flag
             if new_version.endswith("-SNAPSHOT") and self.CURRENT_VERSION == new_version.split("-")[0]:
-                print(
+                return (
                     f"[bold red]Cannot downgrade {self.CURRENT_VERSION} to its version SNAPSHOT {new_version}."
                     + f"[blue]\nUse the -d flag if you want to downgrade {self.CURRENT_VERSION} to its SNAPSHOT version."
                 )
-                return False
 
-            # when the current version and the new version are equal, but one is a -SNAPSHOT version return true
+            # when the current version and the new version are equal, but one is a -SNAPSHOT version it can be bumped
             elif version.parse(current_version_r) == version.parse(new_version_r) and (
                 "-SNAPSHOT" in self.CURRENT_VERSION or "-SNAPSHOT" in new_version
             ):
-                return True
+                return None
 
             # else check if the new version is greater than the current version
             elif version.parse(current_version_r) < version.parse(new_version_r):
-                return True
+                return None
 
             # the new version is not greater than the current one
-            print(
+            return (
                 f"[bold red]The new version {new_version} is not greater than the current version {self.CURRENT_VERSION}."
                 f"\nThe new version must be greater than the old one."
             )
-            return False
 
-        return True
+        return None
 
     def check_bump_range(self, current_version: str, new_version: str) -> bool:
         """
@@ -302,85 +480,239 @@ class VersionBumper:
             ):
                 sys.exit(1)
 
-    def add_changelog_section(self, new_version: str) -> None:
+    def add_changelog_section(self, new_version: str, transaction: BumpTransaction) -> None:
         """
         Each version bump will add a new section template to the CHANGELOG.rst
         :param new_version: The new version
+        :param transaction: The transaction of the bump, which the changed CHANGELOG.rst is staged to
         """
         log.debug("Adding new changelog section.")
-        if self.downgrade_mode:
-            print(
-                "[bold yellow]WARNING: Running bump-version in downgrade mode will not add a new changelog section currently!"
-            )
-        else:
-            date = datetime.today().strftime("%Y-%m-%d")
-            # replace the SNAPSHOT SECTION header with its non-snapshot correlate
-            if self.CURRENT_VERSION.endswith("-SNAPSHOT"):
-                self.replace_snapshot_header(f"{self.top_level_dir}/CHANGELOG.rst", new_version, date)
+        changelog_path = f"{self.top_level_dir}/CHANGELOG.rst"
+        changelog = transaction.read(changelog_path)
+        date = datetime.today().strftime("%Y-%m-%d")
+        # replace the SNAPSHOT SECTION header with its non-snapshot correlate
+        if self.CURRENT_VERSION.endswith("-SNAPSHOT"):
+            transaction.stage(changelog_path, self.replace_snapshot_header(changelog, new_version, date))
 
-            else:
-                # the section template for a new changelog section
-                nl = "\n"
-                section = (
-                    f'{new_version} ({date}){nl}{"-" * (len(new_version) + len(date) + 3)}{nl}{nl}'
-                    f'{f"**{nl}{nl}".join(["**Added", "**Fixed", "**Dependencies", "**Deprecated**"])}'
-                )
+        else:
+            # the section template for a new changelog section
+            nl = "\n"
+            section = (
+                f'{new_version} ({date}){nl}{"-" * (len(new_version) + len(date) + 3)}{nl}{nl}'
+                f'{f"**{nl}{nl}".join(["**Added", "**Fixed", "**Dependencies", "**Deprecated**"])}'
+            )
 
-                self.insert_latest_version_section(
-                    old_changelog_file=f"{self.top_level_dir}/CHANGELOG.rst", section=section
-                )
+            transaction.stage(changelog_path, self.insert_latest_version_section(changelog, section=section))
 
-    def replace_snapshot_header(self, source_file_path: str, new_version: str, date: str) -> None:
+    def replace_snapshot_header(self, changelog: str, new_version: str, date: str) -> str:
         """
         Replace the SNAPSHOT header section in CHANGELOG. The pattern (currently) cannot include any newline characters, therefore no multiline support!
-        :param source_file_path: Path to source file (the path where CHANGELOG lies)
+        :param changelog: The content of the CHANGELOG
         :param new_version: The new version
         :param date: Current date
+        :return: The content of the CHANGELOG with the replaced header
         """
         log.debug("Replacing the changelog header in the changelog file.")
-        # create a temp file (requires to be explicitly deleted later)
-        fh, target_file_path = mkstemp()
-        # read from old file (the source file) and write into new file (the target file)
-        with open(target_file_path, "w") as target_file:
-            with open(source_file_path, "r") as source_file:
-                for line in source_file:
-                    pattern, subst = "", ""
-                    # check if the line is a header section with SNAPSHOT version
-                    if re.match(r"^(?<!\.)\d+(?:\.\d+){2}(?!\.)-SNAPSHOT \(\d\d\d\d-\d\d-\d\d\)$", line):
-                        dotted_snapshot_line = source_file.readline()
-                        next_new_line = source_file.readline()  # noqa: F841 necessary to omit an additional newline
-                        snapshot_date = line.split("(")[1][:-2]  # extract date of SNAPSHOT version adding
-                        pattern = f"{self.CURRENT_VERSION} ({snapshot_date})"
-                        subst = f'{new_version} ({date})\n{(len(new_version) + len(date) + 3) * "-"}'
-                        # replace -SNASPHOT in the header and adjust the dotted line below to the new header length
-                        target_file.write(line.replace(pattern, subst))
-                        target_file.write(dotted_snapshot_line.replace("-", ""))
-                    else:
-                        # else just write the line to the new file
-                        target_file.write(line.replace(pattern, subst))
-        # remove old file
-        remove(source_file_path)
-        # move new file to replace old file
-        move(target_file_path, source_file_path)
-
-    def insert_latest_version_section(self, old_changelog_file: str, section: str) -> None:
+        target = []
+        source = io.StringIO(changelog)
+        for line in source:
+            pattern, subst = "", ""
+            # check if the line is a header section with SNAPSHOT version
+            if re.match(r"^(?<!\.)\d+(?:\.\d+){2}(?!\.)-SNAPSHOT \(\d\d\d\d-\d\d-\d\d\)$", line):
+                dotted_snapshot_line = source.readline()
+                next_new_line = source.readline()  # noqa: F841 necessary to omit an additional newline
+                snapshot_date = line.split("(")[1][:-2]  # extract date of SNAPSHOT version adding
+                pattern = f"{self.CURRENT_VERSION} ({snapshot_date})"
+                subst = f'{new_version} ({date})\n{(len(new_version) + len(date) + 3) * "-"}'
+                # replace -SNASPHOT in the header and adjust the dotted line below to the new header length
+                target.append(line.replace(pattern, subst))
+                target.append(dotted_snapshot_line.replace("-", ""))
+            else:
+                # else just keep the line
+                target.append(line.replace(pattern, subst))
+        return "".join(target)
+
+    def insert_latest_version_section(self, changelog: str, section: str) -> str:
         """
         Insert the new changelog section as the latest section right after the header
-        :param old_changelog_file: path to the current CHANGELOG.rst file
+        :param changelog: The content of the current CHANGELOG.rst file
         :param section: the new section template block for changelog
+        :return: The content of the CHANGELOG.rst with the new section
         """
         log.debug("Inserting latest version section into the changelog.")
-        # create a temp file (requires to be explicitly deleted later)
-        fh, target_file_path = mkstemp()
-        # read from old file (the source file) and write into new file (the target file)
-        with open(target_file_path, "w") as target_file:
-            with open(old_changelog_file, "r") as source_file:
-                for line in source_file:
-                    # check if the line is the header section with the latest version
-                    if re.match(rf"^{self.CURRENT_VERSION} \(\d\d\d\d-\d\d-\d\d\)$", line):
-                        target_file.write(f"{section}\n\n\n")
-                    target_file.write(line)
-        # remove old file
-        remove(old_changelog_file)
-        # move new file to replace old file
-        move(target_file_path, old_changelog_file)
+        target = []
+        for line in io.StringIO(changelog):
+            # check if the line is the header section with the latest version
+            if re.match(rf"^{self.CURRENT_VERSION} \(\d\d\d\d-\d\d-\d\d\)$", line):
+                target.append(f"{section}\n\n\n")
+            target.append(line)
+        return "".join(target)
+
+
+@dataclass
+class ProjectBump:
+    """
+    The staged version bump of a single project of a batch bump.
+    """
+
+    project_dir: str
+    current_version: str = ""
+    error: Optional[str] = None  # the reason why the project cannot be bumped
+    lint_messages: List[str] = field(default_factory=list)  # the failed and warned changelog and version checks
+    reasonable: bool = True  # whether the new version is a reasonable bump of the current version
+    bumps: List[FileBump] = field(default_factory=list)
+    transaction: Optional[BumpTransaction] = None
+
+
+def discover_projects(path: str) -> List[str]:
+    """
+    Find the top level directories of all mlf-core projects below a path, which contain a .mlf_core.yml file.
+    Hidden directories and the directories of found projects are not searched.
+
+    :param path: The directory to search, for example the root of a monorepo
+    :return: The sorted paths of all found projects
+    """
+    project_dirs = []
+    for dir_path, dir_names, file_names in os.walk(path):
+        if ".mlf_core.yml" in file_names:
+            project_dirs.append(dir_path)
+            dir_names.clear()
+        else:
+            dir_names[:] = [dir_name for dir_name in dir_names if not dir_name.startswith(".")]
+    return sorted(project_dirs)
+
+
+def stage_project_bump(project_dir: str, new_version: str, downgrade: bool) -> ProjectBump:
+    """
+    Lint the changelog and versions of a project and stage its version bump without writing or printing anything.
+    Since bumps are staged in separate processes, all errors are returned as the project's error.
+
+    :param project_dir: The top level directory of the project
+    :param new_version: The new version
+    :param downgrade: Whether to allow downgrading the version
+    :return: The staged bump of the project
+    """
+    project_bump = ProjectBump(project_dir)
+    try:
+        if not os.path.isfile(f"{project_dir}/mlf_core.cfg"):
+            project_bump.error = f"[bold red]Did not find a mlf_core.cfg file at {project_dir}."
+            return project_bump
+        version_bumper = VersionBumper(project_dir, downgrade)
+        project_bump.current_version = version_bumper.CURRENT_VERSION
+        project_bump.error = version_bumper.bump_version_error(new_version, project_dir)
+        if project_bump.error:
+            return project_bump
+        if not os.path.exists(os.path.join(project_dir, "CHANGELOG.rst")):
+            project_bump.error = f"[bold red]No file named CHANGELOG.rst found at {project_dir}."
+            return project_bump
+
+        changelog_linter = TemplateLinter(path=project_dir)
+        changelog_linter.lint_changelog()
+        changelog_linter.check_version_consistent()
+        project_bump.lint_messages = [
+            f"{code}: {message}" for code, message in changelog_linter.failed + changelog_linter.warned
+        ]
+        project_bump.reasonable = downgrade or version_bumper.check_bump_range(
+            version_bumper.CURRENT_VERSION.split("-")[0], new_version.split("-")[0]
+        )
+        project_bump.transaction = BumpTransaction(project_dir)
+        project_bump.bumps = version_bumper.stage_bump(new_version, Path(project_dir), project_bump.transaction)
+    except Exception as e:
+        log.debug(f"Staging the bump of {project_dir} failed", exc_info=True)
+        project_bump.error = f"[bold red]Unable to bump the version: {e}"
+    return project_bump
+
+
+def bump_projects(
+    path: str, new_version: str, downgrade: bool = False, dry_run: bool = False, processes: Optional[int] = None
+) -> None:
+    """
+    Bump the version of all mlf-core projects below a path, for example of all projects of a monorepo.
+    All projects are linted and staged concurrently in separate processes. The changes are only written if every project
+    can be bumped and are then committed at once, if the path is inside a git repository.
+
+    :param path: The directory to search for mlf-core projects
+    :param new_version: The new version of all projects
+    :param downgrade: Whether to allow downgrading the versions
+    :param dry_run: Whether to only print the diff of all changes without writing or committing any file
+    :param processes: Number of projects to stage concurrently. Defaults to the number of CPUs.
+    """
+    project_dirs = discover_projects(path)
+    if not project_dirs:
+        print(f"[bold red]No mlf-core projects found at {path}. Aborting!")
+        sys.exit(1)
+    print(f"[bold blue]Bumping the version of {len(project_dirs)} projects to {new_version}.\n")
+
+    stage = partial(stage_project_bump, new_version=new_version, downgrade=downgrade)
+    if len(project_dirs) == 1:
+        project_bumps = [stage(project_dirs[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            project_bumps = list(executor.map(stage, project_dirs))
+
+    failed_projects = [project_bump for project_bump in project_bumps if project_bump.error]
+    for project_bump in failed_projects:
+        print(f"[bold red]{project_bump.project_dir}:[/] {project_bump.error}")
+    if failed_projects:
+        print(
+            f"[bold red]{len(failed_projects)} of {len(project_bumps)} projects cannot be bumped. No files were changed."
+        )
+        sys.exit(1)
+
+    # ask for confirmation only once for all projects
+    linted_projects = [project_bump for project_bump in project_bumps if project_bump.lint_messages]
+    if linted_projects:
+        for project_bump in linted_projects:
+            print(f"[bold red]{project_bump.project_dir}:")
+            for message in project_bump.lint_messages:
+                print(Text(f"  {message}"))
+        print(
+            "[bold red]Changelog linting and/or version check failed!\nYou can fix them and try bumping again. Proceeding bump will result in "
+            "undefined behavior!"
+        )
+        if not mlf_core_questionary_or_dot_mlf_core(
+            function="confirm", question="Do you really want to continue?", default="n"
+        ):
+            sys.exit(1)
+    unreasonable_projects = [project_bump for project_bump in project_bumps if not project_bump.reasonable]
+    if unreasonable_projects:
+        for project_bump in unreasonable_projects:
+            print(f"[bold yellow]{project_bump.project_dir}: {project_bump.current_version} -> {new_version}")
+        if not mlf_core_questionary_or_dot_mlf_core(
+            function="confirm",
+            question="These bumps seem not reasonable.\nDo you really want to bump the project versions?",
+            default="n",
+        ):
+            sys.exit(1)
+
+    transaction = BumpTransaction(path)
+    for project_bump in project_bumps:
+        if not dry_run:
+            console.rule(f"[bold blue]{project_bump.project_dir}")
+            print(f"[bold blue]Current version is {project_bump.current_version}.")
+            for bump in project_bump.bumps:
+                VersionBumper.print_bump(bump)
+        transaction.update(project_bump.transaction)  # type: ignore
+    if downgrade:
+        print(DOWNGRADE_CHANGELOG_WARNING)
+
+    if dry_run:
+        VersionBumper.print_diff(transaction.diff())
+        print("[bold blue]Dry run: no files were changed.")
+        return
+
+    try:
+        transaction.commit()
+    except OSError as e:
+        print(f"[bold red]Unable to write the bumped files: {e}\nAll files were rolled back.")
+        sys.exit(1)
+
+    # commit the changes of all projects at once if the projects are part of a git repository
+    try:
+        repo = Repo(path, search_parent_directories=True)
+    except (InvalidGitRepositoryError, NoSuchPathError):
+        return
+    print("[bold blue]Staging templates")
+    repo.git.add(transaction.changed_files)
+    print("[bold blue]Committing changes to local git repository.")
+    repo.index.commit(f"Bump version of {len(project_bumps)} projects to {new_version}")
@@ -1,40 +1,151 @@
-from typing import Tuple
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from mlf_core.common.suggest_similar_commands import SIMILARITY_SUGGEST_FACTOR, SIMILARITY_USE_FACTOR
 
 
-def levensthein_dist(input_command: str, candidate: str) -> int:
+def levensthein_dist(input_command: str, candidate: str, max_dist: Optional[int] = None) -> int:
     """
     Implement the Levenshtein distance algorithm to determine, in case of a non-existing handle,
     if theres a very similar command to suggest.
 
     :param input_command: The non-existing handle the user gave as input
     :param candidate: The (possible similar) alternative command
-    :return: The similarity between the two strings measured by the levensthein distance
+    :param max_dist: Stop computing as soon as the distance is known to exceed this bound
+    :return: The similarity between the two strings measured by the levensthein distance or max_dist + 1 if it exceeds max_dist
     """
+    return _bit_parallel_dist(_pattern_bitmasks(input_command), len(input_command), candidate, max_dist)
 
-    if not input_command or not candidate:
-        return max(len(input_command), len(candidate))  # at least one string is empty
 
-    dp_table = [[0 for col in range(len(input_command) + 1)] for row in range(len(candidate) + 1)]
+def _pattern_bitmasks(pattern: str) -> Dict[str, int]:
+    """
+    :return: For every character of the pattern a bitmask of the positions it occurs at
+    """
+    bitmasks: Dict[str, int] = {}
+    for position, char in enumerate(pattern):
+        bitmasks[char] = bitmasks.get(char, 0) | (1 << position)
+    return bitmasks
+
+
+def _bit_parallel_dist(bitmasks: Dict[str, int], pattern_length: int, text: str, max_dist: Optional[int] = None) -> int:
+    """
+    Compute the Levenshtein distance of a pattern and a text using Myers' bit-parallel algorithm.
+    Every column of the dynamic programming table is encoded as bit vectors of its vertical deltas, so each character of the text
+    costs a few integer operations instead of a loop over the pattern.
+
+    :param bitmasks: The bitmasks of the pattern's characters
+    :param pattern_length: The length of the pattern
+    :param text: The text to compare the pattern with
+    :param max_dist: Stop as soon as the distance is known to exceed this bound
+    :return: The Levenshtein distance or max_dist + 1 if it exceeds max_dist
+    """
+    if max_dist is not None and abs(pattern_length - len(text)) > max_dist:
+        return max_dist + 1
+    if not pattern_length or not text:
+        return max(pattern_length, len(text))  # at least one string is empty
+
+    mask = (1 << pattern_length) - 1
+    last_row = 1 << (pattern_length - 1)
+    positive_vertical, negative_vertical = mask, 0
+    dist = pattern_length
+    for processed, char in enumerate(text, 1):
+        equal = bitmasks.get(char, 0)
+        diagonal = equal | negative_vertical
+        horizontal = (((equal & positive_vertical) + positive_vertical) ^ positive_vertical) | equal
+        positive_horizontal = negative_vertical | ~(horizontal | positive_vertical) & mask
+        negative_horizontal = positive_vertical & horizontal
+        if positive_horizontal & last_row:
+            dist += 1
+        elif negative_horizontal & last_row:
+            dist -= 1
+        # every remaining character of the text decreases the distance by at most one
+        if max_dist is not None and dist - (len(text) - processed) > max_dist:
+            return max_dist + 1
+        positive_horizontal = ((positive_horizontal << 1) | 1) & mask
+        negative_horizontal = (negative_horizontal << 1) & mask
+        positive_vertical = negative_horizontal | ~(diagonal | positive_horizontal) & mask
+        negative_vertical = positive_horizontal & diagonal
+    return dist
+
+
+class SimilarityIndex:
+    """
+    A BK-tree over commands or handles, which finds all candidates within a Levenshtein distance of an input.
+    Since the Levenshtein distance is a metric, only the subtrees whose distance to their parent is close enough
+    to the input's distance to the parent need to be visited, instead of comparing the input with every candidate.
+    """
 
-    dp_table[0] = list(range(0, len(input_command) + 1))
-    for i in range(1, len(candidate) + 1):
-        dp_table[i][0] = i
+    def __init__(self, candidates: Iterable[str]):
+        """
+        :param candidates: The valid commands or handles
+        """
+        # every node is a list of [candidate, {distance to the candidate: child node}]
+        self._root: Optional[list] = None
+        for candidate in candidates:
+            self._add(candidate)
+
+    def _add(self, candidate: str) -> None:
+        if self._root is None:
+            self._root = [candidate, {}]
+            return
+        node = self._root
+        while True:
+            dist = levensthein_dist(candidate, node[0])
+            if dist == 0:
+                return  # duplicate
+            if dist not in node[1]:
+                node[1][dist] = [candidate, {}]
+                return
+            node = node[1][dist]
+
+    def search(self, command: str, max_dist: int) -> List[Tuple[int, str]]:
+        """
+        Find all candidates within a maximum Levenshtein distance.
+
+        :param command: The command given by the user
+        :param max_dist: The maximum distance
+        :return: The distance and candidate of all candidates within the maximum distance
+        """
+        if self._root is None:
+            return []
+        bitmasks = _pattern_bitmasks(command)
+        found = []
+        nodes = [self._root]
+        while nodes:
+            candidate, children = nodes.pop()
+            # children at a distance of more than max_dist from the command's distance to this candidate cannot match,
+            # so the distance only needs to be computed exactly up to the largest distance of a child plus max_dist
+            bound = max_dist + max(children, default=0)
+            dist = _bit_parallel_dist(bitmasks, len(command), candidate, bound)
+            if dist <= max_dist:
+                found.append((dist, candidate))
+            nodes.extend(child for child_dist, child in children.items() if abs(child_dist - dist) <= max_dist)
+        return found
+
+    def most_similar(self, command: str) -> Tuple[list, str]:
+        """
+        Determine the most similar candidates and whether they may be used automatically or only be suggested.
+        See most_similar_command for details.
+
+        :param command: The command given by the user
+        :return: A list of similar candidate(s) and a string that indicates the action to be taken
+        """
+        # the more restrict condition for automatic use
+        lim_use = int(len(command) * SIMILARITY_USE_FACTOR)
+        # the weaker condition for command suggestion
+        lim_suggest = int(len(command) * SIMILARITY_SUGGEST_FACTOR)
 
-    # now choose minimum levensthein distance from the three option delete/replace/insert
-    # if chars are the same -> levensthein distance is the same as for those substring without these chars of input_command
-    # and candidate
+        found = self.search(command, lim_suggest)
+        if not found:
+            return [], ""
+        min_dist = min(dist for dist, _ in found)
+        most_similar = sorted(candidate for dist, candidate in found if dist == min_dist)
+        return most_similar, "use" if min_dist <= lim_use else "suggest"
 
-    for i in range(1, len(candidate) + 1):
-        for j in range(1, len(input_command) + 1):
-            # choose minimum edit distance from delete, replace or insert at current substring
-            if input_command[j - 1] == candidate[i - 1]:
-                dp_table[i][j] = dp_table[i - 1][j - 1]
-            else:
-                dp_table[i][j] = min(min(dp_table[i][j - 1], dp_table[i - 1][j - 1]), dp_table[i - 1][j]) + 1
 
-    return dp_table[len(candidate)][len(input_command)]
+@lru_cache(maxsize=16)
+def _similarity_index(candidates: frozenset) -> SimilarityIndex:
+    return SimilarityIndex(sorted(candidates))
 
 
 def most_similar_command(command: str, command_list: set) -> Tuple[list, str]:
@@ -43,48 +154,10 @@ def most_similar_command(command: str, command_list: set) -> Tuple[list, str]:
     The similarity is determined by the levensthein distance and a factor (currently 1/3)
     sets a limit where a similar command is useful to be automatically used. If the difference diff is 1/3 < diff <= 2/3, one
     or more similar commands could be suggested, but not used automatically.
+    The similarity index of every list of commands is only built once per process.
 
     :param command_list: The commands that are available by the users specific action
     :param command: The command given by the user
     :return: A list of similar command(s) or the empty string if there's none and a string that indicates the action to be taken
     """
-    min_use = 999999  # some random large integer -> we will never have handles that are larger than 1000 character
-    min_suggest = 999999
-    sim_command_use = []
-    sim_command_suggest = []
-
-    # for each valid handle calculate the levensthein distance and if one is found that is a new minimal distance,
-    # replace it and take this handle as the most similar command.
-    for handle in command_list:
-        dist = levensthein_dist(command, handle)
-
-        # the more restrict condition for automatic use
-        lim_use = int(len(command) * SIMILARITY_USE_FACTOR)
-
-        # the weaker condition for command suggestion
-        lim_suggest = int(len(command) * SIMILARITY_SUGGEST_FACTOR)
-
-        # check if the command is close to the inputted command so it can be automatically used
-        if lim_use >= dist:
-            if min_use > dist:  # and min >= dist:
-                min_use = dist
-                sim_command_use = [handle]
-            elif min_use == dist:
-                sim_command_use.append(handle)
-
-        # the input is not very close to any command, but maybe a similar one can be suggested?
-        elif lim_use < dist <= lim_suggest:
-            if min_suggest > dist:  # and min >= dist:
-                min_suggest = dist
-                sim_command_suggest = [handle]
-            elif min_suggest == dist:
-                sim_command_suggest.append(handle)
-
-    # return the use list, as those are closer, but if its empty, return the list of suggested commands (or if that is empty too, an empty list)
-    return (
-        (sim_command_use, "use")
-        if sim_command_use
-        else (sim_command_suggest, "suggest")
-        if sim_command_suggest
-        else ([], "")
-    )
+    return _similarity_index(frozenset(command_list)).most_similar(command)
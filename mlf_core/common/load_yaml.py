@@ -1,11 +1,20 @@
+import os
+import threading
 from pathlib import Path
+from typing import Any, Dict, Tuple
 
 from ruamel.yaml import YAML
 
+# read only YAML files by their real path together with the modification time and size they were parsed at
+_read_only_cache: Dict[str, Tuple[int, int, Any]] = {}
+_read_only_cache_lock = threading.Lock()
+
 
 def load_yaml_file(yaml_file_path: str) -> dict:
     """
     Loads a yaml file and returns the content as nested dictionary.
+    The round trip loader keeps comments, so use this function if comments are required or the content is dumped again.
+    For read only access use load_yaml_file_read_only.
 
     :return: nested dictionary as the content of the yaml file
     """
@@ -14,3 +23,25 @@ def load_yaml_file(yaml_file_path: str) -> dict:
     yaml.boolean_representation = ["False", "True"]  # type: ignore
 
     return yaml.load(path)
+
+
+def load_yaml_file_read_only(yaml_file_path: str) -> dict:
+    """
+    Loads a yaml file for read only access using the fast (C based if available) safe loader.
+    Every file is only parsed once per modification, later calls return the memoized content.
+    The returned content is shared and must therefore not be modified.
+
+    :param yaml_file_path: Path to the yaml file
+    :return: nested dictionary as the content of the yaml file
+    """
+    path = os.path.realpath(yaml_file_path)
+    stat = os.stat(path)
+    with _read_only_cache_lock:
+        cached = _read_only_cache.get(path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    content = YAML(typ="safe").load(Path(path))
+    with _read_only_cache_lock:
+        _read_only_cache[path] = (stat.st_mtime_ns, stat.st_size, content)
+    return content
@@ -1,13 +1,7 @@
-import os
-from typing import Set
-
-from mlf_core.common.load_yaml import load_yaml_file
-from mlf_core.util.dict_util import is_nested_dictionary
-
-AVAILABLE_TEMPLATES_PATH = f"{os.path.dirname(__file__)}/../create/templates/available_templates.yml"
+from mlf_core.common.template_registry import load_template_registry
 
 # mlf-core main commands
-MAIN_COMMANDS = ["create", "lint", "list", "info", "bump-version", "sync", "config", "upgrade"]
+MAIN_COMMANDS = ["create", "lint", "list", "info", "bump-version", "sync", "config", "upgrade", "package-snapshot"]
 # the fraction relative to the commands length, a given input could differ from the real command to be automatically used instead
 SIMILARITY_USE_FACTOR = 1 / 3
 # the fraction relative to the commands length, a given input could differ from the real command to be suggested (if >1/3 of course)
@@ -20,34 +14,14 @@ def load_available_handles() -> set:
 
     :return: A set of all available handles
     """
-    available_templates = load_yaml_file(f"{AVAILABLE_TEMPLATES_PATH}")
-    unsplit_handles: Set = set()
+    unsplit_handles = set(load_template_registry().handles)
     all_handles = set()
-    nested_dict_to_handle_set(available_templates, unsplit_handles)
     all_handles.update(unsplit_handles)
     split_handles(unsplit_handles, all_handles)
 
     return all_handles
 
 
-def nested_dict_to_handle_set(available_templates, unsplitted_handles: set) -> None:
-    """
-    Extract the handles from loaded yml file.
-
-    :param available_templates: The loaded yml file as a (nested) dict
-    :param unsplitted_handles: The set to save the handles
-    """
-    if is_nested_dictionary(available_templates):
-        for templ in available_templates.values():
-            if not is_nested_dictionary(templ):
-                unsplitted_handles.add(templ["handle"])
-            else:
-                nested_dict_to_handle_set(templ, unsplitted_handles)
-    else:
-        # a single template to append was reached
-        unsplitted_handles.add(available_templates["handle"])
-
-
 def split_handles(unsplitted_handles, all_handles) -> None:
     """
     Split handles into all possible combinations.
@@ -0,0 +1,165 @@
+import logging
+import os
+import pickle  # nosec
+import tempfile
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+import appdirs
+from mlf_core.common.load_yaml import load_yaml_file_read_only
+from mlf_core.util.dict_util import is_nested_dictionary
+
+log = logging.getLogger(__name__)
+
+AVAILABLE_TEMPLATES_PATH = f"{os.path.dirname(os.path.dirname(__file__))}/create/templates/available_templates.yml"
+# the parsed available_templates.yml files are cached next to mlf-core's configuration file
+TEMPLATE_REGISTRY_CACHE_PATH = f'{appdirs.user_config_dir(appname="mlf_core")}/template_registry.pickle'
+# increased whenever the layout of the cache changes
+TEMPLATE_REGISTRY_CACHE_FORMAT = 1
+
+# all registries loaded by this process by the path, modification time and size of their available_templates.yml
+_registries: Dict[Tuple[str, int, int], "TemplateRegistry"] = {}
+_registries_lock = threading.Lock()
+
+
+class TemplateRegistry:
+    """
+    All available mlf-core templates with indexed lookups by handle, domain, subdomain and language.
+    The templates are stored as a tree of domain -> (subdomain ->) language -> template like in available_templates.yml.
+    Every template is a dictionary with the keys name, handle, version, available libraries, short description and long description.
+    The templates are shared and must not be modified.
+    """
+
+    def __init__(self, templates: dict):
+        """
+        :param templates: The nested templates as parsed from available_templates.yml
+        """
+        self.templates = templates
+        self._by_handle: Dict[str, dict] = {}
+        # all templates below every domain, domain/subdomain and domain/(subdomain/)language path of the tree
+        self._by_path: Dict[Tuple[str, ...], List[dict]] = defaultdict(list)
+        self._by_language: Dict[str, List[dict]] = defaultdict(list)
+        self._index(templates, ())
+
+    def _index(self, node: dict, path: Tuple[str, ...]) -> None:
+        if not is_nested_dictionary(node):
+            # a single template was reached
+            self._by_handle[node["handle"]] = node
+            for depth in range(1, len(path) + 1):
+                self._by_path[path[:depth]].append(node)
+            self._by_language[path[-1]].append(node)
+            return
+        for key, child in node.items():
+            self._index(child, path + (str(key),))
+
+    @property
+    def all_templates(self) -> List[dict]:
+        """
+        All templates in the order of available_templates.yml
+        """
+        return list(self._by_handle.values())
+
+    @property
+    def handles(self) -> List[str]:
+        return list(self._by_handle)
+
+    @property
+    def languages(self) -> Set[str]:
+        return set(self._by_language)
+
+    def get(self, handle: str) -> Optional[dict]:
+        """
+        :param handle: A full template handle like mlflow-pytorch
+        :return: The template or None if no template has the handle
+        """
+        return self._by_handle.get(handle)
+
+    def version(self, handle: str) -> str:
+        """
+        :param handle: A full template handle like mlflow-pytorch
+        :return: The current version of the template
+        :raises KeyError: If no template has the handle
+        """
+        return self._by_handle[handle]["version"]
+
+    def find(self, *path: str) -> List[dict]:
+        """
+        Find all templates below a path of the template tree.
+
+        :param path: The domain, optionally followed by the subdomain and/or language, e.g. ('mlflow',) or ('mlflow', 'pytorch')
+        :return: All templates below the path or an empty list if the path does not exist
+        """
+        return list(self._by_path.get(tuple(path), []))
+
+    def by_domain(self, domain: str) -> List[dict]:
+        return self.find(domain)
+
+    def by_subdomain(self, domain: str, subdomain: str) -> List[dict]:
+        return self.find(domain, subdomain)
+
+    def by_language(self, language: str) -> List[dict]:
+        return list(self._by_language.get(language, []))
+
+
+def load_template_registry(
+    path: str = AVAILABLE_TEMPLATES_PATH, cache_path: Optional[str] = TEMPLATE_REGISTRY_CACHE_PATH
+) -> TemplateRegistry:
+    """
+    Load the registry of an available_templates.yml file. The file is parsed at most once per process and modification.
+    The parsed templates are persisted in a pickle cache, so that later mlf-core runs do not need to parse the YAML file again.
+
+    :param path: Path to the available_templates.yml file
+    :param cache_path: Path to the pickle cache or None to not use the cache
+    :return: The template registry
+    """
+    stat = os.stat(path)
+    key = (os.path.realpath(path), stat.st_mtime_ns, stat.st_size)
+    with _registries_lock:
+        if key not in _registries:
+            _registries[key] = TemplateRegistry(_load_templates(key, cache_path))
+        return _registries[key]
+
+
+def _load_templates(key: Tuple[str, int, int], cache_path: Optional[str]) -> dict:
+    """
+    Load the parsed templates from the cache if the available_templates.yml file did not change or parse it otherwise.
+    """
+    path, mtime_ns, size = key
+    cache = _read_cache(cache_path) if cache_path else {}
+    cached = cache.get(path)
+    if cached and cached["mtime_ns"] == mtime_ns and cached["size"] == size:
+        return cached["templates"]
+
+    log.debug(f"Parsing available templates at {path}")
+    templates = load_yaml_file_read_only(path)
+    if cache_path:
+        cache[path] = {"mtime_ns": mtime_ns, "size": size, "templates": templates}
+        _write_cache(cache_path, cache)
+    return templates
+
+
+def _read_cache(cache_path: str) -> dict:
+    try:
+        with open(cache_path, "rb") as cache_file:
+            # the cache is written by mlf-core itself into the user's configuration directory
+            cache = pickle.load(cache_file)  # nosec
+        if cache.get("format") == TEMPLATE_REGISTRY_CACHE_FORMAT:
+            return cache["registries"]
+    except FileNotFoundError:
+        pass
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, TypeError, KeyError) as e:
+        log.debug(f"Ignoring unreadable template registry cache at {cache_path}: {e}")
+    return {}
+
+
+def _write_cache(cache_path: str, registries: dict) -> None:
+    cache_dir = os.path.dirname(cache_path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as tmp_file:
+            pickle.dump({"format": TEMPLATE_REGISTRY_CACHE_FORMAT, "registries": registries}, tmp_file)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        log.debug(f"Unable to write template registry cache to {cache_path}: {e}")
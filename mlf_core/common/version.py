@@ -1,10 +1,15 @@
+import re
 import sys
 from pathlib import Path
 from typing import Tuple
 
-from mlf_core.common.load_yaml import load_yaml_file
+from mlf_core.common.load_yaml import load_yaml_file_read_only
+from mlf_core.common.template_registry import load_template_registry
 from rich import print
 
+# a project version like 1.0.0 or 1.1.0-SNAPSHOT, but not 1.2 or any substring of 1.2.3.4
+VERSION_PATTERN = re.compile(r"(?<!\.)\d+(?:\.\d+){2}(?:-SNAPSHOT)?(?!\.)")
+
 
 def load_mlf_core_template_version(handle: str, yaml_path: str):
     """
@@ -14,12 +19,7 @@ def load_mlf_core_template_version(handle: str, yaml_path: str):
     :param yaml_path: Path to the yaml file
     :return: The version number to the given handles template
     """
-    available_templates = load_yaml_file(yaml_path)
-    parts = handle.split("-")
-    if len(parts) == 2:
-        return available_templates[parts[0]][parts[1]]["version"]
-    elif len(parts) == 3:
-        return available_templates[parts[0]][parts[1]][parts[2]]["version"]
+    return load_template_registry(yaml_path).version(handle)
 
 
 def load_project_template_version_and_handle(project_dir: Path) -> Tuple[str, str]:
@@ -33,7 +33,7 @@ def load_project_template_version_and_handle(project_dir: Path) -> Tuple[str, st
     """
     project_dir_str = str(project_dir)
     try:
-        ct_meta = load_yaml_file(f"{project_dir_str}/.mlf_core.yml")
+        ct_meta = load_yaml_file_read_only(f"{project_dir_str}/.mlf_core.yml")
         # split the template version at first space to omit the mlf-core bump-version tag and return it and the the handle
         return ct_meta["template_version"].split(" ", 1)[0], ct_meta["template_handle"]
     except FileNotFoundError:
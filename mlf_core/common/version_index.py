@@ -0,0 +1,170 @@
+import io
+import json
+import logging
+import os
+import tempfile
+import time
+from configparser import ConfigParser
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import appdirs
+from mlf_core.common.version import VERSION_PATTERN
+
+log = logging.getLogger(__name__)
+
+# lines of whitelisted files marked with this tag are not bumped
+NO_BUMP_TAG = "<<MLF-CORE_NO_BUMP>>"
+# only lines of blacklisted files marked with this tag are bumped
+FORCE_BUMP_TAG = "<<MLF-CORE_FORCE_BUMP>>"
+# the version occurrences of all projects are cached next to mlf-core's configuration file
+VERSION_INDEX_CACHE_PATH = f'{appdirs.user_config_dir(appname="mlf_core")}/version_index.json'
+# increased whenever the layout of the cache changes
+VERSION_INDEX_CACHE_FORMAT = 1
+# files modified less than this number of seconds before they were scanned are not cached,
+# since a change within the resolution of the file system's modification time would not be noticed
+VERSION_INDEX_RACY_SECONDS = 2
+
+
+@dataclass(frozen=True)
+class VersionOccurrence:
+    """
+    A line of a file containing at least one version.
+    """
+
+    line_number: int  # starting at 1
+    line: str  # the line including its line ending
+    versions: Tuple[str, ...]  # all versions of the line in the order they occur
+    no_bump: bool  # whether the line is marked with <<MLF-CORE_NO_BUMP>>
+    force_bump: bool  # whether the line is marked with <<MLF-CORE_FORCE_BUMP>>
+
+    def is_bumped(self, blacklisted: bool) -> bool:
+        """
+        :param blacklisted: Whether the file of the line is blacklisted
+        :return: Whether bump-version updates the versions of the line
+        """
+        return (not self.no_bump and not blacklisted) or self.force_bump
+
+
+@dataclass
+class IndexedFile:
+    """
+    All version occurrences of a file listed in the mlf_core.cfg file.
+    """
+
+    path: str  # the path as listed in the mlf_core.cfg file
+    file_path: str  # the path relative to the current working directory
+    blacklisted: bool
+    occurrences: List[VersionOccurrence]
+
+    @property
+    def bumped_occurrences(self) -> List[VersionOccurrence]:
+        """
+        The occurrences whose versions are bumped and must therefore be consistent with the project's version
+        """
+        return [occurrence for occurrence in self.occurrences if occurrence.is_bumped(self.blacklisted)]
+
+
+@dataclass
+class VersionIndex:
+    """
+    All version occurrences of the files listed in the bumpversion sections of a project's mlf_core.cfg file.
+    """
+
+    current_version: str
+    files: List[IndexedFile]
+
+
+def scan_versions(content: str) -> List[VersionOccurrence]:
+    """
+    Find all lines of a file's content, which contain a version.
+
+    :param content: The content of the file read without translating its line endings
+    :return: All lines containing a version
+    """
+    # most files do not contain any version at all
+    if not VERSION_PATTERN.search(content):
+        return []
+    occurrences = []
+    for line_number, line in enumerate(io.StringIO(content, newline=""), 1):
+        versions = tuple(VERSION_PATTERN.findall(line))
+        if versions:
+            occurrences.append(
+                VersionOccurrence(line_number, line, versions, NO_BUMP_TAG in line, FORCE_BUMP_TAG in line)
+            )
+    return occurrences
+
+
+def load_version_index(project_dir: str, cache_path: Optional[str] = VERSION_INDEX_CACHE_PATH) -> VersionIndex:
+    """
+    Index the version occurrences of all files listed in the bumpversion sections of a project's mlf_core.cfg file.
+    The occurrences of every file are cached by its modification time and size, so that unchanged files are not scanned again.
+    All paths are resolved relative to the project directory, so the working directory is never changed.
+
+    :param project_dir: The top level directory of the project
+    :param cache_path: Path to the cache or None to not use the cache
+    :return: The version index of the project
+    :raises FileNotFoundError: If a listed file does not exist
+    """
+    parser = ConfigParser()
+    parser.read(f"{project_dir}/mlf_core.cfg")
+    cache = _read_cache(cache_path) if cache_path else {}
+    project_key = os.path.realpath(project_dir)
+    cached_files = cache.get(project_key, {})
+    indexed_files: Dict[str, dict] = {}
+    scan_time = time.time()
+
+    files = []
+    for section in ["bumpversion_files_whitelisted", "bumpversion_files_blacklisted"]:
+        for _, path in parser.items(section):
+            file_path = os.path.join(str(project_dir), path)
+            stat = os.stat(file_path)
+            cached = cached_files.get(path)
+            if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+                occurrences = [
+                    VersionOccurrence(n, line, tuple(v), no, force) for n, line, v, no, force in cached["lines"]
+                ]
+            else:
+                with open(file_path, newline="") as file:
+                    occurrences = scan_versions(file.read())
+                cached = None
+                if scan_time - stat.st_mtime_ns / 1e9 > VERSION_INDEX_RACY_SECONDS:
+                    cached = {
+                        "mtime_ns": stat.st_mtime_ns,
+                        "size": stat.st_size,
+                        "lines": [[o.line_number, o.line, o.versions, o.no_bump, o.force_bump] for o in occurrences],
+                    }
+            if cached:
+                indexed_files[path] = cached
+            files.append(IndexedFile(path, file_path, section == "bumpversion_files_blacklisted", occurrences))
+
+    if cache_path and indexed_files != cached_files:
+        # keep only the files currently listed, so that the cache does not grow with files removed from the project
+        cache[project_key] = indexed_files
+        _write_cache(cache_path, cache)
+    return VersionIndex(parser.get("bumpversion", "current_version"), files)
+
+
+def _read_cache(cache_path: str) -> dict:
+    try:
+        with open(cache_path) as cache_file:
+            cache = json.load(cache_file)
+        if cache.get("format") == VERSION_INDEX_CACHE_FORMAT:
+            return cache["projects"]
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, AttributeError, KeyError) as e:
+        log.debug(f"Ignoring unreadable version index cache at {cache_path}: {e}")
+    return {}
+
+
+def _write_cache(cache_path: str, projects: dict) -> None:
+    cache_dir = os.path.dirname(cache_path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as tmp_file:
+            json.dump({"format": VERSION_INDEX_CACHE_FORMAT, "projects": projects}, tmp_file)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        log.debug(f"Unable to write version index cache to {cache_path}: {e}")
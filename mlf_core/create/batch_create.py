@@ -0,0 +1,305 @@
+import io
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from mlf_core.common.load_yaml import load_yaml_file_read_only
+from mlf_core.config.config import ConfigCommand
+from mlf_core.create.create import DOMAIN_CREATORS
+from mlf_core.lint.lint import LintResult, lint_projects
+from mlf_core.util.rich import console
+from rich import box, print
+from rich.style import Style
+from rich.table import Table
+
+log = logging.getLogger(__name__)
+
+# number of projects created concurrently by default
+DEFAULT_BATCH_WORKERS = 4
+# the answers to all prompts a project specification does not answer itself
+BATCH_SPEC_DEFAULTS = {
+    "domain": "mlflow",
+    "version": "0.1.0-SNAPSHOT",
+    "license": "MIT",
+    "framework": "pytorch",
+    "is_github_repo": False,
+    "is_repo_private": False,
+    "is_github_orga": False,
+    "github_orga": "",
+}
+# the default language of every domain
+DEFAULT_LANGUAGES = {"mlflow": "pytorch", "package": "prediction"}
+# the settings of the mlf-core configuration file used by projects that do not set them
+CONFIG_SETTINGS = ["full_name", "email", "github_username"]
+VERSION_REGEX = re.compile(r"(?<!.)\d+(?:\.\d+){2}(?:-SNAPSHOT)?(?!.)")
+
+
+@dataclass
+class BatchProject:
+    """
+    A project of a batch and the result of creating it.
+    """
+
+    spec: dict  # the complete project specification in the format of a .mlf_core.yml file
+    project_dir: str
+    status: str = "pending"  # one of pending, created and failed
+    lint: Optional[LintResult] = None
+    seconds: float = 0.0  # the time taken to create the project without linting it
+    error: Optional[str] = None
+
+    @property
+    def template_handle(self) -> str:
+        return f"{self.spec['domain']}-{self.spec['language']}"
+
+
+class ThreadLocalOutput:
+    """
+    A stream, which writes to a buffer of the current thread if the thread set one and to the wrapped stream otherwise.
+    Replacing sys.stdout with it captures the output of every thread separately, which contextlib.redirect_stdout cannot do,
+    since it replaces sys.stdout for all threads of the process.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+
+    @property
+    def buffer(self) -> Optional[io.StringIO]:
+        return getattr(self._local, "buffer", None)
+
+    @buffer.setter
+    def buffer(self, buffer: Optional[io.StringIO]) -> None:
+        self._local.buffer = buffer
+
+    def write(self, text: str) -> int:
+        return (self.buffer or self.stream).write(text)
+
+    def flush(self) -> None:
+        (self.buffer or self.stream).flush()
+
+    def __getattr__(self, name: str):
+        return getattr(self.stream, name)
+
+
+def load_batch_specs(specs_path: str, output_dir: str) -> List[BatchProject]:
+    """
+    Load and complete the project specifications of a batch file. The batch file is a YAML file of the form::
+
+        defaults:
+          domain: mlflow
+          language: pytorch
+        projects:
+          - project_name: first project
+          - project_name: second project
+            domain: package
+            language: prediction
+
+    Every project may set all properties of a .mlf_core.yml file. Unset properties are taken from the defaults section,
+    the mlf-core configuration file and finally the defaults of the prompts.
+    Exits with 1 if any specification is invalid, so that no project is created from a broken batch file.
+
+    :param specs_path: Path to the batch file
+    :param output_dir: The directory to create the projects in
+    :return: The projects in the order of the batch file
+    """
+    specs = load_yaml_file_read_only(specs_path)
+    if not isinstance(specs, dict) or not isinstance(specs.get("projects"), list):
+        print(f"[bold red]The batch file {specs_path} does not contain a list of projects.")
+        sys.exit(1)
+    defaults = specs.get("defaults") or {}
+    if not isinstance(defaults, dict):
+        print(f"[bold red]The defaults of the batch file {specs_path} are not a mapping.")
+        sys.exit(1)
+    try:
+        config = load_yaml_file_read_only(ConfigCommand.CONF_FILE_PATH) or {}
+    except FileNotFoundError:
+        config = {}
+
+    projects: List[BatchProject] = []
+    project_dirs: Dict[str, None] = {}
+    errors = []
+    for number, project in enumerate(specs["projects"], 1):
+        if not isinstance(project, dict) or not project.get("project_name"):
+            errors.append(f"Project {number} has no project_name.")
+            continue
+        spec = {
+            **BATCH_SPEC_DEFAULTS,
+            **{setting: config.get(setting) for setting in CONFIG_SETTINGS},
+            **defaults,
+            **project,
+        }
+        spec["domain"] = str(spec["domain"]).lower()
+        spec["project_name"] = str(spec["project_name"]).lower()
+        spec.setdefault("language", DEFAULT_LANGUAGES.get(spec["domain"]))
+        spec.setdefault("creator_github_username", spec["github_username"])
+        spec.setdefault("project_short_description", f"{spec['project_name']}. A mlf-core based .")
+        spec["version"] = str(spec["version"])
+        name = spec["project_name"]
+        missing = [setting for setting in CONFIG_SETTINGS if not spec.get(setting)]
+        if missing:
+            errors.append(
+                f"Project {name} does not set {', '.join(missing)} and no mlf-core config file provides them."
+            )
+        if spec["domain"] not in DOMAIN_CREATORS:
+            errors.append(f"Project {name} has the unknown domain {spec['domain']}.")
+        if not VERSION_REGEX.match(spec["version"]):
+            errors.append(f"The version {spec['version']} of project {name} does not match semantic versioning.")
+
+        project_dir = os.path.join(output_dir, name.replace(" ", "_"))
+        if project_dir in project_dirs:
+            errors.append(f"Project {name} is created more than once.")
+        project_dirs[project_dir] = None
+        projects.append(BatchProject(spec, project_dir))
+
+    if errors:
+        for error in errors:
+            print(f"[bold red]{error}")
+        print(f"[bold red]Invalid batch file {specs_path}! No project was created.")
+        sys.exit(1)
+    return projects
+
+
+class BatchCreate:
+    """
+    Create many projects from a batch file without any prompts.
+
+    The projects are created by a bounded pool of threads of a single process, so that all of them share the parsed
+    template registry, the compiled templates and the rendered template cache. Since a batch only creates local projects,
+    no GitHub repositories are created and the project names are not looked up on readthedocs.io.
+    The created projects are optionally linted afterwards in separate processes, since linting shows progress bars.
+
+    specs_path (str): Path to the batch file
+    output_dir (str): The directory to create the projects in
+    workers (int): The maximum number of projects created or linted concurrently
+    lint (bool): Whether to lint every created project
+    """
+
+    def __init__(self, specs_path: str, output_dir: str, workers: int = DEFAULT_BATCH_WORKERS, lint: bool = False):
+        self.specs_path = specs_path
+        self.output_dir = str(Path(output_dir).resolve())
+        self.workers = max(1, workers)
+        self.lint = lint
+        self.projects: List[BatchProject] = []
+
+    def create(self) -> None:
+        """
+        Create all projects of the batch file and print a summary table.
+        Exits with 1 if any project failed to be created or linted.
+        """
+        self.projects = load_batch_specs(self.specs_path, self.output_dir)
+        if not self.projects:
+            print(f"[bold red]No projects found in the batch file {self.specs_path}.")
+            sys.exit(1)
+        os.makedirs(self.output_dir, exist_ok=True)
+        print(f"[bold blue]Creating {len(self.projects)} projects in {self.output_dir} with {self.workers} workers.")
+
+        # the creators print their progress, which is captured per project instead of interleaving all projects
+        output = ThreadLocalOutput(sys.stdout)
+        sys.stdout = output
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for project in self.projects:
+                    executor.submit(self.create_project, project, output)
+        finally:
+            sys.stdout = output.stream
+
+        created = [project for project in self.projects if project.status == "created"]
+        if self.lint and created:
+            print(f"[bold blue]Linting {len(created)} projects.")
+            results = lint_projects([project.project_dir for project in created], processes=self.workers)
+            for project, result in zip(created, results):
+                project.lint = result
+
+        self.print_results()
+        if any(project.status == "failed" or (project.lint and not project.lint.ok) for project in self.projects):
+            sys.exit(1)
+
+    def create_project(self, project: BatchProject, output: ThreadLocalOutput) -> None:
+        """
+        Create a single project of the batch.
+
+        :param project: The project, which is updated in place
+        :param output: The stream capturing the output of the current thread
+        """
+        if os.path.exists(project.project_dir):
+            self.fail(project, "The project directory already exists")
+            return
+        output.buffer = io.StringIO()
+        start = time.perf_counter()
+        try:
+            creator = DOMAIN_CREATORS[project.spec["domain"]]()
+            creator.CWD = Path(self.output_dir)
+            creator.lint_after_creation = False
+            creator.create_template(Path(self.output_dir), project.spec)
+            project.status = "created"
+        except SystemExit:
+            # the last line printed before exiting explains the failure
+            last_lines = [line.strip() for line in output.buffer.getvalue().splitlines() if line.strip()][-1:]
+            self.fail(project, f"Creating the project failed: {''.join(last_lines)}".rstrip(": "))
+        except Exception as e:
+            log.debug(f"Creating {project.spec['project_name']} failed", exc_info=True)
+            self.fail(project, f"{e!r}")
+        finally:
+            project.seconds += time.perf_counter() - start
+            log.debug(f"Output of creating {project.spec['project_name']}:\n{output.buffer.getvalue()}")
+            output.buffer = None
+
+    @staticmethod
+    def fail(project: BatchProject, error: str) -> None:
+        project.status = "failed"
+        project.error = error
+
+    def print_results(self) -> None:
+        """
+        Print the template, status, lint results and duration of every project.
+        """
+        table = Table(
+            title="[bold]Batch create results",
+            title_style="blue",
+            header_style=Style(color="blue", bold=True),
+            box=box.HEAVY_HEAD,
+        )
+        table.add_column("Project", justify="left", style="green", no_wrap=True)
+        table.add_column("Template", justify="left")
+        table.add_column("Status", justify="left")
+        table.add_column("Lint", justify="left")
+        table.add_column("Time", justify="right")
+        table.add_column("Error", justify="left")
+        for project in self.projects:
+            table.add_row(
+                project.project_dir,
+                project.template_handle,
+                f"[{'green' if project.status == 'created' else 'red'}]{project.status}",
+                self.lint_summary(project.lint),
+                f"{project.seconds:.2f}s",
+                project.error or (project.lint.error if project.lint else None) or "",
+            )
+        console.print(table)
+        failed = sum(project.status == "failed" for project in self.projects)
+        failed_lint = sum(bool(project.lint and not project.lint.ok) for project in self.projects)
+        if failed:
+            print(f"[bold red]{failed} of {len(self.projects)} projects failed to be created.")
+        if failed_lint:
+            print(f"[bold red]{failed_lint} of {len(self.projects)} projects failed linting.")
+        if not failed and not failed_lint:
+            print(f"[bold green]Created {len(self.projects)} projects.")
+
+    @staticmethod
+    def lint_summary(result: Optional[LintResult]) -> str:
+        """
+        :param result: The lint results of a project or None if it was not linted
+        :return: The number of passed, warned and failed checks
+        """
+        if result is None:
+            return "-"
+        if result.error is not None:
+            return "[red]error"
+        style = "red" if result.failed else "yellow" if result.warned else "green"
+        return f"[{style}]{len(result.passed)} passed, {len(result.warned)} warned, {len(result.failed)} failed"
@@ -4,6 +4,9 @@ from mlf_core.create.domains.mlflow_creator import MlflowCreator
 from mlf_core.create.domains.package_creator import PackageCreator
 from mlf_core.custom_cli.questionary import mlf_core_questionary_or_dot_mlf_core
 
+# the creator of every domain
+DOMAIN_CREATORS = {"mlflow": MlflowCreator, "package": PackageCreator}
+
 
 def choose_domain(path: Path, domain: str or None, dot_mlf_core: dict = None):  # type: ignore
     """
@@ -25,7 +28,5 @@ def choose_domain(path: Path, domain: str or None, dot_mlf_core: dict = None):
             to_get_property="domain",
         )
 
-    switcher = {"mlflow": MlflowCreator, "package": PackageCreator}
-
-    creator_obj = switcher.get(domain.lower())()  # type: ignore
+    creator_obj = DOMAIN_CREATORS.get(domain.lower())()  # type: ignore
     creator_obj.create_template(path, dot_mlf_core)  # type: ignore
@@ -3,7 +3,6 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
-from mlf_core.common.version import load_mlf_core_template_version
 from mlf_core.create.domains.mlf_core_template_struct import MlfcoreTemplateStruct
 from mlf_core.create.github_support import prompt_github_repo
 from mlf_core.create.template_creator import TemplateCreator
@@ -28,15 +27,9 @@ class MlflowCreator(TemplateCreator):
         self.TEMPLATES_MLFLOW_PATH = f"{self.WD_Path.parent}/templates/mlflow"
 
         '"" TEMPLATE VERSIONS ""'
-        self.MLFLOW_PYTORCH_TEMPLATE_VERSION = load_mlf_core_template_version(
-            "mlflow-pytorch", self.AVAILABLE_TEMPLATES_PATH
-        )
-        self.MLFLOW_TENSORFLOW_TEMPLATE_VERSION = load_mlf_core_template_version(
-            "mlflow-tensorflow", self.AVAILABLE_TEMPLATES_PATH
-        )
-        self.MLFLOW_XGBOOST_TEMPLATE_VERSION = load_mlf_core_template_version(
-            "mlflow-xgboost", self.AVAILABLE_TEMPLATES_PATH
-        )
+        self.MLFLOW_PYTORCH_TEMPLATE_VERSION = self.TEMPLATE_REGISTRY.version("mlflow-pytorch")
+        self.MLFLOW_TENSORFLOW_TEMPLATE_VERSION = self.TEMPLATE_REGISTRY.version("mlflow-tensorflow")
+        self.MLFLOW_XGBOOST_TEMPLATE_VERSION = self.TEMPLATE_REGISTRY.version("mlflow-xgboost")
 
     def create_template(self, path: Path, dot_mlf_core):
         """
@@ -72,9 +65,6 @@ class MlflowCreator(TemplateCreator):
 
         if self.cli_struct.is_github_orga:
             self.cli_struct.github_username = self.cli_struct.github_orga
-        # create the chosen and configured template
-        super().create_template_without_subdomain(self.TEMPLATES_MLFLOW_PATH)
-
         # switch case statement to fetch the template version
         switcher_version = {
             "pytorch": self.MLFLOW_PYTORCH_TEMPLATE_VERSION,
@@ -86,19 +76,22 @@ class MlflowCreator(TemplateCreator):
             f"mlflow-{self.cli_struct.language.lower()}",  # type: ignore
         )
 
+        # create the chosen and configured template
+        super().create_template_without_subdomain(self.TEMPLATES_MLFLOW_PATH)
+
         # perform general operations like creating a GitHub repository and general linting
         super().process_common_operations(
             path=Path(path).resolve(), domain="mlflow", language=self.cli_struct.language, dot_mlf_core=dot_mlf_core  # type: ignore
         )
 
     def mlflow_pytorch_options(self, dot_mlf_core: Optional[dict]):
-        """ Prompts for mlflow-pytorch specific options and saves them into the MlflowTemplateStruct """
+        """Prompts for mlflow-pytorch specific options and saves them into the MlflowTemplateStruct"""
         pass
 
     def mlflow_tensorflow_options(self, dot_mlf_core: Optional[dict]):
-        """ Prompts for mlflow-tensorflow specific options and saves them into the MlflowTemplateStruct """
+        """Prompts for mlflow-tensorflow specific options and saves them into the MlflowTemplateStruct"""
         pass
 
     def mlflow_xgboost_options(self, dot_mlf_core: Optional[dict]):
-        """ Prompts for mlflow-xgboost specific options and saves them into the MlflowTemplateStruct """
+        """Prompts for mlflow-xgboost specific options and saves them into the MlflowTemplateStruct"""
         pass
@@ -2,7 +2,6 @@ import os
 from dataclasses import dataclass
 from pathlib import Path
 
-from mlf_core.common.version import load_mlf_core_template_version
 from mlf_core.create.domains.mlf_core_template_struct import MlfcoreTemplateStruct
 from mlf_core.create.github_support import prompt_github_repo
 from mlf_core.create.template_creator import TemplateCreator
@@ -26,9 +25,7 @@ class PackageCreator(TemplateCreator):
         self.TEMPLATES_PACKAGE_PATH = f"{self.WD_Path.parent}/templates/package"
 
         '"" TEMPLATE VERSIONS ""'
-        self.PACKAGE_PREDICTION_TEMPLATE_VERSION = load_mlf_core_template_version(
-            "package-prediction", self.AVAILABLE_TEMPLATES_PATH
-        )
+        self.PACKAGE_PREDICTION_TEMPLATE_VERSION = self.TEMPLATE_REGISTRY.version("package-prediction")
 
     def create_template(self, path: Path, dot_mlf_core):
         """
@@ -62,9 +59,6 @@ class PackageCreator(TemplateCreator):
 
         if self.package_struct.is_github_orga:
             self.package_struct.github_username = self.package_struct.github_orga
-        # create the chosen and configured template
-        super().create_template_without_subdomain(self.TEMPLATES_PACKAGE_PATH)
-
         # switch case statement to fetch the template version
         switcher_version = {
             "package": self.PACKAGE_PREDICTION_TEMPLATE_VERSION,
@@ -74,6 +68,9 @@ class PackageCreator(TemplateCreator):
             f"package-{self.package_struct.language.lower()}",  # type: ignore
         )
 
+        # create the chosen and configured template
+        super().create_template_without_subdomain(self.TEMPLATES_PACKAGE_PATH)
+
         # perform general operations like creating a GitHub repository and general linting
         super().process_common_operations(
             path=Path(path).resolve(),
@@ -83,7 +80,7 @@ class PackageCreator(TemplateCreator):
         )
 
     def package_prediction_options(self, dot_mlf_core):
-        """ Prompts for package-prediction specific options and saves them into the PackageTemplateStruct """
+        """Prompts for package-prediction specific options and saves them into the PackageTemplateStruct"""
         self.package_struct.framework = mlf_core_questionary_or_dot_mlf_core(
             function="select",
             question="Choose a framework",
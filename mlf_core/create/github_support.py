@@ -12,12 +12,11 @@ import requests
 from cryptography.fernet import Fernet
 from git import Repo, exc
 from github import Github, GithubException
-from mlf_core.common.load_yaml import load_yaml_file
+from mlf_core.common.load_yaml import load_yaml_file_read_only
 from mlf_core.create.domains.mlf_core_template_struct import MlfcoreTemplateStruct
 from mlf_core.custom_cli.questionary import mlf_core_questionary_or_dot_mlf_core
 from nacl import encoding, public
 from rich import print
-from ruamel.yaml import YAML
 
 from mlf_core.config.config import ConfigCommand
 
@@ -177,9 +176,7 @@ def handle_pat_authentification():
     log.debug(f"Attempting to read the personal access token from {ConfigCommand.CONF_FILE_PATH}")
     # check if the key and encrypted PAT already exist
     if os.path.exists(ConfigCommand.CONF_FILE_PATH):
-        path = Path(ConfigCommand.CONF_FILE_PATH)
-        yaml = YAML(typ="safe")
-        settings = yaml.load(path)
+        settings = load_yaml_file_read_only(ConfigCommand.CONF_FILE_PATH)
         if os.path.exists(ConfigCommand.KEY_PAT_FILE) and "pat" in settings:
             pat = decrypt_pat()
             return pat
@@ -352,7 +349,7 @@ def decrypt_pat() -> str:
         key = f.readline()
     fer = Fernet(key)
     log.debug(f"Reading personal access token from {ConfigCommand.CONF_FILE_PATH}.")
-    encrypted_pat = load_yaml_file(ConfigCommand.CONF_FILE_PATH)["pat"]
+    encrypted_pat = load_yaml_file_read_only(ConfigCommand.CONF_FILE_PATH)["pat"]
     # decrypt the PAT and decode it to string
     print("[bold blue]Decrypting personal access token.")
     decrypted_pat = fer.decrypt(encrypted_pat).decode("utf-8")
@@ -366,7 +363,7 @@ def load_github_username() -> str:
 
     :return: The users Github account name
     """
-    return load_yaml_file(ConfigCommand.CONF_FILE_PATH)["github_username"]
+    return load_yaml_file_read_only(ConfigCommand.CONF_FILE_PATH)["github_username"]
 
 
 def handle_failed_github_repo_creation(e) -> None:
@@ -0,0 +1,199 @@
+import errno
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
+
+import appdirs
+import cookiecutter
+
+log = logging.getLogger(__name__)
+
+# the rendered templates are cached next to mlf-core's configuration file
+RENDER_CACHE_PATH = f'{appdirs.user_config_dir(appname="mlf_core")}/rendered_templates'
+# increased whenever the layout of the cache or the rendering of templates changes
+RENDER_CACHE_FORMAT = 1
+# number of rendered templates kept in the cache, the least recently used ones are removed first
+RENDER_CACHE_MAX_ENTRIES = 32
+# ioctl request to clone a file on copy on write file systems like btrfs or XFS (FICLONE from linux/fs.h)
+FICLONE = 0x40049409
+
+# hashes of template source trees by their path and the modification time and size of all their files
+_tree_hashes: Dict[Tuple[str, Tuple[Tuple[str, int, int, int], ...]], str] = {}
+_tree_hashes_lock = threading.Lock()
+# whether the file system of the cache rejected a reflink, so that all further files are copied right away
+_reflinks_unsupported = False
+
+
+def template_tree_hash(template_dir: str) -> str:
+    """
+    Hash the paths, permissions and contents of all files of a template source tree.
+    Every tree is only read once per process and modification.
+
+    :param template_dir: The top level directory of the template
+    :return: The hex digest of the template tree
+    """
+    files = []
+    for root, dir_names, file_names in os.walk(template_dir):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            file_path = os.path.join(root, file_name)
+            stat = os.lstat(file_path)
+            files.append((os.path.relpath(file_path, template_dir), stat.st_mode, stat.st_mtime_ns, stat.st_size))
+    signature = (os.path.realpath(template_dir), tuple(files))
+    with _tree_hashes_lock:
+        if signature in _tree_hashes:
+            return _tree_hashes[signature]
+
+    tree_hash = hashlib.sha256()
+    for path, mode, _, _ in files:
+        file_path = os.path.join(template_dir, path)
+        # only the executable bit of a file is kept when rendering it
+        tree_hash.update(f"{path}\0{mode & 0o111 != 0}\0".encode())
+        if os.path.islink(file_path):
+            tree_hash.update(os.readlink(file_path).encode())
+        else:
+            with open(file_path, "rb") as file:
+                tree_hash.update(hashlib.sha256(file.read()).digest())
+    with _tree_hashes_lock:
+        _tree_hashes[signature] = tree_hash.hexdigest()
+    return _tree_hashes[signature]
+
+
+def render_cache_key(template_dirs: List[str], template_version: str, context: dict) -> str:
+    """
+    Compute the key of a rendered template, which changes whenever the rendered files may change.
+    Since the templates render the current date using {% now %}, the date is part of the key.
+
+    :param template_dirs: The template source trees rendered into the project, for example the domain template and the common files
+    :param template_version: The version of the template
+    :param context: The context the templates are rendered with
+    :return: The hex digest of the rendered template
+    """
+    key = {
+        "format": RENDER_CACHE_FORMAT,
+        "cookiecutter": cookiecutter.__version__,
+        "templates": [template_tree_hash(template_dir) for template_dir in template_dirs],
+        "template_version": template_version,
+        "context": context,
+        "date": date.today().isoformat(),
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def render_cached(
+    key: str, target_dir: str, render: Callable[[str], None], cache_path: Optional[str] = RENDER_CACHE_PATH
+) -> bool:
+    """
+    Materialize a rendered template from the cache or render and cache it if it is not cached yet.
+    The files are cloned using reflinks if the file system supports them and are copied otherwise.
+    Hard links are never used, since the files of created projects are modified in place, which would corrupt the cache.
+
+    :param key: The key of the rendered template (see render_cache_key)
+    :param target_dir: The directory to materialize the rendered template into. Existing files are overwritten.
+    :param render: Renders the template into the passed empty directory
+    :param cache_path: The directory of the cache or None to not use the cache
+    :return: Whether the rendered template was found in the cache
+    """
+    entry_dir = os.path.join(cache_path, key) if cache_path else None
+    if entry_dir and os.path.isdir(entry_dir):
+        log.debug(f"Using cached rendered template {entry_dir}")
+        # the modification time of an entry marks its last use
+        os.utime(entry_dir)
+        clone_tree(entry_dir, target_dir)
+        return True
+
+    if not cache_path:
+        render(target_dir)
+        return False
+    try:
+        os.makedirs(cache_path, exist_ok=True)
+        staging_dir = tempfile.mkdtemp(dir=cache_path, prefix=".render-")
+    except OSError as e:
+        log.debug(f"Unable to use the rendered template cache at {cache_path}: {e}")
+        render(target_dir)
+        return False
+    try:
+        render(staging_dir)
+        clone_tree(staging_dir, target_dir)
+        try:
+            os.rename(staging_dir, entry_dir)  # type: ignore
+        except OSError:
+            # the same template was rendered and cached concurrently
+            pass
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+    prune_render_cache(cache_path)
+    return False
+
+
+def prune_render_cache(cache_path: str, max_entries: int = RENDER_CACHE_MAX_ENTRIES) -> None:
+    """
+    Remove the least recently used rendered templates, so that at most max_entries are kept.
+
+    :param cache_path: The directory of the cache
+    :param max_entries: The maximum number of rendered templates to keep
+    """
+    try:
+        entries = [entry for entry in os.scandir(cache_path) if entry.is_dir() and not entry.name.startswith(".")]
+    except OSError:
+        return
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in entries[max_entries:]:
+        log.debug(f"Removing rendered template {entry.path} from the cache")
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def clone_tree(source_dir: str, target_dir: str) -> None:
+    """
+    Clone all files of a directory tree into another directory, overwriting existing files.
+
+    :param source_dir: The directory to clone
+    :param target_dir: The directory to clone the files into, which is created if it does not exist
+    """
+    for root, _, file_names in os.walk(source_dir):
+        target_root = os.path.join(target_dir, os.path.relpath(root, source_dir))
+        os.makedirs(target_root, exist_ok=True)
+        for file_name in file_names:
+            clone_file(os.path.join(root, file_name), os.path.join(target_root, file_name))
+
+
+def clone_file(source_path: str, target_path: str) -> None:
+    """
+    Clone a file using a reflink if supported by the file system or copy it otherwise. The permissions are copied as well.
+
+    :param source_path: The file to clone
+    :param target_path: The path of the clone, which is overwritten if it exists
+    """
+    global _reflinks_unsupported
+    # never write through an existing symbolic link
+    if os.path.islink(target_path):
+        os.unlink(target_path)
+    if os.path.islink(source_path):
+        if os.path.lexists(target_path):
+            os.unlink(target_path)
+        os.symlink(os.readlink(source_path), target_path)
+        return
+    if not _reflinks_unsupported:
+        try:
+            import fcntl
+
+            with open(source_path, "rb") as source, open(target_path, "wb") as target:
+                fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+            shutil.copymode(source_path, target_path)
+            return
+        except ImportError:
+            _reflinks_unsupported = True
+        except OSError as e:
+            if e.errno not in (errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS):
+                raise
+            # reflinks are only supported within a single copy on write file system
+            if e.errno != errno.EXDEV:
+                _reflinks_unsupported = True
+    shutil.copyfile(source_path, target_path)
+    shutil.copymode(source_path, target_path)
@@ -3,22 +3,23 @@ import os
 import re
 import shutil
 import sys
-import tempfile
 from collections import OrderedDict
 from dataclasses import asdict
-from distutils.dir_util import copy_tree
 from pathlib import Path
+from typing import List, Tuple
 
 import requests
-from cookiecutter.main import cookiecutter
 from rich import print
 from ruamel.yaml import YAML
 
 import mlf_core
-from mlf_core.common.load_yaml import load_yaml_file
+from mlf_core.common.load_yaml import load_yaml_file_read_only
+from mlf_core.common.template_registry import load_template_registry
 from mlf_core.config.config import ConfigCommand
 from mlf_core.create.domains.mlf_core_template_struct import MlfcoreTemplateStruct
 from mlf_core.create.github_support import create_push_github_repository, is_git_repo, load_github_username
+from mlf_core.create.render_cache import render_cache_key, render_cached
+from mlf_core.create.template_renderer import RenderManifest
 from mlf_core.custom_cli.questionary import mlf_core_questionary_or_dot_mlf_core
 from mlf_core.lint.lint import lint_project
 from mlf_core.util.dir_util import delete_dir_tree
@@ -40,9 +41,12 @@ class TemplateCreator:
         self.COMMON_FILES_PATH = f"{self.TEMPLATES_PATH}/common_all_files"
         self.COMMON_MLFLOW_FILES_PATH = f"{self.TEMPLATES_PATH}/common_mlflow_files"
         self.AVAILABLE_TEMPLATES_PATH = f"{self.TEMPLATES_PATH}/available_templates.yml"
-        self.AVAILABLE_TEMPLATES = load_yaml_file(self.AVAILABLE_TEMPLATES_PATH)
+        self.TEMPLATE_REGISTRY = load_template_registry(self.AVAILABLE_TEMPLATES_PATH)
+        # the directory the project is created in
         self.CWD = Path.cwd()
         self.creator_ctx = creator_ctx
+        # whether to lint the project after creating it, which exits if any check fails
+        self.lint_after_creation = True
 
     def process_common_operations(
         self,
@@ -57,22 +61,6 @@ class TemplateCreator:
         Create all stuff that is common for mlf-core's template creation process; in detail those things are:
         create and copy common files, fix docs style, lint the project and ask whether the user wants to create a github repo.
         """
-        # create the common files and copy them into the templates directory
-        self.create_common_files(domain="all", common_files_path=self.COMMON_FILES_PATH)
-        # key in the switcher indicates, whether there are domain specific files or not (None)
-        domain_switcher = {"mlflow": "mlflow", "package": None}
-        # if project is a project with domain specific files, copy all common files for the domain of this project
-        try:
-            domain_specific_files = domain_switcher[self.creator_ctx.domain]
-        # this should only be the case, if mlf-core is developed further and new domains are added, therefore the error message
-        except KeyError:
-            print(
-                f"[bold red]Unknown domain {self.creator_ctx.domain}! This domain seems to be new and must be added into the domain switcher!"
-            )
-            sys.exit(1)
-        if domain_specific_files:
-            self.create_common_files(domain=domain_specific_files, common_files_path=self.COMMON_MLFLOW_FILES_PATH)
-
         self.create_dot_mlf_core(template_version=self.creator_ctx.template_version)
 
         project_path = f"{self.CWD}/{self.creator_ctx.project_slug}"
@@ -82,7 +70,8 @@ class TemplateCreator:
             fix_short_title_underline(f"{project_path}/docs/index.rst")
 
         # Lint the project to verify that the new template adheres to all standards
-        lint_project(project_path)
+        if self.lint_after_creation:
+            lint_project(project_path)
 
         if self.creator_ctx.is_github_repo and not dot_mlf_core:
             # rename the currently created template to a temporary name, create Github repo, push, remove temporary template
@@ -112,7 +101,7 @@ class TemplateCreator:
     def create_template_without_subdomain(self, domain_path: str) -> None:
         """
         Creates a chosen template that does **not** have a subdomain.
-        Calls cookiecutter on the main chosen template.
+        Renders the main chosen template.
 
         :param domain_path: Path to the template, which is still in cookiecutter format
         """
@@ -123,27 +112,17 @@ class TemplateCreator:
 
             # Confirm proceeding with overwriting existing directory
             if mlf_core_questionary_or_dot_mlf_core("confirm", "Do you really want to continue?", default="Yes"):
-                cookiecutter(
-                    f"{domain_path}/{self.creator_ctx.domain}_{self.creator_ctx.language.lower()}",
-                    no_input=True,
-                    overwrite_if_exists=True,
-                    extra_context=self.creator_ctx_to_dict(),
-                )
+                self.render_template(f"{domain_path}/{self.creator_ctx.domain}_{self.creator_ctx.language.lower()}")
             else:
                 print("[bold red]Aborted! Canceled template creation!")
                 sys.exit(0)
         else:
-            cookiecutter(
-                f"{domain_path}/{self.creator_ctx.domain}_{self.creator_ctx.language.lower()}",
-                no_input=True,
-                overwrite_if_exists=True,
-                extra_context=self.creator_ctx_to_dict(),
-            )
+            self.render_template(f"{domain_path}/{self.creator_ctx.domain}_{self.creator_ctx.language.lower()}")
 
     def create_template_with_subdomain(self, domain_path: str, subdomain: str) -> None:
         """
         Creates a chosen template that **does** have a subdomain.
-        Calls cookiecutter on the main chosen template.
+        Renders the main chosen template.
 
         :param domain_path: Path to the template, which is still in cookiecutter format
         :param subdomain: Subdomain of the chosen template
@@ -155,28 +134,18 @@ class TemplateCreator:
             # Confirm proceeding with overwriting existing directory
             if mlf_core_questionary_or_dot_mlf_core("confirm", "Do you really want to continue?", default="Yes"):
                 delete_dir_tree(Path(f"{self.CWD}/{self.creator_ctx.project_slug}"))
-                cookiecutter(
-                    f"{domain_path}/{subdomain}_{self.creator_ctx.language.lower()}",
-                    no_input=True,
-                    overwrite_if_exists=True,
-                    extra_context=self.creator_ctx_to_dict(),
-                )
+                self.render_template(f"{domain_path}/{subdomain}_{self.creator_ctx.language.lower()}")
 
             else:
                 print("[bold red]Aborted! Canceled template creation!")
                 sys.exit(0)
         else:
-            cookiecutter(
-                f"{domain_path}/{subdomain}_{self.creator_ctx.language.lower()}",
-                no_input=True,
-                overwrite_if_exists=True,
-                extra_context=self.creator_ctx_to_dict(),
-            )
+            self.render_template(f"{domain_path}/{subdomain}_{self.creator_ctx.language.lower()}")
 
     def create_template_with_subdomain_framework(self, domain_path: str, subdomain: str, framework: str) -> None:
         """
         Creates a chosen template that **does** have a subdomain.
-        Calls cookiecutter on the main chosen template.
+        Renders the main chosen template.
 
         :param domain_path: Path to the template, which is still in cookiecutter format
         :param subdomain: Subdomain of the chosen template
@@ -188,23 +157,13 @@ class TemplateCreator:
 
             # Confirm proceeding with overwriting existing directory
             if mlf_core_questionary_or_dot_mlf_core("confirm", "Do you really want to continue?", default="Yes"):
-                cookiecutter(
-                    f"{domain_path}/{subdomain}_{self.creator_ctx.language.lower()}/{framework}",
-                    no_input=True,
-                    overwrite_if_exists=True,
-                    extra_context=self.creator_ctx_to_dict(),
-                )
+                self.render_template(f"{domain_path}/{subdomain}_{self.creator_ctx.language.lower()}/{framework}")
 
             else:
                 print("[bold red]Aborted! Canceled template creation!")
                 sys.exit(0)
         else:
-            cookiecutter(
-                f"{domain_path}/{subdomain}_{self.creator_ctx.language.lower()}/{framework}",
-                no_input=True,
-                overwrite_if_exists=True,
-                extra_context=self.creator_ctx_to_dict(),
-            )
+            self.render_template(f"{domain_path}/{subdomain}_{self.creator_ctx.language.lower()}/{framework}")
 
     def prompt_general_template_configuration(self, dot_mlf_core: OrderedDict):
         """
@@ -217,8 +176,8 @@ class TemplateCreator:
                 self.creator_ctx.full_name = dot_mlf_core["full_name"]
                 self.creator_ctx.email = dot_mlf_core["email"]
             else:
-                self.creator_ctx.full_name = load_yaml_file(ConfigCommand.CONF_FILE_PATH)["full_name"]
-                self.creator_ctx.email = load_yaml_file(ConfigCommand.CONF_FILE_PATH)["email"]
+                self.creator_ctx.full_name = load_yaml_file_read_only(ConfigCommand.CONF_FILE_PATH)["full_name"]
+                self.creator_ctx.email = load_yaml_file_read_only(ConfigCommand.CONF_FILE_PATH)["email"]
         except FileNotFoundError:
             # style and automatic use config
             print("[bold red]Cannot find a mlf_core config file. Is this your first time using mlf-core?")
@@ -247,7 +206,8 @@ class TemplateCreator:
 
         # check if the project name is already taken on readthedocs.io
         # lower the string, since mlflow doesn't play with uppercase docker container names
-        while self.readthedocs_slug_already_exists(self.creator_ctx.project_name) and not dot_mlf_core:
+        # the name of a project created from a .mlf_core.yml file is kept anyways, so it is not looked up
+        while not dot_mlf_core and self.readthedocs_slug_already_exists(self.creator_ctx.project_name):
             print(f"[bold red]A project named {self.creator_ctx.project_name} already exists at readthedocs.io!")
             if mlf_core_questionary_or_dot_mlf_core(
                 function="confirm",
@@ -320,47 +280,76 @@ class TemplateCreator:
             self.creator_ctx.github_username = load_github_username()
             self.creator_ctx.creator_github_username = self.creator_ctx.github_username
 
-    def create_common_files(self, domain: str, common_files_path: str) -> None:
+    def render_template(self, template_path: str) -> None:
         """
-        Create a temporary directory for common files of a specified domain or all templates and apply cookiecutter on them.
-        They are subsequently moved into the directory of the created template.
+        Render the chosen template together with the common files of its domain into the current working directory.
+        Rendered templates are cached, so that rendering a template with the same version and configuration again,
+        for example when syncing a project, only copies the rendered files.
+
+        :param template_path: Path to the chosen template, which is still in cookiecutter format
         """
-        log.debug("Creating common files.")
-        dirpath = tempfile.mkdtemp()
-        copy_tree(common_files_path, dirpath)
-        cwd_project = self.CWD
-        os.chdir(dirpath)
-        log.debug(f"Cookiecuttering common files at {dirpath}")
-        cookiecutter(
-            dirpath,
-            extra_context={
-                "full_name": self.creator_ctx.full_name,
-                "email": self.creator_ctx.email,
-                "language": self.creator_ctx.language,
-                "domain": self.creator_ctx.domain,
-                "project_name": self.creator_ctx.project_name,
-                "project_slug": self.creator_ctx.project_slug,
-                "project_slug_no_hyphen": self.creator_ctx.project_slug_no_hyphen,
-                "version": self.creator_ctx.version,
-                "license": self.creator_ctx.license,
-                "project_short_description": self.creator_ctx.project_short_description,
-                "github_username": self.creator_ctx.github_username,
-                "creator_github_username": self.creator_ctx.creator_github_username,
-                "framework": self.creator_ctx.language.capitalize() if domain == "mlflow" else "",
-            },
-            no_input=True,
-            overwrite_if_exists=True,
-        )
+        template_paths = [template_path] + [common_files_path for _, common_files_path in self.common_files_paths()]
+        key = render_cache_key(template_paths, self.creator_ctx.template_version, self.creator_ctx_to_dict())
+        if render_cached(key, str(self.CWD), lambda output_dir: self.render_template_files(template_path, output_dir)):
+            log.debug(f"Created {self.creator_ctx.project_slug} from the rendered template cache.")
+
+    def render_template_files(self, template_path: str, output_dir: str) -> None:
+        """
+        Render the chosen template and the common files of its domain, which are overlaid on the created template.
+        All files are rendered concurrently straight into the project directory.
 
-        # copy the common files directory content to the created project
-        log.debug("Copying common files into the created project")
-        copy_tree(f"{Path.cwd()}/common_{domain}_files", f"{cwd_project}/{self.creator_ctx.project_slug}")
-        # delete the tmp cookiecuttered common files directory
-        log.debug("Delete common files directory.")
-        delete_dir_tree(Path(f"{Path.cwd()}/common_{domain}_files"))
-        shutil.rmtree(dirpath)
-        # change to recent cwd so lint can run properly
-        os.chdir(str(cwd_project))
+        :param template_path: Path to the chosen template, which is still in cookiecutter format
+        :param output_dir: The directory to create the project in
+        """
+        manifest = RenderManifest(self.TEMPLATES_PATH)
+        manifest.add_template(template_path, self.creator_ctx_to_dict())
+        for domain, common_files_path in self.common_files_paths():
+            log.debug(f"Adding common files of {domain} to the created project.")
+            manifest.add_template(
+                common_files_path, self.common_files_context(domain), project_dir=self.creator_ctx.project_slug
+            )
+        manifest.render(output_dir)
+
+    def common_files_paths(self) -> List[Tuple[str, str]]:
+        """
+        :return: The domain and path of all common files, which are copied into the created template
+        """
+        common_files_paths = [("all", self.COMMON_FILES_PATH)]
+        # key in the switcher indicates, whether there are domain specific files or not (None)
+        domain_switcher = {"mlflow": "mlflow", "package": None}
+        # if project is a project with domain specific files, copy all common files for the domain of this project
+        try:
+            domain_specific_files = domain_switcher[self.creator_ctx.domain]
+        # this should only be the case, if mlf-core is developed further and new domains are added, therefore the error message
+        except KeyError:
+            print(
+                f"[bold red]Unknown domain {self.creator_ctx.domain}! This domain seems to be new and must be added into the domain switcher!"
+            )
+            sys.exit(1)
+        if domain_specific_files:
+            common_files_paths.append((domain_specific_files, self.COMMON_MLFLOW_FILES_PATH))
+        return common_files_paths
+
+    def common_files_context(self, domain: str) -> dict:
+        """
+        :param domain: The domain of the common files or all
+        :return: The context to render the common files with
+        """
+        return {
+            "full_name": self.creator_ctx.full_name,
+            "email": self.creator_ctx.email,
+            "language": self.creator_ctx.language,
+            "domain": self.creator_ctx.domain,
+            "project_name": self.creator_ctx.project_name,
+            "project_slug": self.creator_ctx.project_slug,
+            "project_slug_no_hyphen": self.creator_ctx.project_slug_no_hyphen,
+            "version": self.creator_ctx.version,
+            "license": self.creator_ctx.license,
+            "project_short_description": self.creator_ctx.project_short_description,
+            "github_username": self.creator_ctx.github_username,
+            "creator_github_username": self.creator_ctx.creator_github_username,
+            "framework": self.creator_ctx.language.capitalize() if domain == "mlflow" else "",
+        }
 
     def readthedocs_slug_already_exists(self, project_name: str) -> bool:
         """
@@ -408,7 +397,7 @@ class TemplateCreator:
         log.debug("Creating .mlf_core.yml file.")
         self.creator_ctx.template_version = f"{template_version} # <<MLF-CORE_NO_BUMP>>"
         self.creator_ctx.mlf_core_version = f"{mlf_core.__version__} # <<MLF-CORE_NO_BUMP>>"
-        with open(f"{self.creator_ctx.project_slug}/.mlf_core.yml", "w") as f:
+        with open(f"{self.CWD}/{self.creator_ctx.project_slug}/.mlf_core.yml", "w") as f:
             yaml = YAML()
             struct_to_dict = self.creator_ctx_to_dict()
             yaml.dump(struct_to_dict, f)
@@ -0,0 +1,251 @@
+import io
+import logging
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Dict, List, Optional
+
+import appdirs
+from binaryornot.check import is_binary
+from cookiecutter.config import get_user_config
+from cookiecutter.environment import StrictEnvironment
+from cookiecutter.exceptions import UndefinedVariableInTemplate
+from cookiecutter.find import find_template
+from cookiecutter.generate import generate_context, is_copy_only_path
+from cookiecutter.hooks import find_hook, run_script_with_context
+from cookiecutter.prompt import prompt_for_config
+from jinja2 import FileSystemBytecodeCache, FileSystemLoader, Template
+from jinja2.exceptions import UndefinedError
+
+log = logging.getLogger(__name__)
+
+TEMPLATES_PATH = f"{os.path.dirname(__file__)}/templates"
+# the compiled Jinja templates are cached next to mlf-core's configuration file
+TEMPLATE_BYTECODE_CACHE_PATH = f'{appdirs.user_config_dir(appname="mlf_core")}/template_bytecode'
+
+# the shared environment of every templates directory
+_environments: Dict[str, StrictEnvironment] = {}
+# the compiled templates of all templated file and directory names
+_name_templates: Dict[str, Template] = {}
+_lock = threading.Lock()
+
+
+def template_environment(
+    templates_path: str = TEMPLATES_PATH, bytecode_cache_path: Optional[str] = TEMPLATE_BYTECODE_CACHE_PATH
+) -> StrictEnvironment:
+    """
+    Get the Jinja environment shared by all templates below a directory.
+    Every template file is compiled at most once per process, since the environment keeps all loaded templates.
+    The compiled templates are also stored in a bytecode cache, so that later mlf-core runs do not need to compile them again.
+
+    :param templates_path: The directory containing the templates, by default the templates shipped with mlf-core
+    :param bytecode_cache_path: The directory of the bytecode cache or None to not cache the compiled templates
+    :return: The cookiecutter environment of the templates directory
+    """
+    templates_path = os.path.realpath(templates_path)
+    with _lock:
+        if templates_path not in _environments:
+            bytecode_cache = None
+            if bytecode_cache_path:
+                try:
+                    os.makedirs(bytecode_cache_path, exist_ok=True)
+                    bytecode_cache = FileSystemBytecodeCache(bytecode_cache_path)
+                except OSError as e:
+                    log.debug(f"Unable to use the template bytecode cache at {bytecode_cache_path}: {e}")
+            _environments[templates_path] = StrictEnvironment(
+                keep_trailing_newline=True,
+                loader=FileSystemLoader(templates_path),
+                bytecode_cache=bytecode_cache,
+                # keep all templates instead of the 400 most recently used ones
+                cache_size=-1,
+            )
+        return _environments[templates_path]
+
+
+def template_context(repo_dir: str, extra_context: dict) -> dict:
+    """
+    Build the context of a template like cookiecutter without any prompts: the defaults of its cookiecutter.json are
+    overridden by the user's cookiecutter configuration and the extra context and are then rendered.
+
+    :param repo_dir: The directory of the template containing its cookiecutter.json
+    :param extra_context: The values overriding the defaults of the cookiecutter.json
+    :return: The cookiecutter context
+    """
+    context = generate_context(
+        context_file=os.path.join(repo_dir, "cookiecutter.json"),
+        default_context=get_user_config()["default_context"],
+        extra_context=extra_context,
+    )
+    context["cookiecutter"] = prompt_for_config(context, no_input=True)
+    context["cookiecutter"]["_template"] = repo_dir
+    return context
+
+
+@dataclass
+class TemplateLayer:
+    """
+    A template rendered into the project.
+    """
+
+    repo_dir: str  # the directory of the template containing its cookiecutter.json and hooks
+    project_dir: str  # the directory the template is rendered into relative to the output directory
+    context: dict
+
+
+@dataclass
+class ManifestFile:
+    """
+    A file of the project and the template file it is rendered from.
+    """
+
+    source_path: str
+    # the name of the Jinja template or None if the file is always copied without rendering
+    template_name: Optional[str]
+    layer: TemplateLayer
+
+
+class RenderManifest:
+    """
+    All files of a project rendered from one or more templates.
+
+    Every template is added as a layer. The files of later layers take precedence over files of earlier layers with the same path,
+    so common files can be overlaid on the chosen template without rendering them into a temporary directory first.
+    Since all files are known before anything is rendered, they are rendered concurrently straight into the output directory.
+    """
+
+    def __init__(self, templates_path: str = TEMPLATES_PATH):
+        """
+        :param templates_path: The directory containing all templates of the manifest
+        """
+        self.templates_path = os.path.realpath(templates_path)
+        self.environment = template_environment(self.templates_path)
+        self.layers: List[TemplateLayer] = []
+        # all directories and files relative to the output directory in the order they are created
+        self.directories: Dict[str, None] = {}
+        self.files: Dict[str, ManifestFile] = {}
+
+    def add_template(self, repo_dir: str, extra_context: dict, project_dir: Optional[str] = None) -> str:
+        """
+        Add all files of a cookiecutter template as a new layer.
+
+        :param repo_dir: The directory of the template containing its cookiecutter.json
+        :param extra_context: The values overriding the defaults of the cookiecutter.json
+        :param project_dir: The directory relative to the output directory, which the templated project directory is rendered into.
+                            Defaults to the rendered name of the templated project directory like cookiecutter.
+        :return: The directory the template is rendered into relative to the output directory
+        """
+        repo_dir = os.path.realpath(repo_dir)
+        context = template_context(repo_dir, extra_context)
+        template_dir = find_template(repo_dir)
+        if project_dir is None:
+            project_dir = self.render_name(os.path.basename(template_dir), context)
+        layer = TemplateLayer(repo_dir, os.path.normpath(project_dir), context)
+        self.layers.append(layer)
+        self.directories[layer.project_dir] = None
+
+        # directories copied without rendering are copied with all their content like cookiecutter does
+        copied_dirs = set()
+        for root, dir_names, file_names in os.walk(template_dir):
+            rel_root = os.path.relpath(root, template_dir)
+            copy_only_dir = rel_root != os.curdir and (
+                os.path.dirname(rel_root) in copied_dirs or is_copy_only_path(rel_root, context)
+            )
+            if copy_only_dir:
+                copied_dirs.add(rel_root)
+            # the names of copied directories are not rendered
+            out_root = os.path.normpath(
+                os.path.join(layer.project_dir, rel_root if copy_only_dir else self.render_name(rel_root, context))
+            )
+            self.directories[out_root] = None
+            for file_name in file_names:
+                source_path = os.path.join(root, file_name)
+                if copy_only_dir:
+                    out_name, template_name = file_name, None
+                else:
+                    out_name = self.render_name(file_name, context)
+                    # Jinja template names always use forward slashes
+                    template_name = os.path.relpath(source_path, self.templates_path).replace(os.path.sep, "/")
+                    if is_copy_only_path(os.path.normpath(os.path.join(rel_root, file_name)), context):
+                        template_name = None
+                if not out_name:
+                    # the file name was rendered empty
+                    continue
+                out_path = os.path.join(out_root, out_name)
+                # later layers overwrite the files of earlier layers
+                self.files.pop(out_path, None)
+                self.files[out_path] = ManifestFile(source_path, template_name, layer)
+        return layer.project_dir
+
+    def render_name(self, name: str, context: dict) -> str:
+        """
+        Render a templated file or directory name like {{ cookiecutter.project_slug }}.
+
+        :param name: The name, which may contain Jinja expressions
+        :param context: The cookiecutter context
+        :return: The rendered name
+        """
+        if "{" not in name:
+            return name
+        with _lock:
+            if name not in _name_templates:
+                _name_templates[name] = self.environment.from_string(name)
+        return _name_templates[name].render(**context)
+
+    def render(self, output_dir: str, workers: Optional[int] = None) -> None:
+        """
+        Render all files of the manifest into the output directory. Existing files are overwritten.
+        The pre generate hooks of all layers are run before and the post generate hooks after rendering all files.
+
+        :param output_dir: The directory to render the project into
+        :param workers: Number of files rendered concurrently. Defaults to the default of the ThreadPoolExecutor.
+        """
+        output_dir = os.path.abspath(output_dir)
+        for directory in self.directories:
+            os.makedirs(os.path.join(output_dir, directory), exist_ok=True)
+        self.run_hooks("pre_gen_project", output_dir)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # consume the results to raise the first error of any file
+            for _ in executor.map(partial(self.render_file, output_dir), self.files, self.files.values()):
+                pass
+        self.run_hooks("post_gen_project", output_dir)
+
+    def render_file(self, output_dir: str, path: str, manifest_file: ManifestFile) -> None:
+        """
+        Render a single file of the manifest or copy it if it is not rendered.
+
+        :param output_dir: The directory to render the project into
+        :param path: The path of the file relative to the output directory
+        :param manifest_file: The file to render
+        """
+        out_path = os.path.join(output_dir, path)
+        # binary files are copied without rendering
+        if manifest_file.template_name is None or is_binary(manifest_file.source_path):
+            shutil.copyfile(manifest_file.source_path, out_path)
+        else:
+            context = manifest_file.layer.context
+            try:
+                content = self.environment.get_template(manifest_file.template_name).render(**context)
+            except UndefinedError as e:
+                raise UndefinedVariableInTemplate(f"Unable to create file '{manifest_file.source_path}'", e, context)
+            with io.open(out_path, "w", encoding="utf-8") as file:
+                file.write(content)
+        shutil.copymode(manifest_file.source_path, out_path)
+
+    def run_hooks(self, hook_name: str, output_dir: str) -> None:
+        """
+        Run a cookiecutter hook of every layer in the order the layers were added.
+        The hooks are looked up in the template directories without changing the working directory,
+        so that several projects can be rendered concurrently by threads of the same process.
+
+        :param hook_name: The name of the hook (pre_gen_project or post_gen_project)
+        :param output_dir: The directory the project is rendered into
+        """
+        for layer in self.layers:
+            script = find_hook(hook_name, hooks_dir=os.path.join(layer.repo_dir, "hooks"))
+            if script is None:
+                log.debug(f"No {hook_name} hook found in {layer.repo_dir}")
+                continue
+            run_script_with_context(script, os.path.join(output_dir, layer.project_dir), layer.context)
@@ -11,7 +11,6 @@ from rich import print
 from rich.console import Console
 
 from mlf_core import __version__
-from mlf_core.bump_version.bump_version import VersionBumper
 
 
 class HelpErrorHandling(click.Group):
@@ -89,6 +88,9 @@ class HelpErrorHandling(click.Group):
             formatter.write_text(
                 f"{self.commands.get('lint').name}\t\t\t{self.commands.get('lint').get_short_help_str(limit=150)}"
             )
+            formatter.write_text(
+                f"{self.commands.get('package-snapshot').name}\t{self.commands.get('package-snapshot').get_short_help_str(limit=150)}"
+            )
             formatter.write_text(
                 f"{self.commands.get('fix-artifact-paths').name}\t{self.commands.get('fix-artifact-paths').get_short_help_str(limit=150)}"
             )
@@ -199,6 +201,9 @@ def print_project_version(ctx, param, value) -> None:
     # if context uses resilient parsing (no changes of execution flow) or no flag value is provided, do nothing
     if not value or ctx.resilient_parsing:
         return
+    # imported lazily, since it pulls in GitPython and PyGithub
+    from mlf_core.bump_version.bump_version import VersionBumper
+
     try:
         print(f"[bold blue]Current project version is [bold green]{VersionBumper(Path.cwd(), False).CURRENT_VERSION}!")
         ctx.exit()
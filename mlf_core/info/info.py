@@ -1,12 +1,9 @@
 import logging
-import os
 import sys
-from typing import List
 
 from mlf_core.common.levensthein_dist import most_similar_command
-from mlf_core.common.load_yaml import load_yaml_file
 from mlf_core.common.suggest_similar_commands import load_available_handles
-from mlf_core.util.dict_util import is_nested_dictionary
+from mlf_core.common.template_registry import TemplateRegistry, load_template_registry
 from rich import print
 from rich.box import HEAVY_HEAD
 from rich.console import Console
@@ -22,8 +19,6 @@ class TemplateInfo:
     """
 
     def __init__(self):
-        self.WD = os.path.dirname(__file__)
-        self.TEMPLATES_PATH = f"{self.WD}/../create/templates"
         self.available_handles = ""
         self.most_sim = []
         self.action = ""
@@ -34,47 +29,34 @@ class TemplateInfo:
 
         :param handle: domain/language/template handle (examples: cli or cli-python)
         """
-        # list of all templates that should be printed according to the passed handle
-        templates_to_print: List = []
-        available_templates = load_yaml_file(f"{self.TEMPLATES_PATH}/available_templates.yml")
+        registry = load_template_registry()
         specifiers = handle.split("-")
-        domain = specifiers[0]
-        global template_info  # TODO fix this
 
         # only domain OR language specified
         if len(specifiers) == 1:
             log.debug("Only domain or language was specified.")
-            try:
-                template_info = available_templates[domain]  # type: ignore
-            except KeyError:
-                self.handle_domain_or_language_only(handle, available_templates)
         # domain, subdomain, language
         elif len(specifiers) > 2:
             log.debug("A domain, subdomain and language was specified.")
-            try:
-                sub_domain = specifiers[1]
-                language = specifiers[2]
-                template_info = available_templates[domain][sub_domain][language]  # type: ignore
-            except KeyError:
-                self.handle_non_existing_command(handle, True)
         # domain, language OR domain, subdomain
         else:
             log.debug("A domain and language OR domain and a subdomain was specified.")
-            try:
-                second_specifier = specifiers[1]
-                template_info = available_templates[domain][second_specifier]  # type: ignore
-            except KeyError:
+        templates = registry.find(*specifiers[:3])
+        if not templates:
+            if len(specifiers) == 1:
+                self.handle_domain_or_language_only(handle, registry)
+            else:
                 self.handle_non_existing_command(handle, True)
 
-        # Add all templates under template_info to list and output them
-        self.flatten_nested_dict(template_info, templates_to_print)  # type: ignore
+        # Add all found templates to list and output them
+        templates_to_print = [self.template_to_row(template) for template in templates]
         self.output_table(templates_to_print, handle)
 
-    def handle_domain_or_language_only(self, handle: str, available_templates: dict) -> None:
+    def handle_domain_or_language_only(self, handle: str, registry: TemplateRegistry) -> None:
         """
         Try to find a similar domain or treat handle as possible language
         :param handle: The handle inputted by the user
-        :param available_templates: All available templates load from yml file as dict
+        :param registry: The registry of all available templates
         """
         # try to find a similar domain
         self.handle_non_existing_command(handle)
@@ -83,13 +65,10 @@ class TemplateInfo:
             self.print_console_output(handle)
 
         # input may be a language so try this
-        templates_flatted: List = []
-        self.flatten_nested_dict(available_templates, templates_flatted)
-        # load all available languages
-        available_languages = self.load_available_languages(templates_flatted)
+        available_languages = registry.languages
         # if handle exists as language in mlf-core output its available templates and exit with zero status
         if handle in available_languages:
-            templates_to_print_ = [template for template in templates_flatted if handle in template[1]]
+            templates_to_print_ = [self.template_to_row(template) for template in registry.by_language(handle)]
             self.output_table(templates_to_print_, handle)
 
         # the handle does not match any domain/language; is there a similar language?
@@ -197,39 +176,21 @@ class TemplateInfo:
         )
         sys.exit(0)
 
-    def flatten_nested_dict(self, template_info_, templates_to_print) -> None:
+    @staticmethod
+    def template_to_row(template: dict) -> list:
         """
-        Flatten an arbitrarily deep nested dict and creates a list of list containing all available
-        templates for the specified doamin/subdomain and/or language.
+        Create the table row of a template.
 
-        :param template_info_: The dict containing the yaml parsed info for all available templates the user wants to gather some information
-        :param templates_to_print: A list of templates string representations, that will be printed to console
+        :param template: The template of the registry
+        :return: The name, handle, long description, available libraries and version of the template
         """
-        if is_nested_dictionary(template_info_):
-            for templ in template_info_.values():
-                if not is_nested_dictionary(templ):
-                    templates_to_print.append(
-                        [
-                            templ["name"],
-                            templ["handle"],
-                            templ["long description"],
-                            templ["available libraries"],
-                            templ["version"],
-                        ]
-                    )
-                else:
-                    self.flatten_nested_dict(templ, templates_to_print)
-        else:
-            # a single template to append was reached
-            templates_to_print.append(
-                [
-                    template_info_["name"],
-                    template_info_["handle"],
-                    template_info_["long description"],
-                    template_info_["available libraries"],
-                    template_info_["version"],
-                ]
-            )
+        return [
+            template["name"],
+            template["handle"],
+            template["long description"],
+            template["available libraries"],
+            template["version"],
+        ]
 
     @staticmethod
     def set_linebreaks(desc: str) -> str:
@@ -255,12 +216,3 @@ class TemplateInfo:
             idx += 1
 
         return desc
-
-    def load_available_languages(self, ls: list) -> set:
-        """
-        Load all available languages mlf-core supports.
-        NOTE: ASSUME ALL HANDLES ARE TWO OR THREE PARTS!
-        :param ls: The flattended list from the available templates dict
-        :return: All available languages as a set
-        """
-        return {ls[1].split("-")[1] if len(ls[1].split("-")) == 2 else ls[1].split("-")[2] for ls in ls}
@@ -1,17 +1,82 @@
 import os
 from pathlib import Path
-from typing import List
+from typing import List, Tuple
 
-from mlf_core.common.load_yaml import load_yaml_file
+from mlf_core.common.load_yaml import load_yaml_file_read_only
+from mlf_core.lint.lint_cache import FILE_LISTING
+from mlf_core.lint.python_index import ForbiddenUsage
 from mlf_core.lint.template_linter import GetLintingFunctionsMeta, TemplateLinter, files_exist_linting
 from pkg_resources import parse_version
 
 CWD = os.getcwd()
 
+# PyTorch functions that use atomicAdd and therefore operate non-deterministically on the CUDA backend
+PYTORCH_ATOMIC_ADD_FUNCTIONS = [
+    "index_add",
+    "index_select",
+    "scatter_add",
+    "bincount",
+    "embedding_bag",
+    "interpolate",
+    "repeat_interleave",
+    "histc",
+    "AvgPool3d",
+    "AdaptiveAvgPool2d",
+    "AdaptiveAvgPool3d",
+    "MaxPool3d",
+    "AdaptiveMaxPool2d",
+    "FractionalMaxPool2d",
+    "FractionalMaxPool3d",
+    "ReflectionPad1d",
+    "ReflectionPad2d",
+    "ReplicationPad1d",
+    "ReplicationPad2d",
+    "ReplicationPad3d",
+    "NLLLoss",
+    "CTCLoss",
+    "EmbeddingBag",
+    # interpolate when called on a CUDA tensor that requires grad and one of the following modes is used: - linear - bilinear - bicubic - trilinear
+    "interpolate('linear')",
+    'interpolate("linear")',
+    "interpolate(mode='linear')",
+    'interpolate(mode="linear")',
+    "interpolate('bilinear')",
+    'interpolate("bilinear")',
+    "interpolate(mode='bilinear')",
+    'interpolate(mode="bilinear")',
+    "interpolate('bicubic')",
+    'interpolate("bicubic")',
+    "interpolate(mode='bicubic')",
+    'interpolate(mode="bicubic")',
+    "interpolate('trilinear')",
+    'interpolate("trilinear")',
+    "interpolate(mode='trilinear')",
+    'interpolate(mode="trilinear")',
+]
+
+# Tensorflow functions that operate non-deterministically
+TENSORFLOW_NON_DETERMINISTIC_FUNCTIONS = [
+    "softmax_cross_entropy_with_logits",
+    "sparse_softmax_cross_entropy_with_logits",
+]
+
+# XGBoost functions that operate non-deterministically (see https://github.com/dmlc/xgboost/issues/5023)
+XGBOOST_ALL_REDUCE_FUNCTIONS = ["all_reduce"]
+
 
 class MlflowPytorchLint(TemplateLinter, metaclass=GetLintingFunctionsMeta):
-    def __init__(self, path):
-        super().__init__(path)
+    CHECK_INPUTS = {
+        **TemplateLinter.CHECK_INPUTS,
+        "pytorch_files_exist": [FILE_LISTING],
+        "pytorch_reproducibility_seeds": [
+            "{project_slug_no_hyphen}/{project_slug_no_hyphen}.py",
+            "{project_slug_no_hyphen}/mlf_core/mlf_core.py",
+        ],
+        "pytorch_no_atomic_operations": ["{project_slug_no_hyphen}/*.py"],
+    }
+
+    def __init__(self, path, jobs=None, package_index=None, incremental=False):
+        super().__init__(path, jobs, package_index, incremental)
 
     def lint(self):
         super().lint_project(self, self.methods)
@@ -113,54 +178,19 @@ class MlflowPytorchLint(TemplateLinter, metaclass=GetLintingFunctionsMeta):
 
         Source: https://pytorch.org/docs/stable/notes/randomness.html
         """
-        atomic_add_functions = [
-            "index_add",
-            "index_select",
-            "scatter_add",
-            "bincount",
-            "embedding_bag",
-            "interpolate",
-            "repeat_interleave",
-            "histc" "AvgPool3d",
-            "AdaptiveAvgPool2d",
-            "AdaptiveAvgPool3d",
-            "MaxPool3d",
-            "AdaptiveMaxPool2d",
-            "FractionalMaxPool2d",
-            "FractionalMaxPool3d",
-            "ReflectionPad1d",
-            "ReflectionPad2d",
-            "ReplicationPad1d",
-            "ReplicationPad2d" "ReplicationPad3d",
-            "NLLLoss",
-            "CTCLoss",
-            "EmbeddingBag"
-            # interpolate when called on a CUDA tensor that requires grad and one of the following modes is used: - linear - bilinear - bicubic - trilinear
-            # TODO COOKIETEMPLE: This should ideally be solved with a nice regex, which would also help when people have several parameters
-            "interpolate('linear')",
-            'interpolate("linear")',
-            "interpolate(mode='linear')",
-            'interpolate(mode="linear")',
-            "interpolate('bilinear')",
-            'interpolate("bilinear")',
-            "interpolate(mode='bilinear')",
-            'interpolate(mode="bilinear")',
-            "interpolate(bicubic'bicubic')",
-            'interpolate("bicubic")',
-            "interpolate(mode='bicubic')",
-            'interpolate(mode="bicubic")',
-            "interpolate(bicubic'trilinear')",
-            'interpolate("trilinear")',
-            "interpolate(mode='trilinear')",
-            'interpolate(mode="trilinear")',
-        ]
-
-        verify_method_not_present(self, atomic_add_functions, "mlflow-pytorch-3")
+        verify_method_not_present(self, PYTORCH_ATOMIC_ADD_FUNCTIONS, "mlflow-pytorch-3", ("torch",))
 
 
 class MlflowTensorflowLint(TemplateLinter, metaclass=GetLintingFunctionsMeta):
-    def __init__(self, path):
-        super().__init__(path)
+    CHECK_INPUTS = {
+        **TemplateLinter.CHECK_INPUTS,
+        "tensorflow_files_exist": [FILE_LISTING],
+        "tensorflow_reproducibility_seeds": ["{project_slug_no_hyphen}/{project_slug_no_hyphen}.py"],
+        "tensorflow_non_deterministic_functions": ["{project_slug_no_hyphen}/*.py"],
+    }
+
+    def __init__(self, path, jobs=None, package_index=None, incremental=False):
+        super().__init__(path, jobs, package_index, incremental)
 
     def lint(self):
         super().lint_project(self, self.methods)
@@ -235,17 +265,20 @@ class MlflowTensorflowLint(TemplateLinter, metaclass=GetLintingFunctionsMeta):
         """
         Verifies that no non-deterministic functions of Tensorflow are used.
         """
-        non_deterministic_tf_functions = [
-            "softmax_cross_entropy_with_logits",
-            "sparse_softmax_cross_entropy_with_logits",
-        ]
-
-        verify_method_not_present(self, non_deterministic_tf_functions, "mlflow-tensorflow-3")
+        verify_method_not_present(self, TENSORFLOW_NON_DETERMINISTIC_FUNCTIONS, "mlflow-tensorflow-3", ("tensorflow",))
 
 
 class MlflowXGBoostLint(TemplateLinter, metaclass=GetLintingFunctionsMeta):
-    def __init__(self, path):
-        super().__init__(path)
+    CHECK_INPUTS = {
+        **TemplateLinter.CHECK_INPUTS,
+        "xgboost_files_exist": [FILE_LISTING],
+        "xgboost_reproducibility_seeds": ["{project_slug_no_hyphen}/{project_slug_no_hyphen}.py"],
+        "xgboost_version": ["environment.yml"],
+        "xgboost_no_all_reduce": ["{project_slug_no_hyphen}/*.py"],
+    }
+
+    def __init__(self, path, jobs=None, package_index=None, incremental=False):
+        super().__init__(path, jobs, package_index, incremental)
 
     def lint(self):
         super().lint_project(self, self.methods)
@@ -310,7 +343,7 @@ class MlflowXGBoostLint(TemplateLinter, metaclass=GetLintingFunctionsMeta):
         Verifies that the XGBoost version is at least 1.1.0, since reproducibility cannot be guaranteed elsewise.
         """
         # Verify that XGBoost version is greater than 1.1.0
-        conda_env = load_yaml_file(f"{self.path}/environment.yml")
+        conda_env = load_yaml_file_read_only(f"{self.path}/environment.yml")
         conda_only = list(filter(lambda dep: "::" in dep, conda_env["dependencies"]))
         pip_only = list(filter(lambda dep: isinstance(dep, dict), conda_env["dependencies"]))[0]["pip"]
 
@@ -343,30 +376,53 @@ class MlflowXGBoostLint(TemplateLinter, metaclass=GetLintingFunctionsMeta):
         Verifies that all_reduce is not used.
         https://github.com/dmlc/xgboost/issues/5023
         """
-        all_reduce_functions = ["all_reduce"]
-        verify_method_not_present(self, all_reduce_functions, "mlflow-xgboost-4")
+        verify_method_not_present(self, XGBOOST_ALL_REDUCE_FUNCTIONS, "mlflow-xgboost-4", ("xgboost",))
 
 
-def verify_method_not_present(calling_class: TemplateLinter, functions_to_check: list, linting_code: str):
+def verify_method_not_present(
+    calling_class: TemplateLinter, functions_to_check: list, linting_code: str, modules: Tuple[str, ...] = ()
+):
     """
-    Checks all Python files for a list of strings/functions, which should not be present.
+    Checks all Python files for a list of functions, which should not be used.
+    The files are analyzed using the shared Python usage index, so comments, docstrings and strings are not reported, imported
+    aliases are resolved and keyword arguments are compared. Files, which cannot be parsed, are checked for plain substrings instead.
     :param calling_class: The TemplateLinter subclass. Required to append the found errors correctly.
-    :param functions_to_check: The list of functions, which are not allowed to be present in any Python file
+    :param functions_to_check: The list of functions (optionally calls with literal arguments), which are not allowed to be used
     :param linting_code: A linting code build from the handle and the error code e.g. mlflow-pytorch-1
+    :param modules: The top level modules the functions belong to. Functions of other modules with the same name are allowed.
     """
+    package_dir = f"{calling_class.project_slug_no_hyphen}{os.sep}"
     # We should only expect those functions in all *.py files, so only read those
-    for root, _, files in os.walk(f"{calling_class.path}/{calling_class.project_slug_no_hyphen}"):
-        for file in files:
-            if file.endswith(".py"):
-                file_to_check_full_path = Path(root) / file
-                with open(file_to_check_full_path) as f:
-                    content_stripped = list(map(lambda line: line.strip(), f.readlines()))
-                    for function in functions_to_check:
-                        for line_code in content_stripped:
-                            if function in line_code:
-                                calling_class.failed.append(
-                                    (
-                                        linting_code,
-                                        f"{function} found in {file_to_check_full_path} operates non-deterministically.",
-                                    )
-                                )
+    python_files = [
+        rel_path
+        for rel_path in calling_class.file_index.files
+        if rel_path.startswith(package_dir) and rel_path.endswith(".py")
+    ]
+    forbidden = [ForbiddenUsage.parse(function) for function in functions_to_check]
+    findings = calling_class.python_index.find_forbidden(
+        python_files, [specification for specification in forbidden if specification], modules
+    )
+    for usage, specification in findings:
+        calling_class.failed.append(
+            (
+                linting_code,
+                f"{specification.spec} found in {Path(calling_class.path) / usage.path}:{usage.line_number} "
+                "operates non-deterministically.",
+            )
+        )
+
+    unparsable_files = {rel_path for rel_path in python_files if calling_class.python_index.usages(rel_path) is None}
+    if unparsable_files:
+        calling_class.file_index.register(
+            f"{linting_code}-unparsable",
+            tokens=functions_to_check,
+            file_filter=lambda rel_path: rel_path in unparsable_files,
+        )
+        for match in calling_class.file_index.matches(f"{linting_code}-unparsable"):
+            calling_class.failed.append(
+                (
+                    linting_code,
+                    f"{match.token} found in {Path(calling_class.path) / match.path}:{match.line_number} "
+                    "operates non-deterministically.",
+                )
+            )
@@ -1,14 +1,22 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
-import requests
+from mlf_core.lint.lint_cache import FILE_LISTING
+from mlf_core.lint.package_index import MAX_CONCURRENT_REQUESTS, PackageLookup
 from mlf_core.lint.template_linter import GetLintingFunctionsMeta, TemplateLinter, files_exist_linting
 from pkg_resources import parse_version
 
 
 class PackagePredictionLint(TemplateLinter, metaclass=GetLintingFunctionsMeta):
-    def __init__(self, path):
-        super().__init__(path)
+    CHECK_INPUTS = {
+        **TemplateLinter.CHECK_INPUTS,
+        "check_dependencies_not_outdated": None,  # the latest package versions may change at any time
+        "python_files_exist": [FILE_LISTING],
+    }
+
+    def __init__(self, path, jobs=None, package_index=None, incremental=False):
+        super().__init__(path, jobs, package_index, incremental)
 
     def lint(self):
         super().lint_project(self, self.methods)
@@ -16,60 +24,67 @@ class PackagePredictionLint(TemplateLinter, metaclass=GetLintingFunctionsMeta):
     def check_dependencies_not_outdated(self) -> bool:
         """
         Check that every dependency from project's requirements.txt is the latest version available at PyPi.
+        All PyPi lookups are sent concurrently and share the linter's cached package index client.
 
         :return Bool flag that shows code execution went right (used for testing purposes)
         """
 
-        def check_dependencies(filename: str) -> None:
+        def read_dependencies(filename: str) -> List[List[str]]:
             """
-            Check for a given file whether no dependencies are outdated.
+            Read all pinned dependencies of a dependency file.
             :param filename: Name of the dependency file to parse (either requirements.txt or requirements_dev.txt)
+            :return: All dependencies as [name, version] pairs
             """
             with open(f"{self.path}/{filename}") as req_file:
                 dependencies = [line[:-1].split("==") for line in req_file]
-            for dependency in dependencies:
-                if len(dependency) == 2:
-                    _check_pip_package(dependency[0], dependency[1])
+            return [dependency for dependency in dependencies if len(dependency) == 2]
 
-        def _check_pip_package(pip_dependency_name, pip_dependency_version) -> None:
+        def _check_pip_package(pip_dependency_name, pip_dependency_version, pip_lookup: PackageLookup) -> None:
             """
-            Query PyPi package information.
-            Sends a HTTP GET request to the PyPi remote API.
+            Evaluate PyPi package information.
 
             :param pip_dependency_name: The name of the dependency
             :param pip_dependency_version: Dependency version used by the user's project
+            :param pip_lookup: The result of the PyPi remote API lookup
             """
-            pip_api_url = f"https://pypi.python.org/pypi/{pip_dependency_name}/json"
-            try:
-                response = requests.get(pip_api_url, timeout=10)
-            except requests.exceptions.Timeout:
-                self.warned.append(("cli-python-2", f"PyPi API timed out: {pip_api_url}"))
-            except requests.exceptions.ConnectionError:
-                self.warned.append(("cli-python-2", f"PyPi API Connection error: {pip_api_url}"))
-            else:
-                if response.status_code == 200:
-                    pip_dep_json = response.json()
-                    latest_dependency_version = pip_dep_json["info"]["version"]
-                    if parse_version(pip_dependency_version) < parse_version(latest_dependency_version):
-                        self.warned.append(
-                            (
-                                "package-prediction-2",
-                                f"Version {pip_dependency_version} of {pip_dependency_name} is not the latest available: "
-                                f"{latest_dependency_version}",
-                            )
-                        )  # noqa: E128
-                else:
-                    self.failed.append(
+            if pip_lookup.error == "timeout":
+                self.warned.append(("cli-python-2", f"PyPi API timed out: {pip_lookup.url}"))
+            elif pip_lookup.error == "connection":
+                self.warned.append(("cli-python-2", f"PyPi API Connection error: {pip_lookup.url}"))
+            elif pip_lookup.error == "offline":
+                self.warned.append(("package-prediction-2", f"PyPi API not queried in offline mode: {pip_lookup.url}"))
+            elif pip_lookup.error == "snapshot":
+                self.warned.append(
+                    (
+                        "package-prediction-2",
+                        f"{pip_dependency_name} is not part of the package snapshot: {pip_lookup.url}",
+                    )
+                )
+            elif pip_lookup.found:
+                latest_dependency_version = pip_lookup.latest_version
+                if parse_version(pip_dependency_version) < parse_version(latest_dependency_version):
+                    self.warned.append(
                         (
                             "package-prediction-2",
-                            f"Could not find pip dependency using the PyPi API: {pip_dependency_name}=={pip_dependency_version}",
+                            f"Version {pip_dependency_version} of {pip_dependency_name} is not the latest available: "
+                            f"{latest_dependency_version}",
                         )
+                    )  # noqa: E128
+            else:
+                self.failed.append(
+                    (
+                        "package-prediction-2",
+                        f"Could not find pip dependency using the PyPi API: {pip_dependency_name}=={pip_dependency_version}",
                     )
+                )
 
-        # check general dependencies
-        check_dependencies("requirements.txt")
-        # check development dependencies
-        check_dependencies("requirements_dev.txt")
+        # check general and development dependencies
+        dependencies = read_dependencies("requirements.txt") + read_dependencies("requirements_dev.txt")
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            pip_lookups = [executor.submit(self.package_index.lookup_pip, name) for name, _ in dependencies]
+            for (name, pinned_version), pip_lookup in zip(dependencies, pip_lookups):
+                _check_pip_package(name, pinned_version, pip_lookup.result())
+        self.package_index.save_cache()
         return True
 
     def python_files_exist(self) -> None:
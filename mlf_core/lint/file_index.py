@@ -0,0 +1,296 @@
+import io
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Pattern, Tuple
+
+from mlf_core.lint.lint_cache import LINT_CACHE_FILE
+
+log = logging.getLogger(__name__)
+
+# files larger than this are scanned, but their decoded content is not kept in memory afterwards
+MAX_CACHED_FILE_SIZE = 1024 * 1024
+
+
+@dataclass
+class LineMatch:
+    """
+    A single line of a project file, which matched a registered pattern.
+    """
+
+    path: str  # path of the file relative to the project's top level directory
+    line_number: int  # line number starting at 1
+    line: str  # the full line without the trailing newline
+    token: str  # the token or regex match that was found in the line
+
+
+class MultiPatternMatcher:
+    """
+    Finds all lines of a text, which contain any of several plain tokens or which match a regular expression.
+    Tokens are compiled into a single regular expression shaped like a prefix tree (similar to an Aho-Corasick automaton
+    without failure links), which searches the whole text at once. Hence, the cost of scanning a file does not grow with the
+    number of tokens.
+    Only the (few) matching lines are inspected further to report every token they contain.
+    """
+
+    def __init__(self, tokens: Iterable[str] = None, regex: Pattern = None):
+        """
+        Exactly one of tokens or regex must be passed. A regex is matched against single lines and must not rely on anchors.
+
+        :param tokens: Plain strings; a line matches if it contains one of them
+        :param regex: A compiled regular expression; a line matches if the regex can be found in it
+        """
+        if (tokens is None) == (regex is None):
+            raise ValueError("Exactly one of tokens or regex must be passed!")
+        self.tokens = list(dict.fromkeys(tokens)) if tokens is not None else None
+        self.regex = regex
+        if self.tokens is not None:
+            self._search = re.compile(_trie_pattern(self.tokens)).search
+        else:
+            self._search = regex.search  # type: ignore
+
+    def find_lines(self, text: str) -> Iterator[Tuple[int, str, List[str]]]:
+        """
+        Search a text for all matching lines.
+
+        :param text: The text to search
+        :return: Tuples of the line number (starting at 1), the line and all tokens (or the regex match) found in the line
+        """
+        if self.tokens is not None and not self.tokens:
+            return
+        line_number, counted_until, pos = 1, 0, 0
+        while True:
+            candidate = self._search(text, pos)
+            if candidate is None:
+                return
+            line_start = text.rfind("\n", 0, candidate.start()) + 1
+            line_end = text.find("\n", candidate.start())
+            if line_end == -1:
+                line_end = len(text)
+            line_number += text.count("\n", counted_until, line_start)
+            counted_until = line_start
+            line = text[line_start:line_end]
+            found = self._tokens_in_line(line)
+            if found:
+                yield line_number, line, found
+            pos = line_end + 1
+
+    def _tokens_in_line(self, line: str) -> List[str]:
+        """
+        Determine the tokens contained in a candidate line (a regex is matched against the line only).
+        """
+        if self.tokens is not None:
+            return [token for token in self.tokens if token in line]
+        found = self.regex.search(line)  # type: ignore
+        return [found.group(0)] if found else []
+
+
+def _trie_pattern(tokens: List[str]) -> str:
+    """
+    Build a regular expression matching any of the tokens, where tokens sharing a prefix share a branch of the pattern.
+    A plain alternation would try every token at every position of the text.
+
+    :param tokens: Non empty plain strings
+    :return: The uncompiled pattern
+    """
+    trie: dict = {}
+    for token in tokens:
+        node = trie
+        for char in token:
+            node = node.setdefault(char, {})
+        node[""] = {}  # marks the end of a token
+
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # a token ending here makes the remainder optional
+        return f"(?:{pattern})?" if "" in node else pattern
+
+    return build(trie)
+
+
+@dataclass
+class _Registration:
+    """
+    Internal representation of a registered pattern.
+    """
+
+    name: str
+    matcher: MultiPatternMatcher
+    file_filter: Optional[Callable[[str], bool]]
+    respect_gitignore: bool
+
+
+class ProjectFileIndex:
+    """
+    An index of all files of a project, which is built once per lint run.
+    It holds the file list, the ignore rules derived from the .gitignore file and the decoded file contents.
+    Linters register their patterns (plain tokens or compiled regular expressions) against the index.
+    All registered patterns are then matched in a single pass over all files, the first time any results are requested.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: Path to the top level directory of the project
+        """
+        self.path = str(path)
+        self._files: Optional[List[str]] = None
+        self._ignore: Optional[List[str]] = None
+        self._contents: Dict[str, str] = {}
+        self._registrations: Dict[str, _Registration] = {}
+        self._pending: List[str] = []
+        self._matches: Dict[str, List[LineMatch]] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def ignore(self) -> List[str]:
+        """
+        The basenames of all files and directories, which are ignored according to the project's .gitignore file.
+        """
+        if self._ignore is None:
+            ignore = [".git"]
+            gitignore_path = os.path.join(self.path, ".gitignore")
+            if os.path.isfile(gitignore_path):
+                with io.open(gitignore_path, "rt", encoding="latin1") as file:
+                    for line in file:
+                        ignore.append(os.path.basename(line.strip().rstrip("/")))
+            self._ignore = ignore
+        return self._ignore
+
+    @property
+    def files(self) -> List[str]:
+        """
+        All files of the project as paths relative to the project's top level directory.
+        The .git directory and the incremental lint cache are never included.
+        """
+        with self._lock:
+            if self._files is None:
+                files = []
+                for root, dirs, filenames in os.walk(self.path):
+                    if ".git" in dirs:
+                        dirs.remove(".git")
+                    dirs.sort()
+                    rel_root = os.path.relpath(root, self.path)
+                    for fname in sorted(filenames):
+                        if rel_root == os.curdir and fname.startswith(LINT_CACHE_FILE):
+                            continue
+                        files.append(fname if rel_root == os.curdir else os.path.join(rel_root, fname))
+                self._files = files
+            return self._files
+
+    def is_ignored(self, rel_path: str) -> bool:
+        """
+        Check whether a file or any of its parent directories is ignored by the project's .gitignore file.
+
+        :param rel_path: Path of the file relative to the project's top level directory
+        :return: True if the file is ignored, False otherwise
+        """
+        ignore = set(self.ignore)
+        return any(part in ignore for part in rel_path.split(os.sep))
+
+    def read_text(self, rel_path: str) -> str:
+        """
+        Read and decode a file of the project. The decoded content is cached, so every file is only read once per lint run.
+
+        :param rel_path: Path of the file relative to the project's top level directory
+        :return: The decoded content of the file
+        """
+        content = self._contents.get(rel_path)
+        if content is None:
+            full_path = os.path.join(self.path, rel_path)
+            with io.open(full_path, "rt", encoding="latin1") as file:
+                content = file.read()
+            if len(content) <= MAX_CACHED_FILE_SIZE:
+                self._contents[rel_path] = content
+        return content
+
+    def read_lines(self, rel_path: str) -> List[str]:
+        """
+        Read a file of the project line by line.
+
+        :param rel_path: Path of the file relative to the project's top level directory
+        :return: All lines of the file without their trailing newlines
+        """
+        content = self.read_text(rel_path)
+        lines = content.split("\n")
+        if content.endswith("\n"):
+            lines.pop()
+        return lines
+
+    def register(
+        self,
+        name: str,
+        tokens: Iterable[str] = None,
+        regex: Pattern = None,
+        file_filter: Callable[[str], bool] = None,
+        respect_gitignore: bool = False,
+    ) -> None:
+        """
+        Register a named pattern, which should be matched against every line of every (filtered) project file.
+        Registering an already registered name does nothing.
+
+        :param name: Unique name of the pattern, which is used to fetch the results later on
+        :param tokens: Plain strings; a line matches if it contains one of them (each contained token is reported)
+        :param regex: A compiled regular expression; a line matches if the regex can be found in it
+        :param file_filter: Only files (relative paths) for which the filter returns True are scanned
+        :param respect_gitignore: Whether to skip all files ignored by the project's .gitignore file
+        """
+        with self._lock:
+            if name in self._registrations:
+                return
+            self._registrations[name] = _Registration(
+                name, MultiPatternMatcher(tokens, regex), file_filter, respect_gitignore
+            )
+            self._pending.append(name)
+
+    def matches(self, name: str) -> List[LineMatch]:
+        """
+        Fetch all matches of a registered pattern. Runs the single pass scan if required.
+
+        :param name: Name of the registered pattern
+        :return: All matching lines in the order of the project's files
+        """
+        with self._lock:
+            if name not in self._registrations:
+                raise KeyError(f"No pattern named {name} was registered!")
+            if self._pending:
+                self.scan()
+            return self._matches[name]
+
+    def scan(self) -> None:
+        """
+        Match all pending registered patterns in a single pass over all project files.
+        """
+        with self._lock:
+            registrations = [self._registrations[name] for name in self._pending]
+            self._pending = []
+            if not registrations:
+                return
+            log.debug(f"Scanning project files for patterns: {[registration.name for registration in registrations]}")
+            for registration in registrations:
+                self._matches[registration.name] = []
+
+            for rel_path in self.files:
+                ignored = self.is_ignored(rel_path)
+                applicable = [
+                    registration
+                    for registration in registrations
+                    if not (registration.respect_gitignore and ignored)
+                    and (registration.file_filter is None or registration.file_filter(rel_path))
+                ]
+                if not applicable:
+                    continue
+                try:
+                    content = self.read_text(rel_path)
+                except OSError as e:
+                    log.debug(f"Unable to read {rel_path}: {e}")
+                    continue
+                for registration in applicable:
+                    for line_number, line, tokens in registration.matcher.find_lines(content):
+                        self._matches[registration.name].extend(
+                            LineMatch(rel_path, line_number, line, token) for token in tokens
+                        )
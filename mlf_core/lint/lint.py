@@ -1,76 +1,214 @@
+import contextlib
+import io
 import logging
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
+from typing import List, Optional
 
+from mlf_core.common.load_yaml import load_yaml_file_read_only
 from mlf_core.lint.domains.mlflow import MlflowPytorchLint, MlflowTensorflowLint, MlflowXGBoostLint
 from mlf_core.lint.domains.package import PackagePredictionLint
+from mlf_core.lint.package_index import create_package_index
+from mlf_core.lint.template_linter import print_lint_results
+from mlf_core.util.rich import console
 from rich import print
-from ruamel.yaml import YAML
 
 log = logging.getLogger(__name__)
 
+# the linter of every template handle
+LINTERS = {
+    "mlflow-pytorch": MlflowPytorchLint,
+    "mlflow-tensorflow": MlflowTensorflowLint,
+    "mlflow-xgboost": MlflowXGBoostLint,
+    "package-prediction": PackagePredictionLint,
+}
 
-def lint_project(project_dir: str):
+
+@dataclass
+class LintResult:
+    """
+    The results of linting a single project.
+    """
+
+    project_dir: str
+    template_handle: Optional[str] = None
+    passed: list = field(default_factory=list)  # tuples of the form: `(<passed no>, <reason>)`
+    warned: list = field(default_factory=list)  # tuples of the form: `(<warned no>, <reason>)`
+    failed: list = field(default_factory=list)  # tuples of the form: `(<error no>, <reason>)`
+    error: Optional[str] = None  # a critical error, which stopped the linting of the project
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.failed
+
+
+def run_lint(
+    project_dir: str,
+    jobs: Optional[int] = None,
+    offline: bool = False,
+    package_snapshot: Optional[str] = None,
+    incremental: bool = False,
+    quiet: bool = False,
+) -> LintResult:
+    """
+    Lint a single project and return the results. Neither prints the results nor exits, so it can be used as a library function.
+
+    :param project_dir: Path to the project's top level directory
+    :param jobs: Number of lint checks to run concurrently. Defaults to the thread pool's default worker count.
+    :param offline: Whether to skip all package index queries and only use cached package metadata
+    :param package_snapshot: Path to a local package snapshot, which replaces the remote package indices
+    :param incremental: Whether to only rerun checks whose inputs changed since the last incremental lint
+    :param quiet: Whether to suppress all progress output
+    :return: The results of the project
+    """
+    result = LintResult(str(project_dir))
+    with contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.ExitStack():
+        # Detect which template the project is based on
+        result.template_handle = read_template_handle(project_dir)
+        if result.template_handle is None:
+            result.error = ".mlf_core.yml not found. Is this a mlf-core project?"
+            return result
+        log.debug(f"Detected handle {result.template_handle}")
+        if result.template_handle not in LINTERS:
+            result.error = f"Unable to find linter for handle {result.template_handle}!"
+            return result
+        try:
+            package_index = create_package_index(offline, package_snapshot)
+        except FileNotFoundError as e:
+            result.error = str(e)
+            return result
+
+        lint_obj = LINTERS[result.template_handle](project_dir, jobs, package_index, incremental)
+        # Run the linting tests
+        try:
+            # Run non project specific linting
+            log.debug("Running general linting.")
+            print("[bold blue]Running general linting")
+            lint_obj.lint_project(super(lint_obj.__class__, lint_obj), is_subclass_calling=False)
+
+            # Run the project specific linting
+            log.debug(f"Running linting of {result.template_handle}")
+            print(f"[bold blue]Running {result.template_handle} linting")
+
+            lint_obj.lint()  # type: ignore
+        except AssertionError as e:
+            result.error = f"Critical error: {e}"
+            return result
+
+    if lint_obj.lint_cache is not None:
+        lint_obj.lint_cache.save()
+    result.passed, result.warned, result.failed = lint_obj.passed, lint_obj.warned, lint_obj.failed
+    return result
+
+
+def lint_project(
+    project_dir: str,
+    jobs: Optional[int] = None,
+    offline: bool = False,
+    package_snapshot: Optional[str] = None,
+    incremental: bool = False,
+) -> LintResult:
     """
     Verifies the integrity of a project to best coding and practices.
     Runs a set of general linting functions, which all templates share and afterwards runs template specific linting functions.
-    All results are collected and presented to the user.
+    All results are collected and presented to the user. Exits with a non-zero error code if any check failed.
+
+    :param project_dir: Path to the project's top level directory
+    :param jobs: Number of lint checks to run concurrently. Defaults to the thread pool's default worker count.
+    :param offline: Whether to skip all package index queries and only use cached package metadata
+    :param package_snapshot: Path to a local package snapshot, which replaces the remote package indices
+    :param incremental: Whether to only rerun checks whose inputs changed since the last incremental lint
+    :return: The results of the project
     """
-    # Detect which template the project is based on
-    template_handle = get_template_handle(project_dir)
-    log.debug(f"Detected handle {template_handle}")
+    result = run_lint(project_dir, jobs, offline, package_snapshot, incremental)
+    if result.error is not None:
+        print(f"[bold red]{result.error}")
+        print("[bold red] Stopping tests...")
+        sys.exit(1)
 
-    switcher = {
-        "mlflow-pytorch": MlflowPytorchLint,
-        "mlflow-tensorflow": MlflowTensorflowLint,
-        "mlflow-xgboost": MlflowXGBoostLint,
-        "package-prediction": PackagePredictionLint,
-    }
+    # Print the results
+    print_lint_results(result.passed, result.warned, result.failed)
 
-    try:
-        lint_obj = switcher.get(template_handle)(project_dir)  # type: ignore
-    except TypeError:
-        print(f"[bold red]Unable to find linter for handle {template_handle}! Aborting...")
+    # Exit code
+    if len(result.failed) > 0:
+        print(f"[bold red] {len(result.failed)} tests failed! Exiting with non-zero error code.")
         sys.exit(1)
+    return result
+
+
+def lint_projects(
+    project_dirs: List[str],
+    processes: Optional[int] = None,
+    jobs: Optional[int] = None,
+    offline: bool = False,
+    package_snapshot: Optional[str] = None,
+    incremental: bool = False,
+) -> List[LintResult]:
+    """
+    Lint many projects concurrently using a process pool. Progress output of the single projects is suppressed.
+
+    :param project_dirs: Paths to the projects' top level directories
+    :param processes: Number of projects to lint concurrently. Defaults to the number of CPUs.
+    :param jobs: Number of lint checks to run concurrently per project
+    :param offline: Whether to skip all package index queries and only use cached package metadata
+    :param package_snapshot: Path to a local package snapshot, which replaces the remote package indices
+    :param incremental: Whether to only rerun checks whose inputs changed since the last incremental lint
+    :return: The results of all projects in the order of the passed project directories
+    """
+    lint = partial(
+        _run_lint_safely, jobs=jobs, offline=offline, package_snapshot=package_snapshot, incremental=incremental
+    )
+    if len(project_dirs) == 1:
+        return [lint(project_dirs[0])]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(lint, project_dirs))
+
 
-    # Run the linting tests
+def _run_lint_safely(project_dir: str, **kwargs) -> LintResult:
+    """
+    Lint a single project quietly. Unexpected errors are reported as the project's error, so that a single broken project
+    does not abort linting all other projects.
+    """
     try:
-        # Run non project specific linting
-        log.debug("Running general linting.")
-        print("[bold blue]Running general linting")
-        lint_obj.lint_project(super(lint_obj.__class__, lint_obj), is_subclass_calling=False)
-
-        # Run the project specific linting
-        log.debug(f"Running linting of {template_handle}")
-        print(f"[bold blue]Running {template_handle} linting")
-
-        lint_obj.lint()  # type: ignore
-    except AssertionError as e:
-        print(f"[bold red]Critical error: {e}")
-        print("[bold red] Stopping tests...")
+        return run_lint(project_dir, quiet=True, **kwargs)
+    except Exception as e:
+        log.debug(f"Linting {project_dir} failed", exc_info=True)
+        return LintResult(str(project_dir), error=f"Unexpected error: {e!r}")
 
-        return lint_obj
 
-    # Print the results
-    lint_obj._print_results()
+def print_lint_results_of_projects(results: List[LintResult]) -> None:
+    """
+    Print the results of several projects one after another.
 
-    # Exit code
-    if len(lint_obj.failed) > 0:
-        print(f"[bold red] {len(lint_obj.failed)} tests failed! Exiting with non-zero error code.")
-        sys.exit(1)
+    :param results: The results of all projects
+    """
+    for result in results:
+        console.print()
+        console.rule(f"[bold blue]{result.project_dir}")
+        if result.error is not None:
+            print(f"[bold red]{result.error}")
+        else:
+            print_lint_results(result.passed, result.warned, result.failed)
+    failed_projects = [result for result in results if not result.ok]
+    console.print()
+    if failed_projects:
+        print(f"[bold red]{len(failed_projects)} of {len(results)} projects failed linting!")
+    else:
+        print(f"[bold green]All {len(results)} projects passed linting.")
 
 
-def get_template_handle(dot_mlf_core_path: str = ".mlf_core.yml") -> str:
+def read_template_handle(project_dir: str) -> Optional[str]:
     """
-    Reads the .mlf_core file and extracts the template handle
-    :param dot_mlf_core_path: path to the .mlf_core file
-    :return: found template handle
+    Reads the .mlf_core.yml file of a project and extracts the template handle
+    :param project_dir: path to the project's top level directory
+    :return: found template handle or None if the project has no .mlf_core.yml file
     """
-    path = Path(f"{dot_mlf_core_path}/.mlf_core.yml")
+    path = Path(f"{project_dir}/.mlf_core.yml")
     if not path.exists():
-        print("[bold red].mlf_core.yml not found. Is this a mlf-core project?")
-        sys.exit(1)
-    yaml = YAML(typ="safe")
-    dot_mlf_core_content = yaml.load(path)
+        return None
+    dot_mlf_core_content = load_yaml_file_read_only(str(path))
 
     return dot_mlf_core_content["template_handle"]
@@ -0,0 +1,147 @@
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from mlf_core import __version__
+
+log = logging.getLogger(__name__)
+
+# name of the incremental lint cache file, which is stored inside the project's top level directory
+LINT_CACHE_FILE = ".mlf_core_lint_cache"
+# pseudo input of checks, which only depend on which files exist (and not on their contents)
+FILE_LISTING = ":file-listing:"
+# the .mlf_core.yml file is read by every linter and therefore an input of every check
+COMMON_INPUTS = [".mlf_core.yml"]
+
+
+class LintCache:
+    """
+    The incremental lint cache of a project.
+    It stores the content hash of every project file and the results of every check together with a fingerprint of the check's inputs.
+    A check only needs to run again if the fingerprint of its inputs changed, otherwise the cached results are replayed.
+    Content hashes are only recomputed for files whose modification time or size changed.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: Path to the project's top level directory
+        """
+        self.path = str(path)
+        self.cache_path = os.path.join(self.path, LINT_CACHE_FILE)
+        self._files: Dict[str, List] = {}
+        self._checks: Dict[str, dict] = {}
+        self._hashed: Dict[str, str] = {}
+        self._lock = threading.RLock()
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.cache_path) as cache_file:
+                cache = json.load(cache_file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            log.debug(f"Ignoring unreadable lint cache {self.cache_path}: {e}")
+            return
+        # results of other mlf-core versions may stem from different checks
+        if cache.get("version") != __version__:
+            log.debug(f"Ignoring lint cache of mlf-core version {cache.get('version')}")
+            return
+        self._files = cache.get("files", {})
+        self._checks = cache.get("checks", {})
+
+    def file_hash(self, rel_path: str) -> str:
+        """
+        Content hash of a project file. The hash of the previous run is reused if the file's modification time and size did not change.
+
+        :param rel_path: Path of the file relative to the project's top level directory
+        :return: The SHA-256 hex digest of the file's content or an empty string if the file does not exist
+        """
+        with self._lock:
+            if rel_path in self._hashed:
+                return self._hashed[rel_path]
+            try:
+                stat = os.stat(os.path.join(self.path, rel_path))
+            except OSError:
+                self._hashed[rel_path] = ""
+                return ""
+            cached = self._files.get(rel_path)
+            if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                digest = cached[2]
+            else:
+                sha256 = hashlib.sha256()
+                with open(os.path.join(self.path, rel_path), "rb") as file:
+                    for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                        sha256.update(chunk)
+                digest = sha256.hexdigest()
+                self._files[rel_path] = [stat.st_mtime_ns, stat.st_size, digest]
+            self._hashed[rel_path] = digest
+            return digest
+
+    def fingerprint(self, check_key: str, files: List[str], input_patterns: Optional[List[str]]) -> str:
+        """
+        Compute the fingerprint of the inputs of a check.
+
+        :param check_key: Unique name of the check
+        :param files: All project files relative to the project's top level directory
+        :param input_patterns: fnmatch patterns of the files the check depends on. FILE_LISTING adds the list of all files.
+                               None means that the check depends on all files.
+        :return: The SHA-256 hex digest of the check's inputs
+        """
+        sha256 = hashlib.sha256(check_key.encode())
+        if input_patterns is None:
+            input_files = files
+        else:
+            patterns = COMMON_INPUTS + [pattern for pattern in input_patterns if pattern != FILE_LISTING]
+            input_files = [
+                rel_path for rel_path in files if any(fnmatch.fnmatch(rel_path, pattern) for pattern in patterns)
+            ]
+            if FILE_LISTING in input_patterns:
+                sha256.update("\n".join(files).encode())
+        for rel_path in input_files:
+            sha256.update(f"\n{rel_path}:{self.file_hash(rel_path)}".encode())
+        return sha256.hexdigest()
+
+    def get(self, check_key: str, fingerprint: str) -> Optional[Tuple[list, list, list]]:
+        """
+        :param check_key: Unique name of the check
+        :param fingerprint: Fingerprint of the check's current inputs
+        :return: The cached passed, warned and failed results or None if the check has to run
+        """
+        with self._lock:
+            cached = self._checks.get(check_key)
+        if not cached or cached["fingerprint"] != fingerprint:
+            return None
+        return tuple([tuple(result) for result in cached[kind]] for kind in ("passed", "warned", "failed"))  # type: ignore
+
+    def put(self, check_key: str, fingerprint: str, results: Tuple[list, list, list]) -> None:
+        """
+        Store the results of a check.
+
+        :param check_key: Unique name of the check
+        :param fingerprint: Fingerprint of the check's inputs
+        :param results: The passed, warned and failed results of the check
+        """
+        passed, warned, failed = results
+        with self._lock:
+            self._checks[check_key] = {"fingerprint": fingerprint, "passed": passed, "warned": warned, "failed": failed}
+
+    def save(self) -> None:
+        """
+        Write the cache file atomically. Hashes of files, which no longer exist, are dropped.
+        """
+        with self._lock:
+            files = {rel_path: entry for rel_path, entry in self._files.items() if self._hashed.get(rel_path)}
+            cache = {"version": __version__, "files": files, "checks": self._checks}
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=self.path, prefix=LINT_CACHE_FILE, suffix=".tmp")
+                with os.fdopen(fd, "w") as tmp_file:
+                    json.dump(cache, tmp_file)
+                os.replace(tmp_path, self.cache_path)
+            except OSError as e:
+                log.debug(f"Unable to write lint cache {self.cache_path}: {e}")
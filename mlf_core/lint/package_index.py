@@ -0,0 +1,460 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+from mlf_core.common.load_yaml import load_yaml_file_read_only
+from mlf_core.config.config import ConfigCommand
+from requests.adapters import HTTPAdapter
+
+log = logging.getLogger(__name__)
+
+PYPI_API_URL = "https://pypi.python.org/pypi/{name}/json"
+ANACONDA_API_URL = "https://api.anaconda.org/package/{channel}/{name}"
+# timeout in seconds of a single request to a package index
+REQUEST_TIMEOUT = 10
+# upper bound of concurrently running requests (and pooled connections per host)
+MAX_CONCURRENT_REQUESTS = 16
+# the package metadata cache is stored next to the mlf-core configuration file
+PACKAGE_METADATA_CACHE_PATH = f"{os.path.dirname(ConfigCommand.CONF_FILE_PATH)}/package_metadata_cache.json"
+# time in seconds for which cached package metadata is used without revalidating it against the package index
+PACKAGE_METADATA_TTL = 24 * 60 * 60
+# default location of the local package snapshot, which can replace the remote package indices
+PACKAGE_SNAPSHOT_PATH = f"{os.path.dirname(ConfigCommand.CONF_FILE_PATH)}/package_snapshot.json"
+# if set, lint uses the package snapshot at this path instead of querying PyPI and Anaconda
+PACKAGE_SNAPSHOT_ENV_VAR = "MLF_CORE_PACKAGE_SNAPSHOT"
+# 'defaults' isn't actually a channel name. See https://docs.anaconda.com/anaconda/user-guide/tasks/using-repositories/
+DEFAULT_CONDA_CHANNELS = ["main", "anaconda", "r", "free", "archive", "anaconda-extras"]
+
+
+@dataclass
+class PackageLookup:
+    """
+    The result of looking up the latest version of a package in a package index.
+    """
+
+    url: str  # the queried URL
+    status_code: Optional[int] = None  # HTTP status code or None if no response was received
+    latest_version: Optional[str] = None  # latest available version if the package was found
+    # 'timeout', 'connection' or 'offline' if no response was received, 'snapshot' if the package snapshot lacks the package
+    error: str = ""
+
+    @property
+    def found(self) -> bool:
+        return self.status_code == 200 and self.latest_version is not None
+
+
+@dataclass
+class _CacheEntry:
+    """
+    Cached metadata of a single package index URL.
+    """
+
+    status_code: int
+    latest_version: Optional[str]
+    fetched_at: float  # unix timestamp of the last response (or successful revalidation)
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class PackageMetadataCache:
+    """
+    A persistent on-disk cache of package index responses, which is shared by all mlf-core invocations.
+    Entries younger than the TTL are used as they are. Older entries are revalidated using ETag/If-Modified-Since,
+    so an unchanged package only costs a 304 response. Both found (200) and unknown (404) packages are cached.
+    """
+
+    def __init__(self, path: str = PACKAGE_METADATA_CACHE_PATH, ttl: float = PACKAGE_METADATA_TTL):
+        """
+        :param path: Path to the JSON file holding the cache
+        :param ttl: Time in seconds for which an entry is considered fresh
+        """
+        self.path = path
+        self.ttl = ttl
+        self._entries: Optional[Dict[str, _CacheEntry]] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @property
+    def entries(self) -> Dict[str, _CacheEntry]:
+        """
+        All cached entries by URL. The cache file is read lazily on first access.
+        """
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._load()
+            return self._entries
+
+    def _load(self) -> Dict[str, _CacheEntry]:
+        try:
+            with open(self.path) as cache_file:
+                return {url: _CacheEntry(**entry) for url, entry in json.load(cache_file).items()}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, TypeError) as e:
+            log.debug(f"Ignoring unreadable package metadata cache at {self.path}: {e}")
+            return {}
+
+    def get(self, url: str) -> Optional[_CacheEntry]:
+        """
+        :param url: The package index URL
+        :return: The cached entry of the URL or None if the URL was never cached
+        """
+        return self.entries.get(url)
+
+    def is_fresh(self, entry: _CacheEntry) -> bool:
+        """
+        :param entry: A cached entry
+        :return: True if the entry is younger than the TTL
+        """
+        return time.time() - entry.fetched_at < self.ttl
+
+    def put(self, url: str, entry: _CacheEntry) -> None:
+        """
+        Add or replace the entry of a URL. The cache is only written to disk by calling save.
+
+        :param url: The package index URL
+        :param entry: The entry to cache
+        """
+        entries = self.entries
+        with self._lock:
+            entries[url] = entry
+            self._dirty = True
+
+    def save(self) -> None:
+        """
+        Write the cache to disk if it was modified. The file is replaced atomically, so concurrent mlf-core runs
+        never read a partially written cache.
+        """
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+                with os.fdopen(fd, "w") as tmp_file:
+                    json.dump({url: asdict(entry) for url, entry in self._entries.items()}, tmp_file)
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+            except OSError as e:
+                log.debug(f"Unable to write package metadata cache to {self.path}: {e}")
+
+
+class PackageIndexProvider(ABC):
+    """
+    Base class of all providers of the latest versions of PyPI and conda packages.
+    Implementations must be thread safe, since the linters call them concurrently.
+    """
+
+    @abstractmethod
+    def lookup_pip(self, name: str) -> PackageLookup:
+        """
+        Look up the latest version of a PyPI package.
+
+        :param name: Name of the PyPI package
+        :return: The lookup result
+        """
+
+    @abstractmethod
+    def lookup_conda(self, name: str, channel: str) -> PackageLookup:
+        """
+        Look up the latest version of a package in a specific conda channel.
+
+        :param name: Name of the conda package
+        :param channel: Name of the conda channel
+        :return: The lookup result
+        """
+
+    def save_cache(self) -> None:
+        """
+        Persist any state gathered during the lookups. Does nothing by default.
+        """
+
+
+class PackageIndexClient(PackageIndexProvider):
+    """
+    Looks up the latest versions of packages on PyPI and Anaconda.
+    All requests share a single pooled HTTP session, so connections to the package indices are reused across lookups.
+    The client is thread safe and intended to be called concurrently from a bounded thread pool.
+    Responses are cached on disk using a PackageMetadataCache. In offline mode only the cache is consulted.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = MAX_CONCURRENT_REQUESTS,
+        cache: Optional[PackageMetadataCache] = None,
+        offline: bool = False,
+    ):
+        """
+        :param pool_size: Number of connections kept alive per package index host
+        :param cache: The metadata cache to use. Defaults to the shared cache next to the mlf-core configuration file.
+        :param offline: Whether to never query the package indices and rely on cached metadata only
+        """
+        self.cache = cache if cache is not None else PackageMetadataCache()
+        self.offline = offline
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def lookup_pip(self, name: str) -> PackageLookup:
+        """
+        Query the latest version of a package from the PyPI remote API.
+
+        :param name: Name of the PyPI package
+        :return: The lookup result
+        """
+        return self._get(PYPI_API_URL.format(name=name), lambda package_json: package_json["info"]["version"])
+
+    def lookup_conda(self, name: str, channel: str) -> PackageLookup:
+        """
+        Query the latest version of a package in a specific channel from the Anaconda remote API.
+
+        :param name: Name of the conda package
+        :param channel: Name of the conda channel
+        :return: The lookup result
+        """
+        return self._get(
+            ANACONDA_API_URL.format(channel=channel, name=name),
+            lambda package_json: package_json["latest_version"].split("=")[0],
+        )
+
+    def save_cache(self) -> None:
+        """
+        Persist all package metadata fetched so far.
+        """
+        self.cache.save()
+
+    def _get(self, url: str, extract_version: Callable[[dict], str]) -> PackageLookup:
+        """
+        Look up a package index URL. Fresh cached entries are returned as they are, stale entries are revalidated
+        and all other URLs are queried using a HTTP GET request on the pooled session.
+
+        :param url: The URL to query
+        :param extract_version: Extracts the latest version from the JSON response of the package index
+        :return: The lookup result
+        """
+        cached = self.cache.get(url)
+        if cached is not None and (self.offline or self.cache.is_fresh(cached)):
+            return PackageLookup(url, status_code=cached.status_code, latest_version=cached.latest_version)
+        if self.offline:
+            return PackageLookup(url, error="offline")
+
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+        log.debug(f"Querying {url}")
+        try:
+            response = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        except requests.exceptions.Timeout:
+            return PackageLookup(url, error="timeout")
+        except requests.exceptions.ConnectionError:
+            return PackageLookup(url, error="connection")
+
+        if response.status_code == 304 and cached is not None:
+            log.debug(f"Cached metadata of {url} is still up to date.")
+            cached.fetched_at = time.time()
+            self.cache.put(url, cached)
+            return PackageLookup(url, status_code=cached.status_code, latest_version=cached.latest_version)
+
+        lookup = PackageLookup(url, status_code=response.status_code)
+        if response.status_code == 200:
+            try:
+                lookup.latest_version = extract_version(response.json())
+            except (ValueError, KeyError, AttributeError):
+                log.debug(f"Unable to parse the response of {url} as JSON.")
+        if lookup.found or response.status_code == 404:
+            self.cache.put(
+                url,
+                _CacheEntry(
+                    status_code=response.status_code,
+                    latest_version=lookup.latest_version,
+                    fetched_at=time.time(),
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                ),
+            )
+        return lookup
+
+
+class SnapshotPackageIndexProvider(PackageIndexProvider):
+    """
+    Looks up the latest versions of packages in a local JSON snapshot instead of querying PyPI and Anaconda.
+    The snapshot is created and refreshed using refresh_package_snapshot (mlf-core package-snapshot).
+    Packages, which the snapshot knows in other channels only, are reported as not found (404) in the looked up channel.
+    Packages, which are not part of the snapshot at all, may be missing from an outdated snapshot only and are therefore
+    reported with the error 'snapshot', which the linters warn about instead of failing.
+    """
+
+    def __init__(self, path: str = PACKAGE_SNAPSHOT_PATH):
+        """
+        :param path: Path to the JSON snapshot
+        """
+        self.path = path
+        snapshot = load_package_snapshot(path)
+        self.pypi: Dict[str, str] = snapshot["pypi"]
+        self.conda: Dict[str, Dict[str, str]] = snapshot["conda"]
+
+    def lookup_pip(self, name: str) -> PackageLookup:
+        return self._lookup(PYPI_API_URL.format(name=name), self.pypi.get(name.lower()))
+
+    def lookup_conda(self, name: str, channel: str) -> PackageLookup:
+        channel_packages = self.conda.get(channel, {})
+        url = ANACONDA_API_URL.format(channel=channel, name=name)
+        if name not in channel_packages and any(name in packages for packages in self.conda.values()):
+            # the snapshot knows the package, but not in this channel
+            return PackageLookup(url, status_code=404)
+        return self._lookup(url, channel_packages.get(name))
+
+    @staticmethod
+    def _lookup(url: str, latest_version: Optional[str]) -> PackageLookup:
+        if latest_version is None:
+            return PackageLookup(url, error="snapshot")
+        return PackageLookup(url, status_code=200, latest_version=latest_version)
+
+
+def conda_dependency_name_and_channels(dependency: str, channels: List[str]) -> Tuple[str, List[str]]:
+    """
+    Determine the package name of a conda dependency and all channels, which should be searched for it.
+
+    :param dependency: A conda dependency like conda-forge::rich=10.11.0
+    :param channels: The channels of the conda environment
+    :return: The package name and the channels to search
+    """
+    dependency_name = (dependency.split("==") if "==" in dependency else dependency.split("="))[0]
+    dep_channels = list(channels)
+
+    if "::" in dependency_name:
+        dep_channels = [dependency_name.split("::")[0]]
+        dependency_name = dependency_name.split("::")[1]
+
+    if "defaults" in dep_channels:
+        dep_channels.remove("defaults")
+        dep_channels.extend(DEFAULT_CONDA_CHANNELS)
+
+    return dependency_name, dep_channels
+
+
+def create_package_index(offline: bool = False, package_snapshot: Optional[str] = None) -> PackageIndexProvider:
+    """
+    Create the package index provider used for linting.
+    A package snapshot (passed or set using the MLF_CORE_PACKAGE_SNAPSHOT environment variable) takes precedence
+    over the remote package indices.
+
+    :param offline: Whether to only use cached package metadata when querying the remote package indices
+    :param package_snapshot: Path to a local package snapshot
+    :return: The package index provider
+    :raises FileNotFoundError: If the package snapshot does not exist
+    """
+    package_snapshot = package_snapshot or os.environ.get(PACKAGE_SNAPSHOT_ENV_VAR)
+    if package_snapshot:
+        if not os.path.isfile(package_snapshot):
+            raise FileNotFoundError(
+                f"Package snapshot {package_snapshot} not found! Run mlf-core package-snapshot to create it."
+            )
+        log.debug(f"Using package snapshot {package_snapshot}")
+        return SnapshotPackageIndexProvider(package_snapshot)
+    return PackageIndexClient(offline=offline)
+
+
+def load_package_snapshot(path: str) -> dict:
+    """
+    Load a package snapshot. A missing snapshot is treated as an empty one.
+
+    :param path: Path to the JSON snapshot
+    :return: The snapshot with the keys 'created', 'pypi' (name -> version) and 'conda' (channel -> name -> version)
+    """
+    snapshot: dict = {"created": None, "pypi": {}, "conda": {}}
+    if os.path.isfile(path):
+        with open(path) as snapshot_file:
+            snapshot.update(json.load(snapshot_file))
+    return snapshot
+
+
+def collect_project_dependencies(project_dir: str) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """
+    Collect the names of all PyPI and conda dependencies of a mlf-core project.
+    Reads the environment.yml file of mlflow projects and the requirements files of package projects.
+
+    :param project_dir: Path to the project's top level directory
+    :return: The PyPI package names and the conda packages as (channel, name) pairs
+    """
+    pip_names: List[str] = []
+    conda_packages: List[Tuple[str, str]] = []
+    environment_path = os.path.join(project_dir, "environment.yml")
+    if os.path.isfile(environment_path):
+        conda_env = load_yaml_file_read_only(environment_path)
+        for dependency in conda_env.get("dependencies", []):
+            if isinstance(dependency, dict):
+                pip_names.extend(pip_dependency.split("==")[0] for pip_dependency in dependency.get("pip", []))
+            else:
+                name, channels = conda_dependency_name_and_channels(dependency, conda_env.get("channels", []))
+                conda_packages.extend((channel, name) for channel in channels)
+    for requirements_file in ["requirements.txt", "requirements_dev.txt"]:
+        requirements_path = os.path.join(project_dir, requirements_file)
+        if os.path.isfile(requirements_path):
+            with open(requirements_path) as req_file:
+                pip_names.extend(line.strip().split("==")[0] for line in req_file if "==" in line)
+    return pip_names, conda_packages
+
+
+def refresh_package_snapshot(path: str = PACKAGE_SNAPSHOT_PATH, project_dirs: List[str] = None) -> Tuple[int, int]:
+    """
+    Refresh the latest versions of all packages of a package snapshot using PyPI and Anaconda.
+    The dependencies of all passed projects are added to the snapshot. Packages, which could not be looked up
+    (e.g. due to a timeout), keep their previous version. The snapshot is replaced atomically.
+
+    :param path: Path to the JSON snapshot
+    :param project_dirs: Paths to mlf-core projects, whose dependencies should be added to the snapshot
+    :return: The number of refreshed packages and the number of packages, which could not be looked up
+    """
+    snapshot = load_package_snapshot(path)
+    pip_names = set(snapshot["pypi"])
+    conda_packages = {(channel, name) for channel, packages in snapshot["conda"].items() for name in packages}
+    for project_dir in project_dirs or []:
+        project_pip_names, project_conda_packages = collect_project_dependencies(project_dir)
+        pip_names.update(name.lower() for name in project_pip_names)
+        conda_packages.update(project_conda_packages)
+
+    # revalidate every cached entry, but keep the shared cache up to date for regular lint runs
+    client = PackageIndexClient(cache=PackageMetadataCache(ttl=0))
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+        pip_lookups = {name: executor.submit(client.lookup_pip, name) for name in sorted(pip_names)}
+        conda_lookups = {
+            (channel, name): executor.submit(client.lookup_conda, name, channel)
+            for channel, name in sorted(conda_packages)
+        }
+    client.save_cache()
+
+    refreshed, failed = 0, 0
+    for name, pip_lookup in pip_lookups.items():
+        if pip_lookup.result().found:
+            snapshot["pypi"][name] = pip_lookup.result().latest_version
+            refreshed += 1
+        elif pip_lookup.result().error:
+            failed += 1
+    for (channel, name), conda_lookup in conda_lookups.items():
+        if conda_lookup.result().found:
+            snapshot["conda"].setdefault(channel, {})[name] = conda_lookup.result().latest_version
+            refreshed += 1
+        elif conda_lookup.result().error:
+            failed += 1
+    snapshot["created"] = datetime.now().isoformat(timespec="seconds")
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    with os.fdopen(fd, "w") as tmp_file:
+        json.dump(snapshot, tmp_file, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+    return refreshed, failed
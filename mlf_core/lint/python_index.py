@@ -0,0 +1,245 @@
+import ast
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from mlf_core.lint.file_index import ProjectFileIndex
+
+log = logging.getLogger(__name__)
+
+# placeholder for arguments, which are not literals (e.g. variables) and can therefore not be compared
+NON_LITERAL = object()
+
+
+@dataclass
+class Usage:
+    """
+    A reference to a (possibly qualified) name in a Python file, for example a call like F.interpolate(x, mode='bilinear').
+    """
+
+    path: str  # path of the file relative to the project's top level directory
+    line_number: int
+    name: str  # the referenced name without any module or receiver, e.g. interpolate
+    qualified_name: Optional[str]  # the fully resolved name, e.g. torch.nn.functional.interpolate; None if unresolvable
+    is_call: bool
+    args: List[Any] = field(default_factory=list)  # literal values of the positional arguments or NON_LITERAL
+    keywords: Dict[str, Any] = field(default_factory=dict)  # literal values of the keyword arguments or NON_LITERAL
+
+
+@dataclass
+class ForbiddenUsage:
+    """
+    A name, which must not be used, optionally restricted to calls with specific literal arguments.
+    Parsed from specifications like bincount, interpolate('bilinear') or interpolate(mode='bilinear').
+    """
+
+    spec: str  # the original specification
+    name: str
+    args: List[Any] = field(default_factory=list)  # literal values, which must be passed (positional or as keyword)
+    keywords: Dict[str, Any] = field(default_factory=dict)  # literal values, which must be passed as keyword
+
+    @classmethod
+    def parse(cls, spec: str) -> Optional["ForbiddenUsage"]:
+        """
+        :param spec: A name or a call expression with literal arguments
+        :return: The parsed specification or None if it is no valid name or call expression
+        """
+        try:
+            expression = ast.parse(spec.strip(), mode="eval").body
+            if isinstance(expression, ast.Call):
+                return cls(
+                    spec,
+                    _attribute_name(expression.func),  # type: ignore
+                    [ast.literal_eval(arg) for arg in expression.args],
+                    {keyword.arg: ast.literal_eval(keyword.value) for keyword in expression.keywords},  # type: ignore
+                )
+            return cls(spec, _attribute_name(expression))  # type: ignore
+        except (SyntaxError, ValueError, TypeError):
+            log.debug(f"Ignoring invalid forbidden usage specification {spec}")
+            return None
+
+    @property
+    def specificity(self) -> Tuple[int, int]:
+        # a required keyword restricts a call more than a value, which may be passed as any argument
+        return len(self.keywords), len(self.args)
+
+    def matches(self, usage: Usage) -> bool:
+        """
+        Check whether a usage is forbidden. The in-place variant of a function (e.g. index_add_ for index_add) is forbidden as well.
+
+        :param usage: The usage to check
+        :return: True if the usage is forbidden
+        """
+        if usage.name not in (self.name, f"{self.name}_"):
+            return False
+        if not self.args and not self.keywords:
+            return True
+        if not usage.is_call:
+            return False
+        passed_values = usage.args + list(usage.keywords.values())
+        return all(value in passed_values for value in self.args) and all(
+            keyword in usage.keywords and usage.keywords[keyword] == value for keyword, value in self.keywords.items()
+        )
+
+
+def _attribute_name(node: ast.expr) -> Optional[str]:
+    """
+    :return: The last component of a name or attribute chain (e.g. interpolate for F.interpolate) or None
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _literal(node: ast.expr) -> Any:
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError):
+        return NON_LITERAL
+
+
+class _UsageCollector(ast.NodeVisitor):
+    """
+    Collects all calls and name/attribute references of a module and resolves them using the module's imports.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.aliases: Dict[str, str] = {}
+        self.usages: List[Usage] = []
+        self._call_funcs: set = set()
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            if alias.asname:
+                self.aliases[alias.asname] = alias.name
+            else:
+                # import torch.nn binds torch
+                root = alias.name.split(".")[0]
+                self.aliases[root] = root
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        # relative imports refer to the project itself
+        module = f"{'.' * node.level}{node.module or ''}"
+        for alias in node.names:
+            if alias.name != "*":
+                self.aliases[alias.asname or alias.name] = f"{module}.{alias.name}"
+
+    def visit_Call(self, node: ast.Call) -> None:
+        self._call_funcs.add(id(node.func))
+        self._add_usage(
+            node.func,
+            is_call=True,
+            args=[_literal(arg) for arg in node.args],
+            keywords={keyword.arg: _literal(keyword.value) for keyword in node.keywords if keyword.arg},
+        )
+        self.generic_visit(node)
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        if id(node) not in self._call_funcs and isinstance(node.ctx, ast.Load):
+            self._add_usage(node, is_call=False)
+        # the receiver of an attribute chain is no usage on its own
+        if not isinstance(node.value, (ast.Name, ast.Attribute)):
+            self.visit(node.value)
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if id(node) not in self._call_funcs and isinstance(node.ctx, ast.Load):
+            self._add_usage(node, is_call=False)
+
+    def _add_usage(
+        self, node: ast.expr, is_call: bool, args: List[Any] = None, keywords: Dict[str, Any] = None
+    ) -> None:
+        name = _attribute_name(node)
+        if name is None:
+            # e.g. calling the result of another call; the inner call is visited separately
+            return
+        qualified_name = self._qualified_name(node)
+        if qualified_name:
+            # an imported alias like upsample for torch.nn.functional.interpolate uses the original name
+            name = qualified_name.rsplit(".", 1)[-1]
+        self.usages.append(Usage(self.path, node.lineno, name, qualified_name, is_call, args or [], keywords or {}))
+
+    def _qualified_name(self, node: ast.expr) -> Optional[str]:
+        """
+        Resolve a name or attribute chain to its fully qualified name using the imports of the module.
+        """
+        if isinstance(node, ast.Name):
+            return self.aliases.get(node.id)
+        if isinstance(node, ast.Attribute):
+            receiver = self._qualified_name(node.value)
+            return f"{receiver}.{node.attr}" if receiver else None
+        return None
+
+
+class PythonUsageIndex:
+    """
+    Parses every Python file of a project at most once and provides all usages (calls and references) per file.
+    The index is shared by all checks of a lint run, so no file is parsed twice.
+    """
+
+    def __init__(self, file_index: ProjectFileIndex):
+        """
+        :param file_index: The project's file index, which provides the (cached) file contents
+        """
+        self.file_index = file_index
+        self._usages: Dict[str, Optional[List[Usage]]] = {}
+        self._lock = threading.Lock()
+        self._file_locks: Dict[str, threading.Lock] = {}
+
+    def usages(self, rel_path: str) -> Optional[List[Usage]]:
+        """
+        :param rel_path: Path of the Python file relative to the project's top level directory
+        :return: All usages of the file in the order of their appearance or None if the file could not be parsed
+        """
+        with self._lock:
+            file_lock = self._file_locks.setdefault(rel_path, threading.Lock())
+        with file_lock:
+            if rel_path not in self._usages:
+                self._usages[rel_path] = self._parse(rel_path)
+            return self._usages[rel_path]
+
+    def _parse(self, rel_path: str) -> Optional[List[Usage]]:
+        try:
+            tree = ast.parse(self.file_index.read_text(rel_path), filename=rel_path)
+        except (SyntaxError, ValueError, OSError) as e:
+            log.debug(f"Unable to parse {rel_path}: {e}")
+            return None
+        collector = _UsageCollector(rel_path)
+        # resolve the imports and local definitions first, so that usages above (function local) imports are resolved as well
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                collector.aliases.setdefault(node.name, f".{node.name}")
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                collector.visit(node)
+        collector.visit(tree)
+        collector.usages.sort(key=lambda usage: usage.line_number)
+        return collector.usages
+
+    def find_forbidden(
+        self, rel_paths: List[str], forbidden: List[ForbiddenUsage], modules: Tuple[str, ...] = ()
+    ) -> List[Tuple[Usage, ForbiddenUsage]]:
+        """
+        Find all forbidden usages in a set of Python files.
+        Usages resolved to a module outside of the passed modules (e.g. numpy.bincount when checking torch) are allowed.
+        Usages, which cannot be resolved (e.g. methods of tensors), are checked conservatively.
+        For every usage only the most specific matching specification is reported.
+
+        :param rel_paths: Paths of the Python files relative to the project's top level directory
+        :param forbidden: The forbidden usages
+        :param modules: Top level modules the forbidden usages belong to, e.g. ('torch',). Empty to check all usages.
+        :return: Pairs of forbidden usages and the specification they match; unparsable files are skipped
+        """
+        findings = []
+        for rel_path in rel_paths:
+            usages = self.usages(rel_path)
+            for usage in usages or []:
+                if modules and usage.qualified_name and usage.qualified_name.split(".")[0] not in modules:
+                    continue
+                matching = [specification for specification in forbidden if specification.matches(usage)]
+                if matching:
+                    findings.append((usage, max(matching, key=lambda specification: specification.specificity)))
+        return findings
@@ -0,0 +1,86 @@
+import json
+from typing import List
+
+from mlf_core import __version__
+from mlf_core.lint.lint import LintResult
+
+LINT_DOCS_URL = "https://mlf-core.readthedocs.io/en/latest/lint.html"
+SARIF_SCHEMA_URL = "https://json.schemastore.org/sarif-2.1.0.json"
+# SARIF levels of warned and failed checks; passed checks are not reported
+SARIF_LEVELS = {"warned": "warning", "failed": "error"}
+
+
+def lint_results_to_json(results: List[LintResult]) -> str:
+    """
+    Serialize the lint results of several projects as JSON.
+
+    :param results: The results of all projects
+    :return: A JSON array with one object per project
+    """
+    return json.dumps(
+        [
+            {
+                "project_dir": result.project_dir,
+                "template_handle": result.template_handle,
+                "error": result.error,
+                **{
+                    kind: [{"code": str(code), "message": message} for code, message in getattr(result, kind)]
+                    for kind in ("passed", "warned", "failed")
+                },
+            }
+            for result in results
+        ],
+        indent=2,
+    )
+
+
+def lint_results_to_sarif(results: List[LintResult]) -> str:
+    """
+    Serialize the lint results of several projects as a SARIF 2.1.0 log with a single run.
+    Every warned or failed check becomes a result, which is located at the project's top level directory.
+    Critical errors, which stopped the linting of a project, are reported as tool execution notifications.
+
+    :param results: The results of all projects
+    :return: The SARIF log
+    """
+    rules = {}
+    sarif_results = []
+    for result in results:
+        for kind, level in SARIF_LEVELS.items():
+            for code, message in getattr(result, kind):
+                rule_id = str(code)
+                rules.setdefault(rule_id, {"id": rule_id, "helpUri": f"{LINT_DOCS_URL}#{rule_id}"})
+                sarif_results.append(
+                    {
+                        "ruleId": rule_id,
+                        "level": level,
+                        "message": {"text": message},
+                        "locations": [{"physicalLocation": {"artifactLocation": {"uri": result.project_dir}}}],
+                    }
+                )
+    notifications = [
+        {"level": "error", "message": {"text": f"{result.project_dir}: {result.error}"}}
+        for result in results
+        if result.error is not None
+    ]
+    sarif_log = {
+        "$schema": SARIF_SCHEMA_URL,
+        "version": "2.1.0",
+        "runs": [
+            {
+                "tool": {
+                    "driver": {
+                        "name": "mlf-core",
+                        "version": __version__,
+                        "informationUri": LINT_DOCS_URL,
+                        "rules": sorted(rules.values(), key=lambda rule: rule["id"]),
+                    }
+                },
+                "invocations": [
+                    {"executionSuccessful": not notifications, "toolExecutionNotifications": notifications}
+                ],
+                "results": sarif_results,
+            }
+        ],
+    }
+    return json.dumps(sarif_log, indent=2)
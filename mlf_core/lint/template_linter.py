@@ -1,16 +1,28 @@
-import configparser
-import io
+import copy
 import logging
 import os
 import re
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from itertools import groupby
+from typing import Dict, List, Optional, Tuple
 
-import requests
 import rich.console
 import rich.markdown
 import rich.panel
 import rich.progress
-from mlf_core.common.load_yaml import load_yaml_file
+from mlf_core.common.load_yaml import load_yaml_file, load_yaml_file_read_only
+from mlf_core.common.version import VERSION_PATTERN
+from mlf_core.common.version_index import load_version_index
+from mlf_core.lint.file_index import ProjectFileIndex
+from mlf_core.lint.lint_cache import FILE_LISTING, LintCache
+from mlf_core.lint.package_index import (
+    MAX_CONCURRENT_REQUESTS,
+    PackageIndexClient,
+    PackageIndexProvider,
+    PackageLookup,
+    conda_dependency_name_and_channels,
+)
+from mlf_core.lint.python_index import PythonUsageIndex
 from mlf_core.util.dir_util import find_filepath_in_dir, pf
 from mlf_core.util.rich import console
 from packaging import version
@@ -19,25 +31,61 @@ from rich import print
 
 log = logging.getLogger(__name__)
 
+TODO_STRINGS = ["TODO MLF-CORE:", "MLF-CORE TODO:"]
+COOKIECUTTER_STRING_REGEX = re.compile(r"{\s?.* cookiecutter.*\s?}")  # noqa W605
+
 
 class TemplateLinter(object):
     """Object to hold linting information and results.
     Attributes:
         files (list): A list of files found sduring the linting process.
         path (str): Path to the project directory.
+        file_index (ProjectFileIndex): The index of all project files, which all content based checks share.
+        python_index (PythonUsageIndex): The parsed usages of all Python files, which all code based checks share.
+        package_index (PackageIndexProvider): Provider of the latest versions of dependencies (remote or a local snapshot).
+        lint_cache (LintCache): The incremental lint cache or None if all checks should run.
+        jobs (int): Number of lint checks to run concurrently. None uses the thread pool's default.
         failed (list): A list of tuples of the form: `(<error no>, <reason>)`
         passed (list): A list of tuples of the form: `(<passed no>, <reason>)`
         warned (list): A list of tuples of the form: `(<warned no>, <reason>)`
     """
 
-    def __init__(self, path="."):
+    # inputs of every check used by the incremental lint: fnmatch patterns of the project files the check depends on
+    # (formatted with the project slugs), FILE_LISTING if it depends on which files exist or None if it must always run.
+    # Checks, which are not listed, depend on all project files.
+    CHECK_INPUTS: Dict[str, Optional[List[str]]] = {
+        "check_files_exist": [FILE_LISTING],
+        "lint_changelog": ["CHANGELOG.rst"],
+        "check_docker": ["Dockerfile"],
+        "mlflow_check_conda_environment": None,  # the latest package versions may change at any time
+        "mlflow_mlf_core_py_complete": [FILE_LISTING, "*mlf_core.py"],
+    }
+
+    def __init__(
+        self,
+        path=".",
+        jobs: Optional[int] = None,
+        package_index: Optional[PackageIndexProvider] = None,
+        incremental: bool = False,
+    ):
         self.path = path
+        self.jobs = jobs
         self.files = []
-        self.project_slug = load_yaml_file(f"{path}/.mlf_core.yml")["project_slug"]
-        self.project_slug_no_hyphen = load_yaml_file(f"{path}/.mlf_core.yml")["project_slug_no_hyphen"]
+        dot_mlf_core = load_yaml_file_read_only(f"{path}/.mlf_core.yml")
+        self.project_slug = dot_mlf_core["project_slug"]
+        self.project_slug_no_hyphen = dot_mlf_core["project_slug_no_hyphen"]
         self.passed = []
         self.warned = []
         self.failed = []
+        self.file_index = ProjectFileIndex(path)
+        self.python_index = PythonUsageIndex(self.file_index)
+        self.package_index = package_index if package_index is not None else PackageIndexClient()
+        self.lint_cache = LintCache(path) if incremental else None
+        # register the patterns of all general content checks, so that they are matched in a single pass
+        self.file_index.register("general-3", tokens=TODO_STRINGS, respect_gitignore=True)
+        self.file_index.register(
+            "general-4", regex=COOKIECUTTER_STRING_REGEX, file_filter=lambda rel_path: not rel_path.endswith(".pyc")
+        )
 
     def lint_project(self, calling_class, check_functions: list = None, is_subclass_calling=True) -> None:
         """Main linting function.
@@ -66,6 +114,8 @@ class TemplateLinter(object):
             if "mlflow" not in self.__class__.__name__.lower():
                 check_functions = list(filter(lambda func: not func.startswith("mlflow"), check_functions))
 
+        # sort the check functions to ensure a stable output ordering independent of the order the checks finish in
+        check_functions = sorted(check_functions)
         progress = rich.progress.Progress(
             "[bold green]{task.description}",
             rich.progress.BarColumn(bar_width=None),
@@ -75,13 +125,76 @@ class TemplateLinter(object):
             lint_progress = progress.add_task(
                 "Running lint checks", total=len(check_functions), func_name=check_functions
             )
-            for fun_name in check_functions:
-                log.debug(f"Running linting function: {fun_name}")
-                progress.update(lint_progress, advance=1, func_name=fun_name)
-                if fun_name == "check_files_exist":
-                    getattr(calling_class, fun_name)(is_subclass_calling)
-                else:
-                    getattr(calling_class, fun_name)()
+            # all checks are independent of each other -> run them concurrently
+            with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                futures = [
+                    executor.submit(self._run_check, calling_class, fun_name, is_subclass_calling)
+                    for fun_name in check_functions
+                ]
+                fun_names = dict(zip(futures, check_functions))
+                for future in as_completed(futures):
+                    progress.update(lint_progress, advance=1, func_name=fun_names[future])
+
+        # merge the results of all checks in the order of the check functions
+        for future in futures:
+            passed, warned, failed = future.result()
+            self.passed.extend(passed)
+            self.warned.extend(warned)
+            self.failed.extend(failed)
+
+    def _run_check(self, calling_class, fun_name: str, is_subclass_calling: bool):
+        """
+        Run a single linting function on a shallow copy of the linter, which collects the results of this check only.
+        All copies share the file index, so the project files are still only read once.
+        In incremental mode the cached results are replayed instead, if the inputs of the check did not change.
+
+        :param calling_class: The class that calls the function -> used to resolve the linting method
+        :param fun_name: Name of the linting function to run
+        :param is_subclass_calling: Indicates whether a domain specific linter calls the linting or not
+        :return: The passed, warned and failed results of the check
+        """
+        check_key = f"{self.__class__.__name__}.{fun_name}:{is_subclass_calling}"
+        fingerprint = self._check_fingerprint(check_key, fun_name)
+        if fingerprint is not None:
+            cached_results = self.lint_cache.get(check_key, fingerprint)  # type: ignore
+            if cached_results is not None:
+                log.debug(f"Replaying cached results of linting function: {fun_name}")
+                return cached_results
+
+        log.debug(f"Running linting function: {fun_name}")
+        check_linter = copy.copy(self)
+        check_linter.passed, check_linter.warned, check_linter.failed = [], [], []
+        check_function = getattr(calling_class, fun_name).__func__
+        if fun_name == "check_files_exist":
+            check_function(check_linter, is_subclass_calling)
+        else:
+            check_function(check_linter)
+
+        results = check_linter.passed, check_linter.warned, check_linter.failed
+        if fingerprint is not None:
+            self.lint_cache.put(check_key, fingerprint, results)  # type: ignore
+        return results
+
+    def _check_fingerprint(self, check_key: str, fun_name: str) -> Optional[str]:
+        """
+        Compute the fingerprint of the inputs of a check for the incremental lint.
+
+        :param check_key: Unique name of the check
+        :param fun_name: Name of the linting function
+        :return: The fingerprint or None if not linting incrementally or the check must always run
+        """
+        if self.lint_cache is None:
+            return None
+        if fun_name not in self.CHECK_INPUTS:
+            return self.lint_cache.fingerprint(check_key, self.file_index.files, None)
+        input_patterns = self.CHECK_INPUTS[fun_name]
+        if input_patterns is None:
+            return None
+        input_patterns = [
+            pattern.format(project_slug=self.project_slug, project_slug_no_hyphen=self.project_slug_no_hyphen)
+            for pattern in input_patterns
+        ]
+        return self.lint_cache.fingerprint(check_key, self.file_index.files, input_patterns)
 
     def check_files_exist(self, is_subclass_calling=True):
         """Checks a given project directory for required files.
@@ -189,102 +302,66 @@ class TemplateLinter(object):
         """
         Go through all template files looking for the string 'TODO MLF-CORE:' or 'MLF-CORE TODO:'
         """
-        ignore = [".git"]
-        if os.path.isfile(os.path.join(self.path, ".gitignore")):
-            with io.open(os.path.join(self.path, ".gitignore"), "rt", encoding="latin1") as file:
-                for line in file:
-                    ignore.append(os.path.basename(line.strip().rstrip("/")))
-        for root, dirs, files in os.walk(self.path):
-            # Ignore files
-            for ignore_file in ignore:
-                if ignore_file in dirs:
-                    dirs.remove(ignore_file)
-                if ignore_file in files:
-                    files.remove(ignore_file)
-            for fname in files:
-                with io.open(os.path.join(root, fname), "rt", encoding="latin1") as file:
-                    for line in file:
-                        if any(todostring in line for todostring in ["TODO MLF-CORE:", "MLF-CORE TODO:"]):
-                            line = (
-                                line.replace("<!--", "")
-                                .replace("-->", "")
-                                .replace("# TODO MLF-CORE: ", "")
-                                .replace("// TODO MLF-CORE: ", "")
-                                .replace("TODO MLF-CORE: ", "")
-                                .replace("# MLF-CORE TODO: ", "")
-                                .replace("// MLF-CORE TODO: ", "")
-                                .replace("MLF-CORE TODO: ", "")
-                                .strip()
-                            )
-                            self.warned.append(
-                                ("general-3", f"TODO string found in {self._wrap_quotes(fname)}: {line}")
-                            )
+        reported_lines = set()
+        for match in self.file_index.matches("general-3"):
+            # a line containing both TODO strings is only reported once
+            if (match.path, match.line_number) in reported_lines:
+                continue
+            reported_lines.add((match.path, match.line_number))
+            line = (
+                match.line.replace("<!--", "")
+                .replace("-->", "")
+                .replace("# TODO MLF-CORE: ", "")
+                .replace("// TODO MLF-CORE: ", "")
+                .replace("TODO MLF-CORE: ", "")
+                .replace("# MLF-CORE TODO: ", "")
+                .replace("// MLF-CORE TODO: ", "")
+                .replace("MLF-CORE TODO: ", "")
+                .strip()
+            )
+            self.warned.append(
+                ("general-3", f"TODO string found in {self._wrap_quotes(os.path.basename(match.path))}: {line}")
+            )
 
     def check_no_cookiecutter_strings(self) -> None:
         """
         Verifies that no cookiecutter strings are in any of the files
         """
-        for root, _, files in os.walk(self.path):
-            for fname in files:
-                with io.open(os.path.join(root, fname), "rt", encoding="latin1") as file:
-                    if file.name.endswith(".pyc"):
-                        continue
-                    for line in file:
-                        regex = re.compile(r"{\s?.* cookiecutter.*\s?}")  # noqa W605
-                        if regex.search(line):
-                            line = f"{line[:50 - len(fname)]}.."
-                            self.warned.append(("general-4", f"Cookiecutter string found in '{fname}': {line}"))
+        for match in self.file_index.matches("general-4"):
+            fname = os.path.basename(match.path)
+            line = f"{match.line[:50 - len(fname)]}.."
+            self.warned.append(("general-4", f"Cookiecutter string found in '{fname}': {line}"))
 
     def check_version_consistent(self) -> None:
         """
         This method should check that the version is consistent across all files.
         """
-        parser = configparser.ConfigParser()
-        parser.read(f"{self.path}/mlf_core.cfg")
-        sections = ["bumpversion_files_whitelisted", "bumpversion_files_blacklisted"]
-
-        current_version = parser.get("bumpversion", "current_version")
-
-        cwd = os.getcwd()
-        os.chdir(self.path)
+        version_index = load_version_index(self.path)
+        current_version = version_index.current_version
 
         # check if the version matches current version in each listed file (depending on whitelisted or blacklisted)
-        for section in sections:
-            for _, path in parser.items(section):
-                self._check_version_match(path, current_version, section)
-        os.chdir(cwd)
+        for indexed_file in version_index.files:
+            for occurrence in indexed_file.bumped_occurrences:
+                # No match between the current version number and (the first) version in source code file
+                if occurrence.versions[0] != current_version:
+                    corrected_line = VERSION_PATTERN.sub(current_version, occurrence.line)
+                    self.failed.append(
+                        (
+                            "general-5",
+                            f"Version number don´t match in\n {indexed_file.path}: \n {occurrence.line.strip()} should be {corrected_line.strip()}",
+                        )
+                    )
         # Pass message if there weren't any inconsistencies within the version numbers
         if not any("general-5" in tup[0] for tup in self.failed):
             self.passed.append(("general-5", "Versions were consistent over all files"))
 
-    def _check_version_match(self, path: str, version: str, section: str) -> None:
-        """
-        Check if the versions in a file are consistent with the current version in the mlf_core.cfg
-        :param path: The current file-path to check
-        :param version: The current version of the project specified in the mlf_core.cfg file
-        :param section: The current section (blacklisted or whitelisted files)
-        """
-        with open(path) as file:
-            for line in file:
-                # if a tag is found and (depending on whether its a white or blacklisted file) check if the versions are matching
-                if (
-                    "<<MLF-CORE_NO_BUMP>>" not in line and not section == "bumpversion_files_blacklisted"
-                ) or "<<MLF-CORE_FORCE_BUMP>>" in line:
-                    line_version = re.search(r"(?<!\.)\d+(?:\.\d+){2}(?:-SNAPSHOT)?(?!\.)", line)
-                    if line_version:
-                        line_version = line_version.group(0)  # type: ignore
-                        # No match between the current version number and version in source code file
-                        if line_version != version:
-                            corrected_line = re.sub(r"(?<!\.)\d+(?:\.\d+){2}(?:-SNAPSHOT)?(?!\.)", version, line)
-                            self.failed.append(
-                                (
-                                    "general-5",
-                                    f"Version number don´t match in\n {path}: \n {line.strip()} should be {corrected_line.strip()}",
-                                )
-                            )
-
     def mlflow_check_conda_environment(self) -> None:
+        """
+        Verifies that the environment.yml file is reasonably structured and that all dependencies are pinned and up to date.
+        The latest versions of all dependencies are looked up concurrently using a bounded thread pool and a shared HTTP session.
+        """
         passed_conda_check = True
+        # the round trip loader keeps the MLF-CORE IGNORE comments of the dependencies
         conda_env = load_yaml_file(f"{self.path}/environment.yml")
 
         # Verify that the structure is somewhat reasonable
@@ -294,128 +371,149 @@ class TemplateLinter(object):
                 self.failed.append(("general-7", f"Section {section} missing from environment.yml file!"))
 
         conda_only = list(filter(lambda dep: "::" in dep, conda_env["dependencies"]))
-
-        # Verify that all Conda dependencies have a pinned version number and are up to date
-        for idx, dependency in enumerate(conda_only):
-            comment_token = conda_env["dependencies"].ca.items.get(idx)
-            check_dependency = True
-            if comment_token and "MLF-CORE IGNORE" in comment_token[0].value:
-                check_dependency = False
-            else:
-                # after an = sign there should be a specified version
-                split = dependency.split("==") if "==" in dependency else dependency.split("=")
-                if len(split) < 2:
-                    passed_conda_check = False
-                    check_dependency = False
-                    self.failed.append(("general-7", f"Dependency {dependency} does not have a pinned version!"))
-            if check_dependency:
-                self._check_anaconda_package(dependency, conda_env)
-
         # all pip dependencies are inside a dict
         pip_only = list(filter(lambda dep: isinstance(dep, dict), conda_env["dependencies"]))[0]["pip"]
 
-        # Verify that all PyPI/pip dependencies have a pinned version number and are up to date
-        for idx, dependency in enumerate(pip_only):
-            comment_token = pip_only.ca.items.get(idx)
-            check_dependency = True
-            if comment_token and "MLF-CORE IGNORE" in comment_token[0].value:
-                check_dependency = False
-            else:
-                # after an = sign there should be a specified version
-                split = dependency.split("==") if "==" in dependency else dependency.split("=")
-                if len(split) < 2:
-                    passed_conda_check = False
-                    check_dependency = False
-                    self.failed.append(("general-7", f"Dependency {dependency} does not have a pinned version!"))
-            if check_dependency:
-                self._check_pip_package(dependency)
+        # Verify that all Conda and PyPI/pip dependencies have a pinned version number
+        conda_to_check, passed_conda_pinned = self._pinned_dependencies(conda_only, conda_env["dependencies"])
+        pip_to_check, passed_pip_pinned = self._pinned_dependencies(pip_only, pip_only)
+        passed_conda_check = passed_conda_check and passed_conda_pinned and passed_pip_pinned
+
+        # Verify that all dependencies are up to date; all lookups (including every channel of a conda dependency) are issued at once
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            conda_lookups = []
+            for dependency in conda_to_check:
+                dependency_name, channels = conda_dependency_name_and_channels(
+                    dependency, conda_env.get("channels", [])
+                )
+                channel_lookups = {
+                    channel: executor.submit(self.package_index.lookup_conda, dependency_name, channel)
+                    for channel in channels
+                }
+                conda_lookups.append((dependency, channel_lookups))
+            pip_lookups = [
+                (dependency, executor.submit(self.package_index.lookup_pip, dependency.split("==")[0]))
+                for dependency in pip_to_check
+            ]
+            # evaluate the results in the order of the environment.yml file to keep the output stable
+            for dependency, channel_lookups in conda_lookups:
+                self._check_anaconda_package(dependency, channel_lookups)
+            for dependency, pip_lookup in pip_lookups:
+                self._check_pip_package(dependency, pip_lookup.result())
+        self.package_index.save_cache()
 
         if passed_conda_check:
             self.passed.append(("general-7", "Passed conda environment checks."))
 
-    def _check_anaconda_package(self, dependency, conda_environment):
-        """Query conda package information.
-        Sends a HTTP GET request to the Anaconda remote API.
-        :param dependency: A conda package name.
-        :param conda_environment: A dictionary of the read in environment.yml
+    def _pinned_dependencies(self, dependencies: list, commented_sequence) -> Tuple[list, bool]:
         """
-        # Check if each dependency is the latest available version
-        dependency_split = dependency.split("==") if "==" in dependency else dependency.split("=")
-        dependency_name, dependency_version = dependency_split[0], dependency_split[1]
-        dep_channels = conda_environment.get("channels", [])
-
-        if "::" in dependency_name:
-            dep_channels = [dependency_name.split("::")[0]]
-            dependency_name = dependency_name.split("::")[1]
-
-        # 'defaults' isn't actually a channel name. See https://docs.anaconda.com/anaconda/user-guide/tasks/using-repositories/
-        if "defaults" in dep_channels:
-            dep_channels.remove("defaults")
-            dep_channels.extend(["main", "anaconda", "r", "free", "archive", "anaconda-extras"])
-        for ch in dep_channels:
-            anaconda_api_url = f"https://api.anaconda.org/package/{ch}/{dependency_name}"
-            try:
-                response = requests.get(anaconda_api_url, timeout=10)
-            except requests.exceptions.Timeout:
-                self.warned.append(("general-7", f"Anaconda API timed out: {anaconda_api_url}"))
-            except requests.exceptions.ConnectionError:
-                self.warned.append(("general-7", "Could not connect to Anaconda API"))
+        Filter the dependencies, which should be checked for updates and fail all dependencies without a pinned version.
+        Dependencies marked with a MLF-CORE IGNORE comment are skipped.
+
+        :param dependencies: The dependencies to filter
+        :param commented_sequence: The round trip loaded sequence, which holds the comments of the dependencies
+        :return: The dependencies to check for updates and whether all dependencies have a pinned version
+        """
+        passed_pinned = True
+        to_check = []
+        for idx, dependency in enumerate(dependencies):
+            comment_token = commented_sequence.ca.items.get(idx)
+            if comment_token and "MLF-CORE IGNORE" in comment_token[0].value:
+                continue
+            # after an = sign there should be a specified version
+            split = dependency.split("==") if "==" in dependency else dependency.split("=")
+            if len(split) < 2:
+                passed_pinned = False
+                self.failed.append(("general-7", f"Dependency {dependency} does not have a pinned version!"))
             else:
-                if response.status_code == 200:
-                    conda_dep_json = response.json()
-                    latest_dependency_version = conda_dep_json["latest_version"]
-                    latest_dependency_version = latest_dependency_version.split("=")[0]
-                    dependency_version = dependency_version.split("==")[0]
-                    if parse_version(dependency_version) < parse_version(latest_dependency_version):
-                        self.warned.append(
-                            (
-                                "general-7",
-                                f"Version {dependency_version} of {dependency_name}"
-                                f" is not the latest available: {latest_dependency_version}",
-                            )
-                        )
-                    return
-                elif response.status_code != 404:
+                to_check.append(dependency)
+
+        return to_check, passed_pinned
+
+    def _check_anaconda_package(self, dependency: str, channel_lookups: Dict[str, Future]) -> None:
+        """Evaluate the conda package information of all channels of a dependency.
+        The channel lookups race against each other: the first channel, which knows the package, is used and all
+        lookups, which did not start yet, are cancelled.
+        :param dependency: A conda dependency like conda-forge::rich=10.11.0
+        :param channel_lookups: The pending Anaconda API lookups of the dependency per channel
+        """
+        dependency_split = dependency.split("==") if "==" in dependency else dependency.split("=")
+        dependency_name, dependency_version = dependency_split[0].split("::")[-1], dependency_split[1]
+
+        for finished_lookup in as_completed(channel_lookups.values()):
+            conda_lookup = finished_lookup.result()
+            if conda_lookup.found:
+                for pending_lookup in channel_lookups.values():
+                    pending_lookup.cancel()
+                latest_dependency_version = conda_lookup.latest_version
+                if parse_version(dependency_version) < parse_version(latest_dependency_version):
                     self.warned.append(
                         (
                             "general-7",
-                            f"Anaconda API returned unexpected response code `{response.status_code}`"
-                            f" for: {anaconda_api_url}\n{response}",
+                            f"Version {dependency_version} of {dependency_name}"
+                            f" is not the latest available: {latest_dependency_version}",
                         )
                     )
-                elif response.status_code == 404:
-                    print(f"[red]Could not find {dependency} in conda channel {ch}")
-        else:
-            # We have looped through each channel and had a 404 response code on everything
+                return
+
+        # no channel knows the dependency -> report the reasons in the order of the channels
+        all_not_found = True
+        for ch, finished_lookup in channel_lookups.items():
+            conda_lookup = finished_lookup.result()
+            if conda_lookup.status_code != 404:
+                all_not_found = False
+            if conda_lookup.error == "timeout":
+                self.warned.append(("general-7", f"Anaconda API timed out: {conda_lookup.url}"))
+            elif conda_lookup.error == "connection":
+                self.warned.append(("general-7", "Could not connect to Anaconda API"))
+            elif conda_lookup.error == "offline":
+                self.warned.append(("general-7", f"Anaconda API not queried in offline mode: {conda_lookup.url}"))
+            elif conda_lookup.error == "snapshot":
+                self.warned.append(
+                    ("general-7", f"{dependency_name} is not part of the package snapshot: {conda_lookup.url}")
+                )
+            elif conda_lookup.status_code != 404:
+                self.warned.append(
+                    (
+                        "general-7",
+                        f"Anaconda API returned unexpected response code `{conda_lookup.status_code}`"
+                        f" for: {conda_lookup.url}",
+                    )
+                )
+            else:
+                print(f"[red]Could not find {dependency} in conda channel {ch}")
+        # only fail if every channel answered that it does not know the dependency, a lookup without an answer only warns
+        if all_not_found:
             self.failed.append(("general-7", f"Could not find Conda dependency {dependency} using the Anaconda API"))
 
-    def _check_pip_package(self, dependency):
-        """Query PyPi package information.
-        Sends a HTTP GET request to the PyPi remote API.
-        :param dependency: A PyPi package name.
+    def _check_pip_package(self, dependency: str, pip_lookup: PackageLookup) -> None:
+        """Evaluate PyPi package information.
+        :param dependency: A PyPi dependency like rich==10.11.0
+        :param pip_lookup: The result of the PyPi remote API lookup
         """
         pip_dependency_name, pip_dependency_version = dependency.split("==")
-        pip_api_url = "https://pypi.python.org/pypi/{}/json".format(pip_dependency_name)
-        try:
-            response = requests.get(pip_api_url, timeout=10)
-        except requests.exceptions.Timeout:
-            self.warned.append(("general-7", f"PyPi API timed out: {pip_api_url}"))
-        except requests.exceptions.ConnectionError:
-            self.warned.append(("general-7", f"PyPi API Connection error: {pip_api_url}"))
-        else:
-            if response.status_code == 200:
-                pip_dep_json = response.json()
-                latest_dependency_version = pip_dep_json["info"]["version"]
-                if parse_version(pip_dependency_version) < parse_version(latest_dependency_version):
-                    self.warned.append(
-                        (
-                            "general-7",
-                            f"Version {pip_dependency_version} of {pip_dependency_name}"
-                            f" is not the latest available: {latest_dependency_version}",
-                        )
+        if pip_lookup.error == "timeout":
+            self.warned.append(("general-7", f"PyPi API timed out: {pip_lookup.url}"))
+        elif pip_lookup.error == "connection":
+            self.warned.append(("general-7", f"PyPi API Connection error: {pip_lookup.url}"))
+        elif pip_lookup.error == "offline":
+            self.warned.append(("general-7", f"PyPi API not queried in offline mode: {pip_lookup.url}"))
+        elif pip_lookup.error == "snapshot":
+            self.warned.append(
+                ("general-7", f"{pip_dependency_name} is not part of the package snapshot: {pip_lookup.url}")
+            )
+        elif pip_lookup.found:
+            latest_dependency_version = pip_lookup.latest_version
+            if parse_version(pip_dependency_version) < parse_version(latest_dependency_version):
+                self.warned.append(
+                    (
+                        "general-7",
+                        f"Version {pip_dependency_version} of {pip_dependency_name}"
+                        f" is not the latest available: {latest_dependency_version}",
                     )
-            else:
-                self.failed.append(("general-7", f"Could not find pip dependency using the PyPi API: {dependency}"))
+                )
+        else:
+            self.failed.append(("general-7", f"Could not find pip dependency using the PyPi API: {dependency}"))
 
     def mlflow_mlf_core_py_complete(self) -> None:
         """
@@ -455,42 +553,7 @@ class TemplateLinter(object):
                 self.failed.append(("mlflow-general-8", f"{expected_line} not found in mlf_core.py"))
 
     def _print_results(self):
-        console.print()
-        console.rule("[bold blue]LINT RESULTS")
-        console.print()
-        console.print(
-            f"     [bold green][[\u2714]] {len(self.passed):>4} tests passed\n     [bold yellow][[!]] {len(self.warned):>4} tests had warnings\n"
-            f"     [bold red][[\u2717]] {len(self.failed):>4} tests failed",
-            overflow="ellipsis",
-            highlight=False,
-        )
-
-        # Helper function to format test links nicely
-        def format_result(test_results):
-            """
-            Given an list of error message IDs and the message texts, return a nicely formatted
-            string for the terminal with appropriate ASCII colours.
-            """
-            results = []
-            for eid, msg in test_results:
-                results.append(
-                    f"1. [https://mlf-core.readthedocs.io/en/latest/lint.html#{eid}]"
-                    f"(https://mlf-core.readthedocs.io/en/latest/lint.html#{eid}) : {msg}"
-                )
-            return rich.markdown.Markdown("\n".join(results))
-
-        if len(self.passed) > 0:
-            console.print()
-            console.rule("[bold green][[\u2714]] Tests Passed", style="green")
-            console.print(rich.panel.Panel(format_result(self.passed), style="green"), overflow="ellipsis")
-        if len(self.warned) > 0:
-            console.print()
-            console.rule("[bold yellow][[!]] Test Warnings", style="yellow")
-            console.print(rich.panel.Panel(format_result(self.warned), style="yellow"), overflow="ellipsis")
-        if len(self.failed) > 0:
-            console.print()
-            console.rule("[bold red][[\u2717]] Test Failures", style="red")
-            console.print(rich.panel.Panel(format_result(self.failed), style="red"), overflow="ellipsis")
+        print_lint_results(self.passed, self.warned, self.failed)
 
     def _wrap_quotes(self, files):
         if not isinstance(files, list):
@@ -506,6 +569,48 @@ class TemplateLinter(object):
         return ansi_escape.sub(replace_with, string)
 
 
+def print_lint_results(passed: list, warned: list, failed: list) -> None:
+    """
+    Print the passed, warned and failed results of a lint run as rich panels.
+    """
+    console.print()
+    console.rule("[bold blue]LINT RESULTS")
+    console.print()
+    console.print(
+        f"     [bold green][[\u2714]] {len(passed):>4} tests passed\n     [bold yellow][[!]] {len(warned):>4} tests had warnings\n"
+        f"     [bold red][[\u2717]] {len(failed):>4} tests failed",
+        overflow="ellipsis",
+        highlight=False,
+    )
+
+    # Helper function to format test links nicely
+    def format_result(test_results):
+        """
+        Given an list of error message IDs and the message texts, return a nicely formatted
+        string for the terminal with appropriate ASCII colours.
+        """
+        results = []
+        for eid, msg in test_results:
+            results.append(
+                f"1. [https://mlf-core.readthedocs.io/en/latest/lint.html#{eid}]"
+                f"(https://mlf-core.readthedocs.io/en/latest/lint.html#{eid}) : {msg}"
+            )
+        return rich.markdown.Markdown("\n".join(results))
+
+    if len(passed) > 0:
+        console.print()
+        console.rule("[bold green][[\u2714]] Tests Passed", style="green")
+        console.print(rich.panel.Panel(format_result(passed), style="green"), overflow="ellipsis")
+    if len(warned) > 0:
+        console.print()
+        console.rule("[bold yellow][[!]] Test Warnings", style="yellow")
+        console.print(rich.panel.Panel(format_result(warned), style="yellow"), overflow="ellipsis")
+    if len(failed) > 0:
+        console.print()
+        console.rule("[bold red][[\u2717]] Test Failures", style="red")
+        console.print(rich.panel.Panel(format_result(failed), style="red"), overflow="ellipsis")
+
+
 def files_exist_linting(
     self,
     files_fail: list,
@@ -586,7 +691,7 @@ class GetLintingFunctionsMeta(type):
 
     def __call__(self, *args, **kwargs):
         # create the new class as normal
-        cls = type.__call__(self, *args)
+        cls = type.__call__(self, *args, **kwargs)
 
         # set the methods attribute to a list of all specific linting functions
         setattr(cls, "methods", self.get_linting_functions())  # noqa: B010
@@ -0,0 +1,264 @@
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from github import Github
+from mlf_core.common.load_yaml import load_yaml_file_read_only
+from mlf_core.create.github_support import decrypt_pat, load_github_username
+from mlf_core.util.rich import console
+from rich import box, print
+from rich.style import Style
+from rich.table import Table
+
+from mlf_core.sync.sync import TemplateSync, render_template_project
+
+log = logging.getLogger(__name__)
+
+# number of projects synced concurrently by default
+DEFAULT_FLEET_WORKERS = 8
+
+
+@dataclass
+class FleetSyncResult:
+    """
+    The result of syncing a single project of a fleet.
+    """
+
+    project_dir: str
+    status: str = "pending"  # one of pending, up to date, skipped, synced, no changes and failed
+    changed_files: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+def load_fleet_manifest(manifest_path: str) -> List[str]:
+    """
+    Load the project directories of a fleet manifest. The manifest is a YAML file of the form::
+
+        projects:
+          - path/to/project
+          - path: path/to/another/project
+
+    Relative paths are resolved relative to the directory of the manifest.
+
+    :param manifest_path: Path to the fleet manifest
+    :return: The absolute paths of all projects in the order of the manifest without duplicates
+    """
+    manifest = load_yaml_file_read_only(manifest_path)
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("projects"), list):
+        print(f"[bold red]The fleet manifest {manifest_path} does not contain a list of projects.")
+        sys.exit(1)
+    manifest_dir = os.path.dirname(os.path.abspath(manifest_path))
+    project_dirs: Dict[str, None] = {}
+    for project in manifest["projects"]:
+        path = project.get("path") if isinstance(project, dict) else project
+        if not isinstance(path, str):
+            print(f"[bold red]Invalid project {project} in the fleet manifest {manifest_path}.")
+            sys.exit(1)
+        project_dirs[os.path.abspath(os.path.join(manifest_dir, os.path.expanduser(path)))] = None
+    return [*project_dirs]
+
+
+class FleetSync:
+    """
+    Sync many local clones of mlf-core projects at once.
+
+    The projects are inspected and synced by a bounded pool of threads sharing a single GitHub client.
+    Every template is rendered only once per distinct .mlf_core.yml content, since its rendered project is only read
+    by the syncs and can thus be shared by all projects with the same template handle, version and context.
+    Rendering changes the working directory, so the templates are rendered in separate processes.
+
+    manifest_path (str): Path to the fleet manifest
+    workers (int): The maximum number of projects inspected, rendered or synced concurrently
+    """
+
+    def __init__(self, manifest_path: str, workers: int = DEFAULT_FLEET_WORKERS, token=None, gh_username=None):
+        self.manifest_path = manifest_path
+        self.workers = max(1, workers)
+        self.gh_username = gh_username if gh_username else load_github_username()
+        self.token = token if token else decrypt_pat()
+        self.github = Github(self.token)
+        self.results: List[FleetSyncResult] = []
+
+    def sync(self) -> None:
+        """
+        Sync all projects of the fleet manifest and print a summary table.
+        Exits with 1 if any project failed to sync.
+        """
+        project_dirs = load_fleet_manifest(self.manifest_path)
+        if not project_dirs:
+            print(f"[bold red]No projects found in the fleet manifest {self.manifest_path}.")
+            sys.exit(1)
+        print(f"[bold blue]Syncing {len(project_dirs)} projects with {self.workers} workers.")
+        self.results = [FleetSyncResult(project_dir) for project_dir in project_dirs]
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            syncers = list(executor.map(self.inspect_project, self.results))
+        pending = [(result, syncer) for result, syncer in zip(self.results, syncers) if syncer]
+
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            renders = self.render_templates([syncer.dot_mlf_core for _, syncer in pending], tmpdirname)
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for result, syncer in pending:
+                    rendered_dir, error = renders[fleet_render_key(syncer.dot_mlf_core)]
+                    if error:
+                        self.fail(result, error)
+                    else:
+                        executor.submit(self.sync_project, result, syncer, rendered_dir)
+
+        self.print_results()
+        if any(result.status == "failed" for result in self.results):
+            sys.exit(1)
+
+    def inspect_project(self, result: FleetSyncResult) -> Optional[TemplateSync]:
+        """
+        Check whether a project needs to be synced and read its template settings.
+
+        :param result: The result of the project, which is updated in place
+        :return: The syncer of the project or None if the project is not synced
+        """
+        if not os.path.isdir(result.project_dir):
+            self.fail(result, "The project directory does not exist")
+            return None
+        start = time.perf_counter()
+        try:
+            syncer = TemplateSync(
+                project_dir=result.project_dir,
+                new_template_version="",
+                gh_username=self.gh_username,
+                token=self.token,
+                github=self.github,
+            )
+            (
+                syncer.major_update,
+                syncer.minor_update,
+                syncer.patch_update,
+                _,
+                syncer.new_template_version,
+            ) = syncer.has_template_version_changed(result.project_dir)
+            if not any((syncer.major_update, syncer.minor_update, syncer.patch_update)):
+                result.status = "up to date"
+                return None
+            if not syncer.should_run_sync():
+                result.status = "skipped"
+                return None
+            syncer.inspect_sync_dir()
+            syncer.blacklisted_globs = syncer.get_blacklisted_sync_globs()
+            return syncer
+        except (Exception, SystemExit) as e:
+            log.debug(f"Inspecting {result.project_dir} failed", exc_info=True)
+            self.fail(result, f"{e!r}" if isinstance(e, Exception) else "Unable to inspect the project")
+            return None
+        finally:
+            result.seconds += time.perf_counter() - start
+
+    def render_templates(
+        self, dot_mlf_cores: List[dict], tmpdirname: str
+    ) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        """
+        Render every distinct template context once.
+
+        :param dot_mlf_cores: The .mlf_core.yml contents of all projects to sync
+        :param tmpdirname: The directory to render the templates into
+        :return: The rendered project directory and the error of every render key (see render_template_quietly)
+        """
+        contexts = {fleet_render_key(dot_mlf_core): dot_mlf_core for dot_mlf_core in dot_mlf_cores}
+        if not contexts:
+            return {}
+        print(f"[bold blue]Rendering {len(contexts)} distinct templates for {len(dot_mlf_cores)} projects.")
+        target_dirs = [os.path.join(tmpdirname, str(number)) for number in range(len(contexts))]
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(contexts))) as executor:
+            return dict(zip(contexts, executor.map(render_template_quietly, contexts.values(), target_dirs)))
+
+    def sync_project(self, result: FleetSyncResult, syncer: TemplateSync, rendered_dir: str) -> None:
+        """
+        Commit the rendered template to the TEMPLATE branch of a project, push it and make a pull request.
+
+        :param result: The result of the project, which is updated in place
+        :param syncer: The syncer of the project
+        :param rendered_dir: The shared rendered template project
+        """
+        start = time.perf_counter()
+        try:
+            result.changed_files = syncer.sync_rendered_template(rendered_dir)
+            result.status = "synced" if syncer.made_changes else "no changes"
+        except (Exception, SystemExit) as e:
+            log.debug(f"Syncing {result.project_dir} failed", exc_info=True)
+            self.fail(result, f"{e!r}" if isinstance(e, Exception) else "Unable to sync the project")
+        finally:
+            result.seconds += time.perf_counter() - start
+
+    @staticmethod
+    def fail(result: FleetSyncResult, error: str) -> None:
+        result.status = "failed"
+        result.error = error
+
+    def print_results(self) -> None:
+        """
+        Print the status, number of changed files and duration of every project.
+        """
+        table = Table(
+            title="[bold]Fleet sync results",
+            title_style="blue",
+            header_style=Style(color="blue", bold=True),
+            box=box.HEAVY_HEAD,
+        )
+        table.add_column("Project", justify="left", style="green", no_wrap=True)
+        table.add_column("Status", justify="left")
+        table.add_column("Changed files", justify="right")
+        table.add_column("Time", justify="right")
+        table.add_column("Error", justify="left")
+        status_styles = {"synced": "green", "failed": "red", "skipped": "yellow"}
+        for result in self.results:
+            style = status_styles.get(result.status, "blue")
+            table.add_row(
+                result.project_dir,
+                f"[{style}]{result.status}",
+                str(result.changed_files),
+                f"{result.seconds:.2f}s",
+                result.error or "",
+            )
+        console.print(table)
+        failed = sum(result.status == "failed" for result in self.results)
+        if failed:
+            print(f"[bold red]{failed} of {len(self.results)} projects failed to sync.")
+        else:
+            print(f"[bold green]Synced {len(self.results)} projects.")
+
+
+def fleet_render_key(dot_mlf_core: dict) -> str:
+    """
+    :param dot_mlf_core: The content of a project's .mlf_core.yml file
+    :return: A key that is equal for all projects whose template renders to the same project
+    """
+    return json.dumps(dot_mlf_core, sort_keys=True, default=str)
+
+
+def render_template_quietly(dot_mlf_core: dict, target_dir: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Render a template project in a worker process without printing its output. Errors are returned instead of raised,
+    since creating a project exits on failures.
+
+    :param dot_mlf_core: The content of the project's .mlf_core.yml file
+    :param target_dir: The directory to render the template into
+    :return: The rendered project directory and None or None and the error
+    """
+    output = io.StringIO()
+    try:
+        with redirect_stdout(output), redirect_stderr(output):
+            return render_template_project(dot_mlf_core, target_dir), None
+    except SystemExit:
+        # the last line printed before exiting explains the failure
+        last_lines = [line.strip() for line in output.getvalue().splitlines() if line.strip()][-1:]
+        return None, f"Creating the template project failed: {''.join(last_lines)}".rstrip(": ")
+    except Exception as e:
+        log.debug(f"Rendering {dot_mlf_core.get('template_handle')} failed", exc_info=True)
+        return None, f"Rendering the template failed: {e!r}"
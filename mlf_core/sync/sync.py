@@ -5,39 +5,76 @@ Synchronise a project TEMPLATE branch with the template.
 import fnmatch
 import logging
 import os
-import shutil
 import sys
 import tempfile
 from configparser import ConfigParser, NoSectionError
-from distutils.dir_util import copy_tree
 from pathlib import Path
-from subprocess import PIPE, Popen
-from typing import Tuple
+from subprocess import PIPE, CalledProcessError, run
+from typing import Dict, List, Optional, Tuple
 
 import git
 from github import Github, GithubException
-from mlf_core.common.load_yaml import load_yaml_file
-from mlf_core.common.version import load_mlf_core_template_version, load_project_template_version_and_handle
+from mlf_core.common.load_yaml import load_yaml_file_read_only
+from mlf_core.common.template_registry import AVAILABLE_TEMPLATES_PATH, load_template_registry
 from mlf_core.create.github_support import create_sync_secret, decrypt_pat, load_github_username
 from mlf_core.custom_cli.questionary import mlf_core_questionary_or_dot_mlf_core
 from packaging import version
 from rich import print
+from ruamel.yaml import YAML
 
 from mlf_core.config.config import ConfigCommand
 from mlf_core.create.create import choose_domain
 
 log = logging.getLogger(__name__)
 
+# the branches, whose project settings are synced with the template, in order of preference
+PROJECT_BRANCHES = ["development", "master"]
+
+
+def git_file_mode(file_path: str) -> int:
+    """
+    Get the mode of a file like git stores it in a tree.
+
+    :param file_path: Path to the file
+    :return: The git file mode
+    """
+    if os.path.islink(file_path):
+        return 0o120000
+    return 0o100755 if os.stat(file_path).st_mode & 0o111 else 0o100644
+
+
+def render_template_project(dot_mlf_core: dict, tmpdirname: str) -> str:
+    """
+    Render a fresh template project from the content of a .mlf_core.yml file into a temporary directory.
+    Since the working directory is changed during rendering, projects must not be rendered concurrently by threads of the same process.
+
+    :param dot_mlf_core: The content of the project's .mlf_core.yml file
+    :param tmpdirname: The temporary directory
+    :return: The directory of the rendered template project
+    """
+    os.makedirs(tmpdirname, exist_ok=True)
+    # dry create run from mlf-core in tmp directory
+    old_cwd = str(Path.cwd())
+    log.debug(f"Saving current working directory {old_cwd}.")
+    os.chdir(tmpdirname)
+    log.debug(f"Changed directory to {tmpdirname}.")
+    log.debug(f"Calling choose_domain with {dot_mlf_core}.")
+    try:
+        choose_domain(path=Path.cwd(), domain=None, dot_mlf_core=dot_mlf_core)
+    finally:
+        log.debug(f"Changing directory back to {old_cwd}.")
+        os.chdir(old_cwd)
+    return os.path.join(tmpdirname, dot_mlf_core["project_slug"])
+
 
 class TemplateSync:
     """
     Hold syncing information and results.
 
+    The TEMPLATE branch is updated using git plumbing commands only, so the working tree and the checked out branch are never changed.
+
     project_dir (str): The path to the mlf-core project root directory
-    from_branch (str): Original branch
-    project_dir (str): Path to target project directory
-    from_branch (str): Original branch
-    original_branch (str): Repo branch that was checked out before we started.
+    from_branch (str): The branch whose .mlf_core.yml and mlf_core.cfg files are used (development or master by default)
     made_changes (bool): Whether making the new template project introduced any changes
     gh_username (str): GitHub username
     patch_update (bool): Whether a patch update was found for the template or not
@@ -56,10 +93,10 @@ class TemplateSync:
         major_update=False,
         minor_update=False,
         patch_update=False,
+        github=None,
     ):
         self.project_dir = os.path.abspath(project_dir)
         self.from_branch = from_branch
-        self.original_branch = None
         self.made_changes = False
         self.gh_pr_returned_data = {}
         self.major_update = major_update
@@ -70,7 +107,8 @@ class TemplateSync:
         self.dot_mlf_core = {}
         self.repo_owner = self.gh_username
         self.new_template_version = new_template_version
-        self.github = Github(self.token)
+        # the GitHub client may be shared, for example by all projects of a fleet sync
+        self.github = github if github else Github(self.token)
         self.blacklisted_globs = []
 
     def sync(self):
@@ -78,12 +116,22 @@ class TemplateSync:
         Sync the mlf-core project
         """
         self.inspect_sync_dir()
-        # get blacklisted files on current working branch
+        # get blacklisted files of the project branch
         self.blacklisted_globs = self.get_blacklisted_sync_globs()
-        self.checkout_template_branch()
-        self.delete_template_branch_files()
-        self.make_template_project()
-        self.commit_template_changes()
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            self.sync_rendered_template(self.make_template_project(tmpdirname))
+
+    def sync_rendered_template(self, rendered_dir: str) -> int:
+        """
+        Commit the changes of a rendered template project to the TEMPLATE branch, push it and make a pull request.
+        The rendered template project is only read, so it can be shared by several projects with the same template and context.
+
+        :param rendered_dir: The directory of the rendered template project
+        :return: The number of written and deleted files
+        """
+        template_commit = self.template_branch_commit()
+        files_to_write, files_to_delete = self.diff_template_project(rendered_dir, template_commit)
+        self.commit_template_changes(rendered_dir, files_to_write, files_to_delete, template_commit)
 
         # Push and make a pull request
         if self.made_changes:
@@ -91,189 +139,239 @@ class TemplateSync:
                 self.push_template_branch()
                 self.make_pull_request()
             except Exception as e:
-                self.reset_target_dir()
                 print(f"[bold red]{e}")
                 sys.exit(1)
-
-        self.reset_target_dir()
-
-        if not self.made_changes:
+        else:
             print("[bold blue]No changes made to TEMPLATE - sync complete")
+        return len(files_to_write) + len(files_to_delete)
 
     def inspect_sync_dir(self):
         """
-        Examines target directory to sync, verifies that it is a git repository and ensures that there are no uncommitted changes.
+        Examines target directory to sync and verifies that it is a git repository with a .mlf_core.yml file on the project branch.
+        Uncommitted changes do not matter, since the working tree is never changed.
         """
-        if not os.path.exists(os.path.join(str(self.project_dir), ".mlf_core.yml")):
-            print(f"[bold red]{self.project_dir} does not appear to contain a .mlf_core.yml file. Did you delete it?")
-            sys.exit(1)
-        # store .mlf_core.yml content for later reuse in the dry create run
-        self.dot_mlf_core = load_yaml_file(os.path.join(str(self.project_dir), ".mlf_core.yml"))
-        log.debug(f"Loaded .mlf_core.yml file content. Content is: {self.dot_mlf_core}")
         # Check that the project_dir is a git repo
         try:
             self.repo = git.Repo(self.project_dir)
         except git.exc.InvalidGitRepositoryError:
             print(f"[bold red]{self.project_dir} does not appear to be a git repository.")
             sys.exit(1)
+        if not self.from_branch:
+            self.from_branch = self.project_branch(self.repo)
+        print(f"[bold blue]Project repository branch is {self.from_branch}")
 
-        # get current branch so we can switch back later
-        self.original_branch = self.repo.active_branch.name
-        print(f"[bold blue]Original Project repository branch is {self.original_branch}")
-
-        # Check to see if there are uncommitted changes on current branch
-        if self.repo.is_dirty(untracked_files=True):
-            print(
-                "[bold red]Uncommitted changes found in Project directory!\nPlease commit these before running mlf-core sync"
-            )
+        # store .mlf_core.yml content for later reuse in the dry create run
+        try:
+            self.dot_mlf_core = YAML(typ="safe").load(self.repo.git.show(f"{self.from_branch}:.mlf_core.yml"))
+        except git.exc.GitCommandError:
+            print(f"[bold red]{self.project_dir} does not appear to contain a .mlf_core.yml file. Did you delete it?")
             sys.exit(1)
+        log.debug(f"Loaded .mlf_core.yml file content. Content is: {self.dot_mlf_core}")
 
-    def checkout_template_branch(self):
+    def template_branch_commit(self) -> git.Commit:
         """
-        Try to check out the origin/TEMPLATE in a new TEMPLATE branch.
-        If this fails, try to check out an existing local TEMPLATE branch.
+        Get the latest commit of the TEMPLATE branch. If there is no local TEMPLATE branch yet, it is created from origin/TEMPLATE
+        without checking it out.
+
+        :return: The latest commit of the TEMPLATE branch
         """
+        if "TEMPLATE" in self.repo.heads:
+            return self.repo.heads["TEMPLATE"].commit
         try:
-            self.from_branch = self.repo.active_branch.name
-        except git.exc.GitCommandError as e:
-            print(f"[bold red]Could not find active repo branch:\n{e}")
-        # Try to check out the `TEMPLATE` branch
-        try:
-            self.repo.git.checkout("origin/TEMPLATE", b="TEMPLATE")
-        except git.exc.GitCommandError:
-            # Try to check out an existing local branch called TEMPLATE
-            try:
-                self.repo.git.checkout("TEMPLATE")
-            except git.exc.GitCommandError:
-                print('[bold red]Could not check out branch "origin/TEMPLATE" or "TEMPLATE"')
-                sys.exit(1)
+            template_commit = self.repo.commit("origin/TEMPLATE")
+        except (git.exc.BadName, ValueError):
+            print('[bold red]Could not find branch "origin/TEMPLATE" or "TEMPLATE"')
+            sys.exit(1)
+        self.repo.create_head("TEMPLATE", template_commit)
+        return template_commit
 
-    def delete_template_branch_files(self):
+    def make_template_project(self, tmpdirname: str) -> str:
         """
-        Delete all files in the TEMPLATE branch
+        Render a fresh template project into a temporary directory.
+
+        :param tmpdirname: The temporary directory
+        :return: The directory of the rendered template project
         """
-        # Delete everything
-        print("[bold blue]Deleting all files in TEMPLATE branch")
-        for the_file in os.listdir(self.project_dir):
-            if the_file == ".git":
-                log.debug("Found .git directory. Skipping deleting it.")
-                continue
-            file_path = os.path.join(self.project_dir, the_file)
-            try:
-                if os.path.isfile(file_path):
-                    log.debug(f"Deleting file {file_path}")
-                    os.unlink(file_path)
-                elif os.path.isdir(file_path):
-                    log.debug(f"Deleting directory {file_path}")
-                    shutil.rmtree(file_path)
-            except Exception as e:
-                print(f"[bold red]{e}")
-                sys.exit(1)
+        print("[bold blue]Creating a new template project.")
+        return render_template_project(self.dot_mlf_core, tmpdirname)
 
-    def make_template_project(self):
+    def diff_template_project(self, rendered_dir: str, template_commit: git.Commit) -> Tuple[List[str], List[str]]:
         """
-        Delete all files and make a fresh template.
+        Compare the rendered template project with the tree of the TEMPLATE branch by the git blob hashes of their files,
+        so that the content of the files in the TEMPLATE branch does not need to be read.
+        Like git add -A, files ignored by the project are skipped and the blobs are hashed with the clean filters and
+        end-of-line conversions of the project applied.
+        Files matching a blacklisted glob are neither written nor deleted.
+
+        :param rendered_dir: The directory of the rendered template project
+        :param template_commit: The latest commit of the TEMPLATE branch
+        :return: The relative paths of all files, which were added or modified, and of all files, which were deleted
         """
-        print("[bold blue]Creating a new template project.")
-        # dry create run from mlf-core in tmp directory
-        with tempfile.TemporaryDirectory() as tmpdirname:
-            old_cwd = str(Path.cwd())
-            log.debug(f"Saving current working directory {old_cwd}.")
-            os.chdir(tmpdirname)
-            log.debug(f"Changed directory to {tmpdirname}.")
-            log.debug(f"Calling choose_domain with {self.dot_mlf_core}.")
-            choose_domain(path=Path.cwd(), domain=None, dot_mlf_core=self.dot_mlf_core)
-            # copy into the cleaned TEMPLATE branch's project directory
-            log.debug(f"Copying created template into {self.project_dir}.")
-            copy_tree(os.path.join(tmpdirname, self.dot_mlf_core["project_slug"]), str(self.project_dir))
-            log.debug(f"Changing directory back to {old_cwd}.")
-            os.chdir(old_cwd)
-
-    def commit_template_changes(self):
-        """
-        If we have any changes with the new template files, make a git commit
+        template_tree = {
+            item.path: (item.hexsha, item.mode)
+            for item in template_commit.tree.traverse()
+            if item.type == "blob"  # type: ignore
+        }
+        try:
+            paths = self.list_rendered_files(rendered_dir, template_commit)
+            blobs = self.hash_objects(rendered_dir, paths, write=False)
+        except CalledProcessError as e:
+            print(f"[bold red]Could not compare the template with the TEMPLATE branch:\n{e.stderr}")
+            sys.exit(1)
+        rendered_files = {
+            path: (blob, git_file_mode(os.path.join(rendered_dir, path))) for path, blob in zip(paths, blobs)
+        }
+
+        def is_blacklisted(path: str) -> bool:
+            return any(fnmatch.fnmatch(path, pattern) for pattern in self.blacklisted_globs)
+
+        files_to_write = sorted(
+            path
+            for path, hash_and_mode in rendered_files.items()
+            if template_tree.get(path) != hash_and_mode and not is_blacklisted(path)
+        )
+        files_to_delete = sorted(
+            path for path in template_tree if path not in rendered_files and not is_blacklisted(path)
+        )
+        log.debug(f"{len(files_to_write)} files to write and {len(files_to_delete)} files to delete.")
+        return files_to_write, files_to_delete
+
+    def list_rendered_files(self, rendered_dir: str, template_commit: git.Commit) -> List[str]:
+        """
+        List the files of the rendered template project, which git add -A would add on top of the TEMPLATE branch.
+        Untracked files ignored by a .gitignore file of the rendered project or by the exclude files of the project
+        (for example __pycache__ directories copied from the installed templates) are skipped.
+
+        :param rendered_dir: The directory of the rendered template project
+        :param template_commit: The latest commit of the TEMPLATE branch
+        :return: The sorted relative paths of the files
+        """
+        with tempfile.TemporaryDirectory() as index_dir:
+            index_env = {"GIT_INDEX_FILE": os.path.join(index_dir, "index")}
+            self.run_git("read-tree", template_commit.hexsha, env=index_env)
+            listed = self.run_git(
+                "ls-files", "-z", "--cached", "--others", "--exclude-standard", env=index_env, work_tree=rendered_dir
+            )
+        # files of the TEMPLATE branch are listed even if the rendered project does not contain them anymore
+        return sorted(
+            path for path in set(listed.split("\0")) if path and os.path.lexists(os.path.join(rendered_dir, path))
+        )
+
+    def commit_template_changes(
+        self, rendered_dir: str, files_to_write: List[str], files_to_delete: List[str], template_commit: git.Commit
+    ) -> bool:
+        """
+        If we have any changes with the new template files, commit them to the TEMPLATE branch.
+        The new tree is built in a temporary index from the tree of the TEMPLATE branch, so only the changed files are hashed
+        and neither the index nor the working tree of the project are touched.
+
+        :param rendered_dir: The directory of the rendered template project
+        :param files_to_write: The relative paths of all added or modified files
+        :param files_to_delete: The relative paths of all deleted files
+        :param template_commit: The latest commit of the TEMPLATE branch, which is the parent of the new commit
+        :return: Whether a new commit was created
         """
         # Check that we have something to commit
-        if not self.repo.is_dirty(untracked_files=True):
+        if not files_to_write and not files_to_delete:
             print("[bold blue]Template contains no changes - no new commit created")
             return False
-        # Commit changes
+        nl = "\n"
+        log.debug(f"Files to commit are:{nl}{nl.join(files_to_write)}")
+        log.debug(f"Files to delete are:{nl}{nl.join(files_to_delete)}")
+        print(
+            f"[bold blue]Committing {len(files_to_write)} changed and {len(files_to_delete)} deleted files to TEMPLATE branch."
+        )
         try:
-            # git add only non-blacklisted files
-            print("[bold blue]Staging template.")
-            # add all files to stage
-            self.repo.git.add(A=True)
-            # get all changed/modified files during the sync (including blacklisted ones)
-            changed_files = [item.a_path for item in self.repo.index.diff("HEAD")]
-            blacklisted_changed_files = set()
-            for pattern in self.blacklisted_globs:
-                # keep track of all staged files matching a glob from the mlf_core.cfg file
-                # those files will be excluded from syncing but will still be available in every new created projects
-                blacklisted_changed_files |= {file for file in fnmatch.filter(changed_files, pattern)}
-            nl = "\n"
-            log.debug(
-                f"Blacklisted (unsynced) files are:{nl}{nl.join(file for file in blacklisted_changed_files)}"
-                if blacklisted_changed_files
-                else "No blacklisted files for syncing found."
-            )
-            # each blacklisted file must be first unstaged and then get its changes discarded, so it will not be marked as modified by git
-            for blacklisted_file in blacklisted_changed_files:
-                log.debug(f"Unstaging {blacklisted_file}")
-                Popen(["git", "reset", blacklisted_file], stdout=PIPE, stderr=PIPE, universal_newlines=True)
-                log.debug(f"Discarding changes in working directory of file {blacklisted_file}")
-                Popen(["git", "checkout", "--", blacklisted_file], stdout=PIPE, stderr=PIPE, universal_newlines=True)
-
-            files_to_commit = [file for file in changed_files if file not in blacklisted_changed_files]
-            log.debug(
-                f"Files to commit are:{nl}{nl.join(file for file in files_to_commit)}"
-                if files_to_commit
-                else "No files to commit found."
-            )
-            if files_to_commit:
-                print("[bold blue]Committing changes of non blacklisted files.")
-                Popen(
-                    ["git", "commit", "-m", "mlf-core sync", *files_to_commit],
-                    stdout=PIPE,
-                    stderr=PIPE,
-                    universal_newlines=True,
-                )
-                print("[bold blue]Stashing and saving TEMPLATE branch changes!")
-                Popen(["git", "stash"], stdout=PIPE, stderr=PIPE, universal_newlines=True)
-                self.made_changes = True
-                print("[bold blue]Committed changes to TEMPLATE branch")
-
-            # if a file was added to the template, but is blacklisted, it remains untracked; so it should be removed
-            for untracked_file in self.repo.untracked_files:
-                log.debug(f"Removing untracked file {untracked_file}")
-                Path(untracked_file).unlink()
-        except Exception as e:
-            print(f"[bold red]Could not commit changes to TEMPLATE:\n{e}")
+            with tempfile.TemporaryDirectory() as index_dir:
+                index_env = {"GIT_INDEX_FILE": os.path.join(index_dir, "index")}
+                self.run_git("read-tree", template_commit.hexsha, env=index_env)
+                # an entry with mode 0 removes the path from the index
+                index_info = [f"0 {'0' * 40}\t{path}" for path in files_to_delete]
+                for path, blob in zip(files_to_write, self.hash_objects(rendered_dir, files_to_write)):
+                    index_info.append(f"{git_file_mode(os.path.join(rendered_dir, path)):o} {blob}\t{path}")
+                self.run_git("update-index", "-z", "--index-info", env=index_env, stdin="\0".join(index_info) + "\0")
+                tree = self.run_git("write-tree", env=index_env)
+            commit = self.run_git("commit-tree", tree, "-p", template_commit.hexsha, "-m", "mlf-core sync")
+            # only move the branch if nobody else updated it in the meantime
+            self.run_git("update-ref", "refs/heads/TEMPLATE", commit, template_commit.hexsha)
+        except CalledProcessError as e:
+            print(f"[bold red]Could not commit changes to TEMPLATE:\n{e.stderr}")
             sys.exit(1)
+        self.made_changes = True
+        print("[bold blue]Committed changes to TEMPLATE branch")
         return True
 
+    def hash_objects(self, rendered_dir: str, paths: List[str], write: bool = True) -> List[str]:
+        """
+        Hash the rendered files like git add would and optionally store them as blobs in the object database of the project.
+        Regular files are hashed by a single git process, which applies the clean filters and end-of-line conversions of
+        the attributes and the configuration of the project (for example core.autocrlf or Git LFS) to every path.
+        Symbolic links are stored as blobs of their targets like git does.
+
+        :param rendered_dir: The directory of the rendered template project
+        :param paths: The relative paths of the files
+        :param write: Whether to store the blobs in the object database
+        :return: The hashes of the blobs in the order of the paths
+        """
+        write_args = ["-w"] if write else []
+        regular_files = [path for path in paths if not os.path.islink(os.path.join(rendered_dir, path))]
+        blobs = {}
+        if regular_files:
+            hashes = self.run_git(
+                "hash-object", *write_args, "--stdin-paths", stdin="\n".join(regular_files), work_tree=rendered_dir
+            )
+            blobs = dict(zip(regular_files, hashes.split()))
+        for path in paths:
+            if path not in blobs:
+                target = os.readlink(os.path.join(rendered_dir, path))
+                blobs[path] = self.run_git("hash-object", *write_args, "--stdin", stdin=target)
+        return [blobs[path] for path in paths]
+
+    def run_git(
+        self, *args: str, env: Optional[Dict[str, str]] = None, stdin: str = "", work_tree: Optional[str] = None
+    ) -> str:
+        """
+        Run a git command in the project directory and wait for it to finish.
+
+        :param args: The arguments of the git command
+        :param env: Additional environment variables
+        :param stdin: The input of the command
+        :param work_tree: A directory, which the command uses as the working tree of the project instead of the project directory
+        :return: The output of the command without trailing whitespace
+        :raises CalledProcessError: If the command failed
+        """
+        git_args = ["--git-dir", self.repo.git_dir, "--work-tree", work_tree] if work_tree else []
+        result = run(
+            ["git", *git_args, *args],
+            cwd=work_tree or self.project_dir,
+            env={**os.environ, **(env or {})},
+            input=stdin,
+            stdout=PIPE,
+            stderr=PIPE,
+            universal_newlines=True,
+            check=True,
+        )
+        return result.stdout.rstrip()
+
     def push_template_branch(self):
         """
         If there are any changes to the template, push the TEMPLATE branch to the default remote
         and push to the actual sync temporary branch, where a PR is actually created from to development branch.
+        Both branches are pushed without checking them out.
         """
         print(f"[bold blue]Pushing TEMPLATE branch to remote: {os.path.basename(self.project_dir)}")
+        sync_branch = f"mlf_core_sync_v{self.new_template_version}"
         try:
-            log.debug("Getting origin as remote.")
-            origin = self.repo.remote("origin")
-            log.debug("Setting TEMPLATE branch as upstream tracking branch.")
-            self.repo.head.ref.set_tracking_branch(origin.refs.TEMPLATE)
-            log.debug("Pushing to upstream branch TEMPLATE.")
-            self.repo.git.push(force=True)
-            print(f"[bold blue]Checking out to new branch mlf_core_sync_v{self.new_template_version}")
-            log.debug(f"git checkout -b mlf_core_sync_v{self.new_template_version}")
-            self.repo.git.checkout("-b", f"mlf_core_sync_v{self.new_template_version}")
-            log.debug(f"git push origin mlf_core_sync_v{self.new_template_version}")
-            print(f"[bold blue]Pushing to remote branch mlf_core_sync_v{self.new_template_version}")
-            self.repo.remotes.origin.push(
-                refspec=f"mlf_core_sync_v{self.new_template_version}:mlf_core_sync_v{self.new_template_version}"
-            )
+            log.debug("Pushing to upstream branch TEMPLATE and setting it as upstream tracking branch.")
+            self.repo.git.push("--force", "--set-upstream", "origin", "TEMPLATE")
+            print(f"[bold blue]Creating new branch {sync_branch}")
+            log.debug(f"git branch {sync_branch} TEMPLATE")
+            self.repo.git.branch(sync_branch, "TEMPLATE")
+            log.debug(f"git push origin {sync_branch}")
+            print(f"[bold blue]Pushing to remote branch {sync_branch}")
+            self.repo.remotes.origin.push(refspec=f"{sync_branch}:{sync_branch}")
         except git.exc.GitCommandError as e:
-            print(f"Could not push TEMPLATE or mlf_core_sync_v{self.new_template_version} branch:\n{e}")
+            print(f"Could not push TEMPLATE or {sync_branch} branch:\n{e}")
             sys.exit(1)
 
     def make_pull_request(self):
@@ -353,8 +451,7 @@ class TemplateSync:
         """
         log.debug(f"Checking sync level constraints using parsed results from {self.project_dir}/mlf_core.cfg")
         try:
-            parser = ConfigParser()
-            parser.read(f"{self.project_dir}/mlf_core.cfg")
+            parser = self.read_project_config()
             sync_enabled = parser.items("sync")
             # sync is enabled
             if sync_enabled[0][1].lower() in {"yes", "y", "true"}:
@@ -407,8 +504,7 @@ class TemplateSync:
         :return: A list of all blacklisted globs for sync (file (types) that should not be included into the sync pull request)
         """
         try:
-            parser = ConfigParser()
-            parser.read(f"{self.project_dir}/mlf_core.cfg")
+            parser = self.read_project_config()
             globs = list(parser.items("sync_files_blacklisted"))
             nl = "\n"
             log.debug(f"Returning all blacklisted files globs parsed from {self.project_dir}/mlf_core.cfg.")
@@ -423,16 +519,38 @@ class TemplateSync:
             )
             sys.exit(1)
 
-    def reset_target_dir(self):
+    def read_project_config(self) -> ConfigParser:
         """
-        Reset the target project directory. Check out the original branch.
+        Read the mlf_core.cfg file of the project branch.
+
+        :return: The parsed mlf_core.cfg file, which is empty if the file does not exist
         """
-        print(f"[bold blue]Checking out original branch: {self.original_branch}")
+        parser = ConfigParser()
+        repo = git.Repo(self.project_dir)
         try:
-            self.repo.git.checkout(self.original_branch)
-        except git.exc.GitCommandError as e:
-            print(f"[bold red]Could not reset to original branch {self.from_branch}:\n{e}")
-            sys.exit(1)
+            parser.read_string(repo.git.show(f"{self.from_branch or self.project_branch(repo)}:mlf_core.cfg"))
+        except git.exc.GitCommandError:
+            log.debug(f"No mlf_core.cfg file found in {self.project_dir}.")
+        return parser
+
+    @staticmethod
+    def project_branch(repo: git.Repo) -> str:
+        """
+        Get the branch the project is compared with the template on. This is the development branch, since it is the most up to date (usually).
+        If a development branch does not exist it is the master branch.
+
+        :param repo: The project's repository
+        :return: The name of the (local or remote) branch
+        """
+        remote_branches = {ref.name for ref in repo.remotes.origin.refs} if "origin" in repo.remotes else set()
+        for branch in PROJECT_BRANCHES:
+            if branch in repo.heads:
+                return branch
+            # like git checkout, fall back to the remote branch if there is no local branch yet
+            if f"origin/{branch}" in remote_branches:
+                return f"origin/{branch}"
+        print(f"[bold red]Could not find any of the branches {', '.join(PROJECT_BRANCHES)}.")
+        sys.exit(1)
 
     @staticmethod
     def update_sync_token(project_name: str, gh_username: str = "") -> None:
@@ -443,7 +561,9 @@ class TemplateSync:
         :param gh_username The Github username (only gets passed, if the repo is an orga repo)
         """
         gh_username = (
-            load_yaml_file(ConfigCommand.CONF_FILE_PATH)["github_username"] if not gh_username else gh_username
+            load_yaml_file_read_only(ConfigCommand.CONF_FILE_PATH)["github_username"]
+            if not gh_username
+            else gh_username
         )
         # get the personal access token for user authentification
         log.debug("Asking for updated sync token value.")
@@ -464,19 +584,6 @@ class TemplateSync:
         Return is_patch_update True if its a micro update (for example 1.2.3 to 1.2.4).
         mlf-core will use this to decide which syncing strategy to apply. Also return both versions.
         """
-        # Try to compare against the development branch, since it is the most up to date (usually).
-        # If a development branch does not exist compare against master.
-        repo = git.Repo(project_dir)
-        try:
-            repo.git.checkout("development")
-        except git.exc.GitCommandError:  # type: ignore[misc]
-            print("[bold red]Could not checkout development branch. Trying to checkout master...")
-            try:
-                repo.git.checkout("master")
-            except git.exc.GitCommandError as e:  # type: ignore[misc]
-                print(f"[bold red]Could not checkout master branch.\n{e}")
-                sys.exit(1)
-
         log.debug("Loading the project's template version and the mlf-core template version.")
         template_version_last_sync, template_handle = TemplateSync.sync_load_project_template_version_and_handle(
             project_dir
@@ -513,18 +620,25 @@ class TemplateSync:
         :param handle: The template handle
         :return: The actual version number of the template in mlf-core
         """
-        top_path = f"{os.path.dirname(__file__)}/.."
-        available_templates_path = f"{str(top_path)}/create/templates/available_templates.yml"
         log.debug(
-            f"Using available templates file from {available_templates_path} to load current mlf-core template version."
+            f"Using available templates file from {AVAILABLE_TEMPLATES_PATH} to load current mlf-core template version."
         )
-        return load_mlf_core_template_version(handle, available_templates_path)
+        return load_template_registry().version(handle)
 
     @staticmethod
     def sync_load_project_template_version_and_handle(project_dir: Path) -> Tuple[str, str]:
         """
         Return the project template version since last sync for user (if no sync happened, return initial create version of the template)
+        The version is read from the project branch (development or master) without checking it out.
 
         :param project_dir: Top level path to users project directory
         """
-        return load_project_template_version_and_handle(project_dir)
+        repo = git.Repo(project_dir)
+        branch = TemplateSync.project_branch(repo)
+        try:
+            dot_mlf_core = YAML(typ="safe").load(repo.git.show(f"{branch}:.mlf_core.yml"))
+        except git.exc.GitCommandError:
+            print(f"[bold red]No .mlf_core.yml found on branch {branch} at {project_dir}. Is this a mlf-core project?")
+            sys.exit(1)
+        # split the template version at first space to omit the mlf-core bump-version tag and return it and the the handle
+        return dot_mlf_core["template_version"].split(" ", 1)[0], dot_mlf_core["template_handle"]
@@ -1,15 +1,35 @@
 import json
+import logging
+import os
 import sys
-import urllib
+import tempfile
+import threading
+import time
+import urllib.request
 from subprocess import PIPE, Popen, check_call
+from typing import Optional
 from urllib.error import HTTPError, URLError
 
-from mlf_core.custom_cli.questionary import mlf_core_questionary_or_dot_mlf_core
+import appdirs
 from pkg_resources import parse_version
 from rich import print
 
 import mlf_core
 
+log = logging.getLogger(__name__)
+
+PYPI_MLF_CORE_URL = "https://pypi.org/pypi/mlf-core/json"
+# timeout in seconds of the request for the latest mlf-core version
+UPGRADE_CHECK_TIMEOUT = 1
+# the latest mlf-core version on PyPI is cached next to mlf-core's configuration file
+UPGRADE_CHECK_CACHE_PATH = f'{appdirs.user_config_dir(appname="mlf_core")}/upgrade_check.json'
+# time in seconds for which the cached latest version is used before PyPI is queried again
+UPGRADE_CHECK_INTERVAL = 24 * 60 * 60
+# overrides the interval of the upgrade check in seconds
+UPGRADE_CHECK_INTERVAL_ENV_VAR = "MLF_CORE_UPGRADE_CHECK_INTERVAL"
+# set to any non empty value to skip the upgrade check on every invocation, e.g. in CI
+SKIP_UPGRADE_CHECK_ENV_VAR = "MLF_CORE_SKIP_UPGRADE_CHECK"
+
 
 class UpgradeCommand:
     """
@@ -22,6 +42,8 @@ class UpgradeCommand:
         Checks whether the locally installed version of mlf-core is the latest.
         If not it prompts whether to upgrade and runs the upgrade command if desired.
         """
+        from mlf_core.custom_cli.questionary import mlf_core_questionary_or_dot_mlf_core
+
         if not UpgradeCommand.check_mlf_core_latest():
             if mlf_core_questionary_or_dot_mlf_core(
                 function="confirm", question="Do you want to upgrade?", default="y"
@@ -35,27 +57,102 @@ class UpgradeCommand:
 
         :return: True if locally version is the latest or PyPI is inaccessible, false otherwise
         """
-        latest_local_version = mlf_core.__version__
-        sliced_local_version = (
-            latest_local_version[:-9] if latest_local_version.endswith("-SNAPSHOT") else latest_local_version
-        )
+        return cls.compare_with_latest_version(cls.fetch_latest_version())
+
+    @classmethod
+    def fetch_latest_version(cls, use_cache: bool = False) -> Optional[str]:
+        """
+        Retrieves the latest version of mlf-core available on PyPI and caches it on disk.
+
+        :param use_cache: Whether to return the cached version if it is younger than the upgrade check interval
+        :return: The latest version or None if PyPI is inaccessible
+        """
+        if use_cache:
+            cached_version = cls.load_cached_latest_version()
+            if cached_version is not None:
+                return cached_version
         try:
             # Retrieve info on latest version
             # Adding nosec (bandit) here, since we have a hardcoded https request
             # It is impossible to access file:// or ftp://
             # See: https://stackoverflow.com/questions/48779202/audit-url-open-for-permitted-schemes-allowing-use-of-file-or-custom-schemes
-            req = urllib.request.Request("https://pypi.org/pypi/mlf-core/json")  # nosec
-            with urllib.request.urlopen(req, timeout=1) as response:  # nosec
+            req = urllib.request.Request(PYPI_MLF_CORE_URL)  # nosec
+            with urllib.request.urlopen(req, timeout=UPGRADE_CHECK_TIMEOUT) as response:  # nosec
                 contents = response.read()
                 data = json.loads(contents)
                 latest_pypi_version = data["info"]["version"]
-        except (HTTPError, TimeoutError, URLError):
+        except (HTTPError, TimeoutError, URLError, OSError, ValueError, KeyError) as e:
+            log.debug(f"Unable to retrieve the latest mlf-core version: {e}")
+            return None
+
+        cls.cache_latest_version(latest_pypi_version)
+        return latest_pypi_version
+
+    @classmethod
+    def load_cached_latest_version(cls) -> Optional[str]:
+        """
+        :return: The cached latest version of mlf-core or None if it is missing or older than the upgrade check interval
+        """
+        try:
+            with open(UPGRADE_CHECK_CACHE_PATH) as cache_file:
+                cache = json.load(cache_file)
+            if time.time() - cache["checked_at"] < cls.upgrade_check_interval():
+                return cache["latest_version"]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            log.debug(f"Ignoring unreadable upgrade check cache at {UPGRADE_CHECK_CACHE_PATH}: {e}")
+        return None
+
+    @classmethod
+    def cache_latest_version(cls, latest_version: str) -> None:
+        """
+        Write the latest version of mlf-core to the cache. The file is replaced atomically.
+
+        :param latest_version: The latest version available on PyPI
+        """
+        cache_dir = os.path.dirname(UPGRADE_CHECK_CACHE_PATH)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as tmp_file:
+                json.dump({"latest_version": latest_version, "checked_at": time.time()}, tmp_file)
+            os.replace(tmp_path, UPGRADE_CHECK_CACHE_PATH)
+        except OSError as e:
+            log.debug(f"Unable to write upgrade check cache to {UPGRADE_CHECK_CACHE_PATH}: {e}")
+
+    @staticmethod
+    def upgrade_check_interval() -> float:
+        """
+        :return: The interval of the upgrade check in seconds, which may be overridden by MLF_CORE_UPGRADE_CHECK_INTERVAL
+        """
+        interval = os.environ.get(UPGRADE_CHECK_INTERVAL_ENV_VAR)
+        if interval:
+            try:
+                return float(interval)
+            except ValueError:
+                log.debug(f"Ignoring invalid upgrade check interval {interval}")
+        return UPGRADE_CHECK_INTERVAL
+
+    @staticmethod
+    def compare_with_latest_version(latest_pypi_version: Optional[str]) -> bool:
+        """
+        Compares the locally installed version of mlf-core with the latest version available on PyPI and reports the result.
+
+        :param latest_pypi_version: The latest version available on PyPI or None if PyPI is inaccessible
+        :return: True if locally version is the latest or PyPI is inaccessible, false otherwise
+        """
+        if latest_pypi_version is None:
             print(
                 "[bold red]Unable to contact PyPI to check for the latest mlf-core version. Do you have an internet connection?"
             )
             # Returning true by default, since this is not a serious issue
             return True
 
+        latest_local_version = mlf_core.__version__
+        sliced_local_version = (
+            latest_local_version[:-9] if latest_local_version.endswith("-SNAPSHOT") else latest_local_version
+        )
         if parse_version(sliced_local_version) > parse_version(latest_pypi_version):
             print(
                 f"[bold yellow]Installed version {latest_local_version} of mlf-core is newer than the latest release {latest_pypi_version}!"
@@ -99,3 +196,40 @@ class UpgradeCommand:
             return False
 
         return True
+
+
+class BackgroundUpgradeCheck:
+    """
+    Checks for a newer version of mlf-core in a background thread, so that the check does not delay the invoked command.
+    The result is reported after the command finished.
+    """
+
+    def __init__(self):
+        self.latest_pypi_version: Optional[str] = None
+        self._thread = threading.Thread(target=self._run, name="mlf-core-upgrade-check", daemon=True)
+
+    @staticmethod
+    def is_enabled() -> bool:
+        """
+        :return: False if the upgrade check is disabled by setting MLF_CORE_SKIP_UPGRADE_CHECK
+        """
+        return not os.environ.get(SKIP_UPGRADE_CHECK_ENV_VAR)
+
+    def start(self) -> "BackgroundUpgradeCheck":
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        self.latest_pypi_version = UpgradeCommand.fetch_latest_version(use_cache=True)
+
+    def report(self) -> None:
+        """
+        Report whether a newer version is available. Waits at most for the remaining time of the PyPI request,
+        which only happens if the command finished before PyPI answered.
+        """
+        self._thread.join(UPGRADE_CHECK_TIMEOUT)
+        if self._thread.is_alive():
+            log.debug("Upgrade check did not finish in time.")
+            return
+        if not UpgradeCommand.compare_with_latest_version(self.latest_pypi_version):
+            print("[bold blue]Run [green]mlf-core upgrade [blue]to get the latest version.")
@@ -1,6 +1,8 @@
 import os
+import shutil
+import tempfile
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 
 def delete_dir_tree(directory: Path) -> None:
@@ -48,3 +50,25 @@ def find_filepath_in_dir(file_name: str, path: str, default: str = None) -> Opti
 
     if not result:
         return default
+
+
+def write_file_atomically(file_path: str, content: Union[str, bytes]) -> None:
+    """
+    Replace the content of a file atomically, so that the file is never left partially written.
+    The content is written to a temporary file in the same directory, which then replaces the file keeping its permissions.
+
+    :param file_path: Path to the file
+    :param content: The new content of the file, either as text (whose newlines are written unchanged) or as bytes
+    """
+    directory, file_name = os.path.split(os.path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{file_name}.", suffix=".tmp")
+    try:
+        open_args = {"mode": "wb"} if isinstance(content, bytes) else {"mode": "w", "newline": ""}
+        with os.fdopen(fd, **open_args) as tmp_file:
+            tmp_file.write(content)
+        if os.path.exists(file_path):
+            shutil.copymode(file_path, tmp_path)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -0,0 +1,128 @@
+"""Test cases for the bump_version module."""
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from mlf_core.bump_version import bump_version
+from mlf_core.bump_version.bump_version import (
+    BumpTransaction,
+    VersionBumper,
+    bump_file,
+    bump_projects,
+    discover_projects,
+)
+from mlf_core.common import version_index
+from mlf_core.common.version_index import load_version_index
+
+MLF_CORE_CFG = """[bumpversion]
+current_version = 0.1.0
+
+[bumpversion_files_whitelisted]
+setup = setup.py
+
+[bumpversion_files_blacklisted]
+docs = docs.txt
+"""
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    """Fixture for a minimal project with a whitelisted and a blacklisted file."""
+    (tmp_path / "mlf_core.cfg").write_text(MLF_CORE_CFG)
+    (tmp_path / "setup.py").write_text('version="0.1.0"\npinned="0.1.0"  # <<MLF-CORE_NO_BUMP>>\n')
+    (tmp_path / "docs.txt").write_text("Since 0.1.0\nCurrent 0.1.0 <<MLF-CORE_FORCE_BUMP>>\n")
+    return tmp_path
+
+
+def test_stage_bump_writes_nothing_before_commit(project: Path) -> None:
+    """It stages the bumped files and only writes them when committing the transaction."""
+    transaction = BumpTransaction(str(project))
+    VersionBumper(str(project), downgrade=True).stage_bump("0.2.0", project, transaction)
+    assert (project / "setup.py").read_text() == 'version="0.1.0"\npinned="0.1.0"  # <<MLF-CORE_NO_BUMP>>\n'
+    assert sorted(Path(path).name for path in transaction.changed_files) == ["docs.txt", "mlf_core.cfg", "setup.py"]
+
+    transaction.commit()
+    assert (project / "setup.py").read_text() == 'version="0.2.0"\npinned="0.1.0"  # <<MLF-CORE_NO_BUMP>>\n'
+    assert (project / "docs.txt").read_text() == "Since 0.1.0\nCurrent 0.2.0 <<MLF-CORE_FORCE_BUMP>>\n"
+    assert "current_version = 0.2.0" in (project / "mlf_core.cfg").read_text()
+
+
+def test_commit_rolls_back_all_files_if_a_write_fails(project: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """It restores every written file if writing any staged file fails."""
+    originals = {path.name: path.read_text() for path in project.iterdir()}
+    transaction = BumpTransaction(str(project))
+    VersionBumper(str(project), downgrade=True).stage_bump("0.2.0", project, transaction)
+    write_file_atomically = bump_version.write_file_atomically
+
+    def fail_bumping_docs(file_path: str, content) -> None:
+        if file_path.endswith("docs.txt") and "0.2.0" in str(content):
+            raise OSError("disk full")
+        write_file_atomically(file_path, content)
+
+    monkeypatch.setattr(bump_version, "write_file_atomically", fail_bumping_docs)
+    with pytest.raises(OSError):
+        transaction.commit()
+    assert {path.name: path.read_text() for path in project.iterdir()} == originals
+
+
+def test_version_index_reuses_cached_occurrences(
+    project: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """It scans unchanged files only once and rescans files modified since they were cached."""
+    cache_path = str(tmp_path / "cache" / "version_index.json")
+    # files modified within the resolution of the modification time are not cached
+    for path in project.iterdir():
+        os.utime(path, (0, 0))
+    first = load_version_index(str(project), cache_path)
+
+    monkeypatch.setattr(version_index, "scan_versions", lambda content: pytest.fail("unchanged file rescanned"))
+    assert load_version_index(str(project), cache_path) == first
+
+    (project / "setup.py").write_text('version="0.1.0"\n')
+    os.utime(project / "setup.py", (1, 1))
+    monkeypatch.undo()
+    setup_py = load_version_index(str(project), cache_path).files[0]
+    assert [occurrence.line for occurrence in setup_py.occurrences] == ['version="0.1.0"\n']
+
+
+def test_bump_file_rescans_changed_files(project: Path) -> None:
+    """It bumps all versions in a single pass and rescans a file whose indexed occurrences are outdated."""
+    setup_py = load_version_index(str(project), cache_path=None).files[0]
+    (project / "setup.py").write_text('name="demo"\nversion="0.1.0"\npinned="0.1.0"  # <<MLF-CORE_NO_BUMP>>\n')
+    bump = bump_file(setup_py.file_path, "0.2.0", blacklisted=False, occurrences=setup_py.occurrences)
+    assert bump.changed_lines == [('version="0.1.0"\n', 'version="0.2.0"\n')]
+    assert bump.bumped_content == 'name="demo"\nversion="0.2.0"\npinned="0.1.0"  # <<MLF-CORE_NO_BUMP>>\n'
+    # the file itself is only written by committing a transaction
+    assert 'version="0.1.0"' in (project / "setup.py").read_text()
+
+
+def test_bump_projects_changes_nothing_if_any_project_cannot_be_bumped(project: Path, tmp_path: Path) -> None:
+    """It finds all projects of a monorepo and writes no file if any project cannot be bumped."""
+    monorepo = tmp_path / "monorepo"
+    for name in ["first", "second", ".hidden/third"]:
+        shutil.copytree(project, monorepo / name, ignore=shutil.ignore_patterns("monorepo"))
+        (monorepo / name / ".mlf_core.yml").write_text(
+            "template_handle: mlflow-pytorch\nproject_slug: demo\nproject_slug_no_hyphen: demo\n"
+        )
+    (monorepo / "first" / "CHANGELOG.rst").write_text("0.1.0 (2021-01-01)\n------------------\n")
+    assert discover_projects(str(monorepo)) == [str(monorepo / "first"), str(monorepo / "second")]
+    originals = read_tree(monorepo)
+
+    with pytest.raises(SystemExit) as exit_info:
+        bump_projects(str(monorepo), "0.2.0", processes=2)
+    assert exit_info.value.code == 1
+    assert read_tree(monorepo) == originals
+
+
+def read_tree(directory: Path) -> dict:
+    """Read all files of a directory tree.
+
+    Args:
+        directory: The directory.
+
+    Returns:
+        The content of every file by its path.
+    """
+    return {path: path.read_text() for path in sorted(directory.rglob("*")) if path.is_file()}
@@ -0,0 +1,192 @@
+"""Test cases for the create module."""
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Dict, Tuple
+
+import pytest
+
+from mlf_core.common.load_yaml import load_yaml_file_read_only
+from mlf_core.create import template_creator
+from mlf_core.create.batch_create import BatchCreate
+from mlf_core.create.render_cache import render_cache_key, render_cached
+from mlf_core.create.template_renderer import RenderManifest, template_environment
+
+
+def read_tree(directory: Path) -> Dict[str, Tuple[str, bool]]:
+    """Read all files of a directory tree.
+
+    Args:
+        directory: The directory.
+
+    Returns:
+        The content and whether the file is executable by the relative path of every file.
+    """
+    return {
+        str(path.relative_to(directory)): (path.read_text(), os.access(path, os.X_OK))
+        for path in sorted(directory.rglob("*"))
+        if path.is_file()
+    }
+
+
+@pytest.fixture
+def templates(tmp_path: Path) -> Path:
+    """Fixture for a directory of templates, which are rendered without a bytecode cache."""
+    templates_path = tmp_path / "templates"
+    project = templates_path / "demo" / "{{ cookiecutter.project_slug }}"
+    (project / "docs").mkdir(parents=True)
+    (templates_path / "demo" / "cookiecutter.json").write_text(json.dumps({"project_slug": "demo", "version": "0.1.0"}))
+    (project / "README.rst").write_text("{{ cookiecutter.project_slug }} {{ cookiecutter.version }}\n")
+    (project / "docs" / "index.rst").write_text("Docs of {{ cookiecutter.project_slug }}\n")
+    (project / "run.sh").write_text("echo {{ cookiecutter.project_slug }}\n")
+    os.chmod(project / "run.sh", 0o755)
+    template_environment(str(templates_path), bytecode_cache_path=None)
+    return templates_path
+
+
+def render_demo(templates: Path, output_dir: str, context: dict) -> None:
+    """Render the demo template.
+
+    Args:
+        templates: The directory of the templates.
+        output_dir: The directory to render the project into.
+        context: The values overriding the defaults of the template.
+    """
+    manifest = RenderManifest(str(templates))
+    manifest.add_template(str(templates / "demo"), context)
+    manifest.render(output_dir)
+
+
+def test_render_cache_hit_equals_miss(templates: Path, tmp_path: Path) -> None:
+    """It renders a template once and clones identical, independent copies from the cache afterwards."""
+    cache_path = str(tmp_path / "cache")
+    context = {"project_slug": "springfield"}
+    key = render_cache_key([str(templates / "demo")], "1.0.0", context)
+    renders = []
+
+    def render(output_dir: str) -> None:
+        renders.append(output_dir)
+        render_demo(templates, output_dir, context)
+
+    assert not render_cached(key, str(tmp_path / "miss"), render, cache_path)
+    assert render_cached(key, str(tmp_path / "hit"), render, cache_path)
+    assert len(renders) == 1
+    rendered = read_tree(tmp_path / "miss")
+    assert rendered["springfield/README.rst"] == ("springfield 0.1.0\n", False)
+    assert rendered["springfield/run.sh"] == ("echo springfield\n", True)
+    assert read_tree(tmp_path / "hit") == rendered
+
+    # modifying a created project must not modify the cached template
+    (tmp_path / "hit" / "springfield" / "README.rst").write_text("changed\n")
+    assert render_cached(key, str(tmp_path / "hit_again"), render, cache_path)
+    assert read_tree(tmp_path / "hit_again") == rendered
+
+
+def test_render_cache_key_changes_with_template_and_context(templates: Path) -> None:
+    """It computes a new key if the template or the context changes."""
+    key = render_cache_key([str(templates / "demo")], "1.0.0", {"project_slug": "springfield"})
+    assert key == render_cache_key([str(templates / "demo")], "1.0.0", {"project_slug": "springfield"})
+    assert key != render_cache_key([str(templates / "demo")], "1.0.0", {"project_slug": "shelbyville"})
+    assert key != render_cache_key([str(templates / "demo")], "1.0.1", {"project_slug": "springfield"})
+    (templates / "demo" / "{{ cookiecutter.project_slug }}" / "README.rst").write_text("changed\n")
+    assert key != render_cache_key([str(templates / "demo")], "1.0.0", {"project_slug": "springfield"})
+
+
+def test_render_manifest_layers_and_hooks(templates: Path, tmp_path: Path) -> None:
+    """It overlays later layers on earlier ones and runs the hooks of all layers in the project directories concurrently."""
+    hooks = templates / "demo" / "hooks"
+    hooks.mkdir()
+    (hooks / "post_gen_project.py").write_text(
+        "import os\nopen('hooked.txt', 'w').write('{{ cookiecutter.project_slug }} ' + os.path.basename(os.getcwd()))\n"
+    )
+    common = templates / "common" / "{{ cookiecutter.common }}"
+    common.mkdir(parents=True)
+    (templates / "common" / "cookiecutter.json").write_text(json.dumps({"common": "common", "project_slug": "demo"}))
+    (common / "README.rst").write_text("Common README of {{ cookiecutter.project_slug }}\n")
+    (common / "LICENSE").write_text("MIT\n")
+    cwd = os.getcwd()
+
+    def render(project_slug: str) -> None:
+        manifest = RenderManifest(str(templates))
+        project_dir = manifest.add_template(str(templates / "demo"), {"project_slug": project_slug})
+        manifest.add_template(str(templates / "common"), {"project_slug": project_slug}, project_dir=project_dir)
+        manifest.render(str(tmp_path / "out"))
+
+    with ThreadPoolExecutor() as executor:
+        list(executor.map(render, ["springfield", "shelbyville"]))
+
+    assert os.getcwd() == cwd
+    for project_slug in ["springfield", "shelbyville"]:
+        project = read_tree(tmp_path / "out" / project_slug)
+        assert project["README.rst"] == (f"Common README of {project_slug}\n", False)
+        assert project["LICENSE"] == ("MIT\n", False)
+        assert project["run.sh"] == (f"echo {project_slug}\n", True)
+        assert project["hooked.txt"] == (f"{project_slug} {project_slug}", False)
+
+
+BATCH_SPECS = """defaults:
+  full_name: Homer Simpson
+  email: homer@example.com
+  github_username: homer
+projects:
+  - project_name: Springfield Torch
+  - project_name: springfield prediction
+    domain: package
+  - project_name: existing
+"""
+
+
+def test_batch_create(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """It creates all projects of a batch file, fails projects whose directory exists and reports every project."""
+    monkeypatch.setattr(template_creator, "render_cached", partial(render_cached, cache_path=str(tmp_path / "cache")))
+    template_environment(bytecode_cache_path=None)
+    specs = tmp_path / "projects.yml"
+    specs.write_text(BATCH_SPECS)
+    output_dir = tmp_path / "projects"
+    (output_dir / "existing").mkdir(parents=True)
+    stdout = sys.stdout
+
+    batch = BatchCreate(str(specs), str(output_dir), workers=3)
+    with pytest.raises(SystemExit) as exit_info:
+        batch.create()
+    assert exit_info.value.code == 1
+    assert sys.stdout is stdout
+    assert [(project.template_handle, project.status, project.error) for project in batch.projects] == [
+        ("mlflow-pytorch", "created", None),
+        ("package-prediction", "created", None),
+        ("mlflow-pytorch", "failed", "The project directory already exists"),
+    ]
+    dot_mlf_core = load_yaml_file_read_only(str(output_dir / "springfield_torch" / ".mlf_core.yml"))
+    assert dot_mlf_core["project_name"] == "springfield torch"
+    assert dot_mlf_core["full_name"] == "Homer Simpson"
+    assert (output_dir / "springfield_prediction" / "setup.py").is_file()
+
+
+def test_batch_create_rejects_invalid_specs(tmp_path: Path) -> None:
+    """It creates no project at all if any project of the batch file is invalid."""
+    specs = tmp_path / "projects.yml"
+    specs.write_text(
+        "projects:\n  - project_name: valid\n    version: 1.0.0\n  - project_name: invalid\n    version: one\n"
+    )
+    with pytest.raises(SystemExit) as exit_info:
+        BatchCreate(str(specs), str(tmp_path / "projects")).create()
+    assert exit_info.value.code == 1
+    assert not (tmp_path / "projects").exists()
+
+
+def test_template_environment_is_shared_and_cached(tmp_path: Path) -> None:
+    """It shares one environment per templates directory and stores the compiled templates in the bytecode cache."""
+    templates_path = tmp_path / "shared_templates"
+    templates_path.mkdir()
+    (templates_path / "README.rst").write_text("{{ cookiecutter.project_slug }}\n")
+    bytecode_cache_path = str(tmp_path / "bytecode")
+
+    environment = template_environment(str(templates_path), bytecode_cache_path)
+    assert template_environment(str(templates_path), bytecode_cache_path) is environment
+    template = environment.get_template("README.rst")
+    assert template.render(cookiecutter={"project_slug": "springfield"}) == "springfield\n"
+    assert environment.get_template("README.rst") is template
+    assert os.listdir(bytecode_cache_path)
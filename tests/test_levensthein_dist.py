@@ -0,0 +1,63 @@
+"""Test cases for the levensthein_dist module."""
+import random
+from typing import List
+
+import pytest
+
+from mlf_core.common.levensthein_dist import SimilarityIndex, levensthein_dist, most_similar_command
+
+HANDLES = ["mlflow-pytorch", "mlflow-tensorflow", "mlflow-xgboost", "mlflow-xgboost_dask", "package-prediction"]
+
+
+def reference_dist(first: str, second: str) -> int:
+    """Compute the Levenshtein distance using the textbook dynamic programming algorithm.
+
+    Args:
+        first: The first string.
+        second: The second string.
+
+    Returns:
+        The Levenshtein distance of both strings.
+    """
+    previous_row = list(range(len(second) + 1))
+    for i, first_char in enumerate(first, 1):
+        row = [i]
+        for j, second_char in enumerate(second, 1):
+            row.append(min(previous_row[j] + 1, row[j - 1] + 1, previous_row[j - 1] + (first_char != second_char)))
+        previous_row = row
+    return previous_row[-1]
+
+
+def random_strings(rng: random.Random, count: int, max_length: int) -> List[str]:
+    """Generate random strings of a small alphabet, so that they share many characters."""
+    return ["".join(rng.choices("abcd-", k=rng.randint(0, max_length))) for _ in range(count)]
+
+
+@pytest.mark.parametrize("max_length", [8, 150])
+def test_levensthein_dist_equals_reference(max_length: int) -> None:
+    """It computes the same distance as the dynamic programming algorithm, also for strings longer than 64 characters."""
+    rng = random.Random(max_length)
+    for first, second in zip(random_strings(rng, 300, max_length), random_strings(rng, 300, max_length)):
+        dist = reference_dist(first, second)
+        assert levensthein_dist(first, second) == dist, (first, second)
+        max_dist = rng.randint(0, max_length)
+        assert levensthein_dist(first, second, max_dist) == min(dist, max_dist + 1), (first, second, max_dist)
+
+
+def test_similarity_index_finds_all_candidates_within_distance() -> None:
+    """It finds the same candidates as comparing the input with every candidate."""
+    rng = random.Random(0)
+    candidates = random_strings(rng, 200, 12)
+    index = SimilarityIndex(candidates)
+    for command in random_strings(rng, 50, 12):
+        for max_dist in range(4):
+            expected = {(reference_dist(command, candidate), candidate) for candidate in candidates}
+            expected = {(dist, candidate) for dist, candidate in expected if dist <= max_dist}
+            assert set(index.search(command, max_dist)) == expected
+
+
+def test_most_similar_command_suggests_handles() -> None:
+    """It uses a handle with a typo automatically and only suggests handles, which differ more."""
+    assert most_similar_command("mlflow-pytorh", set(HANDLES)) == (["mlflow-pytorch"], "use")
+    assert most_similar_command("mlflow-xgb", set(HANDLES)) == (["mlflow-xgboost"], "suggest")
+    assert most_similar_command("unknown", set(HANDLES)) == ([], "")
@@ -0,0 +1,471 @@
+"""Test cases for the lint module."""
+import json
+import random
+import threading
+from collections import Counter
+from concurrent.futures import Future
+from functools import partial
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List, Tuple
+
+import pytest
+from click.testing import CliRunner
+
+from mlf_core import __main__
+from mlf_core.common.version_index import load_version_index
+from mlf_core.create import template_creator
+from mlf_core.create.batch_create import BatchCreate
+from mlf_core.create.render_cache import render_cached
+from mlf_core.create.template_renderer import template_environment
+from mlf_core.lint import file_index, template_linter
+from mlf_core.lint.domains.mlflow import verify_method_not_present
+from mlf_core.lint.file_index import MultiPatternMatcher, ProjectFileIndex
+from mlf_core.lint.lint import run_lint
+from mlf_core.lint.lint_cache import LINT_CACHE_FILE
+from mlf_core.lint.package_index import (
+    PackageIndexClient,
+    PackageIndexProvider,
+    PackageLookup,
+    PackageMetadataCache,
+    SnapshotPackageIndexProvider,
+    _CacheEntry,
+)
+from mlf_core.lint.template_linter import TemplateLinter
+
+DOT_MLF_CORE = "template_handle: mlflow-pytorch\nproject_slug: demo\nproject_slug_no_hyphen: demo\n"
+ENVIRONMENT_YML = """name: demo
+channels:
+  - conda-forge
+  - defaults
+dependencies:
+  - conda-forge::python=3.8.2
+  - pytorch::pytorch=1.9.0
+  - pip
+  - pip:
+    - rich==10.11.0
+"""
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    """Fixture for a minimal project with a conda environment."""
+    (tmp_path / ".mlf_core.yml").write_text(DOT_MLF_CORE)
+    (tmp_path / "environment.yml").write_text(ENVIRONMENT_YML)
+    return tmp_path
+
+
+def lint_conda_environment(project: Path, package_index: PackageIndexProvider) -> Tuple[list, list]:
+    """Run the conda environment check without querying the package indices.
+
+    Args:
+        project: The project directory.
+        package_index: The offline client or package snapshot providing the latest versions.
+
+    Returns:
+        The warned and failed checks.
+    """
+    linter = TemplateLinter(str(project), package_index=package_index)
+    linter.mlflow_check_conda_environment()
+    return linter.warned, linter.failed
+
+
+def test_offline_lint_without_cached_metadata_only_warns(project: Path, tmp_path: Path) -> None:
+    """It warns instead of failing if the package indices are not queried in offline mode."""
+    warned, failed = lint_conda_environment(
+        project, PackageIndexClient(cache=PackageMetadataCache(str(tmp_path / "cache.json")), offline=True)
+    )
+    assert failed == []
+    assert any("offline mode" in reason for _, reason in warned)
+
+
+def test_offline_lint_fails_unknown_conda_packages(project: Path, tmp_path: Path) -> None:
+    """It fails a conda dependency only if every channel answered that it does not know the dependency."""
+    cache = PackageMetadataCache(str(tmp_path / "cache.json"))
+    cache.put("https://api.anaconda.org/package/conda-forge/python", _CacheEntry(404, None, 0.0))
+    cache.put("https://api.anaconda.org/package/pytorch/pytorch", _CacheEntry(200, "1.9.0", 0.0))
+    cache.put("https://pypi.python.org/pypi/rich/json", _CacheEntry(200, "10.11.0", 0.0))
+    warned, failed = lint_conda_environment(project, PackageIndexClient(cache=cache, offline=True))
+    assert failed == [("general-7", "Could not find Conda dependency conda-forge::python=3.8.2 using the Anaconda API")]
+    assert warned == []
+
+
+def test_snapshot_lint_fails_only_packages_known_in_other_channels(project: Path, tmp_path: Path) -> None:
+    """It fails packages the snapshot knows in other channels only and warns about packages missing from the snapshot."""
+    snapshot_path = tmp_path / "snapshot.json"
+    snapshot_path.write_text(
+        json.dumps({"pypi": {}, "conda": {"main": {"python": "3.9.0"}, "pytorch": {"pytorch": "1.9.0"}}})
+    )
+    warned, failed = lint_conda_environment(project, SnapshotPackageIndexProvider(str(snapshot_path)))
+    assert failed == [("general-7", "Could not find Conda dependency conda-forge::python=3.8.2 using the Anaconda API")]
+    assert warned == [("general-7", "rich is not part of the package snapshot: https://pypi.python.org/pypi/rich/json")]
+
+
+def finished_lookup(lookup: PackageLookup) -> Future:
+    """Create a finished package index lookup.
+
+    Args:
+        lookup: The result of the lookup.
+
+    Returns:
+        The finished future.
+    """
+    future: Future = Future()
+    future.set_result(lookup)
+    return future
+
+
+def test_conda_channel_lookups_stop_at_first_found_channel(project: Path) -> None:
+    """It uses the first channel, which knows the dependency, without waiting for the lookups of the other channels."""
+    pending: Future = Future()
+    # answers the pending lookup only if the linter waits for it
+    timer = threading.Timer(
+        5, lambda: pending.cancelled() or pending.set_result(PackageLookup("archive", 200, "9.0.0"))
+    )
+    timer.start()
+    linter = TemplateLinter(str(project))
+    try:
+        linter._check_anaconda_package(
+            "python=3.8.2",
+            {
+                "conda-forge": finished_lookup(PackageLookup("conda-forge", 404)),
+                "main": finished_lookup(PackageLookup("main", 200, "3.9.0")),
+                "archive": pending,
+            },
+        )
+    finally:
+        timer.cancel()
+    assert pending.cancelled()
+    assert linter.warned == [("general-7", "Version 3.8.2 of python is not the latest available: 3.9.0")]
+    assert linter.failed == []
+
+
+def test_incomplete_package_index_provider_cannot_be_created() -> None:
+    """It refuses to create a provider, which does not implement all lookups."""
+
+    class PipOnlyProvider(PackageIndexProvider):
+        def lookup_pip(self, name: str):
+            raise AssertionError("never called")
+
+    with pytest.raises(TypeError):
+        PipOnlyProvider()
+
+
+def test_content_checks_read_every_file_once(project: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """It reads every project file only once for all content based checks."""
+    (project / "README.rst").write_text("TODO MLF-CORE: Write the docs\n{{ cookiecutter.project_slug }}\n")
+    opened: Counter = Counter()
+
+    def counting_open(path, *args, **kwargs):
+        opened[Path(path).name] += 1
+        return open(path, *args, **kwargs)
+
+    monkeypatch.setattr(file_index, "io", SimpleNamespace(open=counting_open))
+    linter = TemplateLinter(str(project))
+    linter.lint_project(
+        linter, check_functions=["check_mlf_core_todos", "check_no_cookiecutter_strings"], is_subclass_calling=False
+    )
+    assert opened == Counter({".mlf_core.yml": 1, "environment.yml": 1, "README.rst": 1})
+    assert linter.warned == [
+        ("general-3", "TODO string found in `README.rst`: Write the docs"),
+        ("general-4", "Cookiecutter string found in 'README.rst': {{ cookiecutter.project_slug }}.."),
+    ]
+
+
+CHANGELOG_RST = """==========
+Changelog
+==========
+
+This project adheres to `Semantic Versioning <https://semver.org/>`_.
+
+
+0.1.0 (2021-01-01)
+------------------
+
+**Added**
+
+* Created the project
+"""
+CACHED_CHECKS = ["check_docker", "check_files_exist", "lint_changelog"]
+
+
+@pytest.fixture
+def ran_checks(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    """Fixture for the names of all checks, which actually ran instead of being replayed from the lint cache."""
+    ran: List[str] = []
+    for name in CACHED_CHECKS:
+        check = getattr(TemplateLinter, name)
+
+        def record(linter, *args, check=check, name=name):
+            ran.append(name)
+            return check(linter, *args)
+
+        monkeypatch.setattr(TemplateLinter, name, record)
+    return ran
+
+
+def lint_incrementally(project: Path) -> Tuple[list, list, list]:
+    """Run the cached checks incrementally and save the lint cache like the lint command does.
+
+    Args:
+        project: The project directory.
+
+    Returns:
+        The passed, warned and failed checks.
+    """
+    linter = TemplateLinter(str(project), incremental=True)
+    linter.lint_project(linter, check_functions=CACHED_CHECKS, is_subclass_calling=False)
+    linter.lint_cache.save()
+    return linter.passed, linter.warned, linter.failed
+
+
+@pytest.fixture
+def lintable_project(project: Path) -> Path:
+    """Fixture for a project with all files the cached checks read."""
+    (project / "Dockerfile").write_text("FROM python:3.8\n")
+    (project / "CHANGELOG.rst").write_text(CHANGELOG_RST)
+    return project
+
+
+@pytest.fixture
+def cached_project(lintable_project: Path, ran_checks: List[str]) -> Path:
+    """Fixture for a project, which was linted incrementally once."""
+    lint_incrementally(lintable_project)
+    assert sorted(ran_checks) == CACHED_CHECKS
+    ran_checks.clear()
+    return lintable_project
+
+
+def test_incremental_lint_replays_unchanged_project(lintable_project: Path, ran_checks: List[str]) -> None:
+    """It replays the results of all checks if the project did not change."""
+    results = lint_incrementally(lintable_project)
+    assert results[0]
+    ran_checks.clear()
+    assert lint_incrementally(lintable_project) == results
+    assert ran_checks == []
+
+
+def test_incremental_lint_reruns_checks_of_changed_inputs(cached_project: Path, ran_checks: List[str]) -> None:
+    """It runs a check again if one of its input files changed and replays all other checks."""
+    (cached_project / "Dockerfile").write_text("RUN echo no base image\n")
+    _, _, failed = lint_incrementally(cached_project)
+    assert ran_checks == ["check_docker"]
+    assert (2, "Dockerfile check failed") in failed
+
+
+def test_incremental_lint_reruns_file_listing_checks(cached_project: Path, ran_checks: List[str]) -> None:
+    """It runs checks depending on the file listing again if a file is added or removed."""
+    (cached_project / "LICENSE").write_text("MIT\n")
+    _, _, failed = lint_incrementally(cached_project)
+    assert ran_checks == ["check_files_exist"]
+    assert not any("LICENSE" in reason for _, reason in failed)
+
+    ran_checks.clear()
+    (cached_project / "LICENSE").unlink()
+    _, _, failed = lint_incrementally(cached_project)
+    assert ran_checks == ["check_files_exist"]
+    assert any("LICENSE" in reason for _, reason in failed)
+
+
+def test_incremental_lint_ignores_cache_of_other_versions(cached_project: Path, ran_checks: List[str]) -> None:
+    """It runs all checks if the lint cache was written by another version of mlf-core."""
+    cache_path = cached_project / LINT_CACHE_FILE
+    cache = json.loads(cache_path.read_text())
+    cache["version"] = "0.0.1"
+    cache_path.write_text(json.dumps(cache))
+    lint_incrementally(cached_project)
+    assert sorted(ran_checks) == CACHED_CHECKS
+
+
+MODEL_PY = """import numpy as np
+import torch
+import torch.nn.functional as F
+from torch.nn.functional import interpolate as up
+
+# torch.bincount(x) is only mentioned in a comment
+DOC = "F.interpolate(x, mode='bilinear') is only mentioned in a string"
+
+
+def forward(x, index, source):
+    counts = np.bincount(x)
+    a = F.interpolate(x, mode='bilinear')
+    b = up(x, None, None, 'bicubic')
+    c = F.interpolate(x, scale_factor=2)
+    d = F.interpolate(x, mode='bicubic')
+    x.index_add_(0, index, source)
+    return torch.sum(a + b + c + d) + counts
+"""
+FORBIDDEN_FUNCTIONS = ["bincount", "index_add", "interpolate", "interpolate('bicubic')", "interpolate(mode='bilinear')"]
+
+
+def find_forbidden_functions(project: Path, files: dict) -> List[str]:
+    """Check the Python files of a project for the forbidden functions of the torch module.
+
+    Args:
+        project: The project directory.
+        files: The contents of the Python files of the project package by their file names.
+
+    Returns:
+        The found functions and their locations relative to the project package.
+    """
+    (project / "demo").mkdir()
+    for name, content in files.items():
+        (project / "demo" / name).write_text(content)
+    linter = TemplateLinter(str(project))
+    verify_method_not_present(linter, FORBIDDEN_FUNCTIONS, "mlflow-pytorch-3", ("torch",))
+    assert {code for code, _ in linter.failed} <= {"mlflow-pytorch-3"}
+    return [
+        reason.replace(f"{project / 'demo'}/", "").replace(" operates non-deterministically.", "")
+        for _, reason in linter.failed
+    ]
+
+
+def test_verify_method_not_present_resolves_usages(project: Path) -> None:
+    """It resolves imported aliases, compares literal arguments and ignores other modules, comments and strings."""
+    assert find_forbidden_functions(project, {"model.py": MODEL_PY}) == [
+        "interpolate(mode='bilinear') found in model.py:12",
+        "interpolate('bicubic') found in model.py:13",
+        "interpolate found in model.py:14",
+        "interpolate('bicubic') found in model.py:15",
+        "index_add found in model.py:16",
+    ]
+
+
+def test_verify_method_not_present_falls_back_to_substrings(project: Path) -> None:
+    """It searches files, which cannot be parsed, for the plain function names."""
+    assert find_forbidden_functions(project, {"broken.py": "def broken(:\n    return torch.bincount(x)\n"}) == [
+        "bincount found in broken.py:2"
+    ]
+
+
+@pytest.fixture
+def created_project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Fixture for a created mlflow-pytorch project."""
+    monkeypatch.setattr(template_creator, "render_cached", partial(render_cached, cache_path=str(tmp_path / "cache")))
+    monkeypatch.setattr(template_linter, "load_version_index", partial(load_version_index, cache_path=None))
+    template_environment(bytecode_cache_path=None)
+    specs = tmp_path / "projects.yml"
+    specs.write_text(
+        "defaults:\n  full_name: Homer Simpson\n  email: homer@example.com\n  github_username: homer\n"
+        "projects:\n  - project_name: springfield\n"
+    )
+    BatchCreate(str(specs), str(tmp_path / "projects")).create()
+    return tmp_path / "projects" / "springfield"
+
+
+@pytest.fixture
+def snapshot_path(tmp_path: Path) -> Path:
+    """Fixture for an empty package snapshot, so that no package index is queried."""
+    path = tmp_path / "snapshot.json"
+    path.write_text(json.dumps({"pypi": {}, "conda": {}}))
+    return path
+
+
+@pytest.fixture
+def lint_args(created_project: Path, snapshot_path: Path) -> List[str]:
+    """Fixture for the arguments of linting a created and a broken project in two processes."""
+    broken_project = created_project.parent / "broken"
+    broken_project.mkdir()
+    project_dirs = [str(created_project), str(broken_project)]
+    return ["lint", *project_dirs, "--processes", "2", "--package-snapshot", str(snapshot_path)]
+
+
+def test_concurrent_lint_checks_keep_the_order_of_results(created_project: Path, snapshot_path: Path) -> None:
+    """It reports the same results in the same order regardless of the number of concurrently running checks."""
+    sequential = run_lint(str(created_project), jobs=1, package_snapshot=str(snapshot_path), quiet=True)
+    assert sequential.ok
+    for _ in range(3):
+        concurrent = run_lint(str(created_project), jobs=8, package_snapshot=str(snapshot_path), quiet=True)
+        assert (concurrent.passed, concurrent.warned, concurrent.failed) == (
+            sequential.passed,
+            sequential.warned,
+            sequential.failed,
+        )
+
+
+def test_lint_projects_as_json(lint_args: List[str]) -> None:
+    """It lints all projects in separate processes and reports the results of every project in order as JSON."""
+    result = CliRunner().invoke(__main__.mlf_core_cli, [*lint_args, "--format", "json"])
+    assert result.exit_code == 1
+    created, broken = json.loads(result.output)
+    assert created["project_dir"] == lint_args[1]
+    assert created["template_handle"] == "mlflow-pytorch"
+    assert created["error"] is None
+    assert created["passed"]
+    assert all(set(check) == {"code", "message"} for kind in ("passed", "warned", "failed") for check in created[kind])
+    assert broken == {
+        "project_dir": lint_args[2],
+        "template_handle": None,
+        "error": ".mlf_core.yml not found. Is this a mlf-core project?",
+        "passed": [],
+        "warned": [],
+        "failed": [],
+    }
+
+
+def test_lint_projects_as_sarif(lint_args: List[str], tmp_path: Path) -> None:
+    """It writes a SARIF log with one rule per code, which reports the critical error of the broken project."""
+    output = tmp_path / "lint.sarif"
+    result = CliRunner().invoke(__main__.mlf_core_cli, [*lint_args, "--format", "sarif", "--output", str(output)])
+    assert result.exit_code == 1
+    sarif_log = json.loads(output.read_text())
+    assert sarif_log["version"] == "2.1.0"
+    (run,) = sarif_log["runs"]
+    rule_ids = [rule["id"] for rule in run["tool"]["driver"]["rules"]]
+    assert rule_ids and rule_ids == sorted({sarif_result["ruleId"] for sarif_result in run["results"]})
+    assert {sarif_result["level"] for sarif_result in run["results"]} <= {"warning", "error"}
+    (invocation,) = run["invocations"]
+    assert invocation["executionSuccessful"] is False
+    assert [notification["message"]["text"] for notification in invocation["toolExecutionNotifications"]] == [
+        f"{lint_args[2]}: .mlf_core.yml not found. Is this a mlf-core project?"
+    ]
+
+
+def find_lines_naively(text: str, tokens: List[str]) -> List[Tuple[int, str, List[str]]]:
+    """Search every line of a text for every token separately.
+
+    Args:
+        text: The text to search.
+        tokens: The tokens to search for.
+
+    Returns:
+        The line number, the line and the contained tokens of every line containing any token.
+    """
+    found_lines = []
+    for line_number, line in enumerate(text.split("\n"), 1):
+        found = [token for token in dict.fromkeys(tokens) if token in line]
+        if found:
+            found_lines.append((line_number, line, found))
+    return found_lines
+
+
+def test_multi_pattern_matcher_equals_substring_scan() -> None:
+    """It finds the same lines and tokens as searching every token separately, also for overlapping tokens."""
+    rng = random.Random(42)
+    for _ in range(500):
+        tokens = ["".join(rng.choices("abc", k=rng.randint(1, 4))) for _ in range(rng.randint(1, 6))]
+        text = "".join(rng.choices("abc\n", k=rng.randint(0, 80)))
+        assert list(MultiPatternMatcher(tokens).find_lines(text)) == find_lines_naively(text, tokens), (tokens, text)
+    overlapping = ["TODO", "TODO MLF-CORE:", "MLF-CORE TODO:", "CORE"]
+    text = "x = 1\n# TODO MLF-CORE: and MLF-CORE TODO:\nTODO\n"
+    assert list(MultiPatternMatcher(overlapping).find_lines(text)) == [
+        (2, "# TODO MLF-CORE: and MLF-CORE TODO:", overlapping),
+        (3, "TODO", ["TODO"]),
+    ]
+
+
+def test_project_file_index_respects_gitignore_and_late_registrations(tmp_path: Path) -> None:
+    """It skips ignored files only for patterns respecting the .gitignore file and scans patterns registered later on."""
+    (tmp_path / ".gitignore").write_text("build/\n")
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "generated.py").write_text("# TODO MLF-CORE: generated\n")
+    (tmp_path / "model.py").write_text("import torch\n# TODO MLF-CORE: train\n")
+    file_index = ProjectFileIndex(str(tmp_path))
+    file_index.register("todos", tokens=["TODO MLF-CORE:"], respect_gitignore=True)
+    file_index.register("all_todos", tokens=["TODO MLF-CORE:"])
+    assert [(match.path, match.line_number) for match in file_index.matches("todos")] == [("model.py", 2)]
+    assert [match.path for match in file_index.matches("all_todos")] == ["model.py", "build/generated.py"]
+
+    file_index.register("imports", tokens=["import"], file_filter=lambda rel_path: rel_path.endswith(".py"))
+    assert [(match.path, match.line) for match in file_index.matches("imports")] == [("model.py", "import torch")]
+    assert [(match.path, match.line_number) for match in file_index.matches("todos")] == [("model.py", 2)]
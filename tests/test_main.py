@@ -1,9 +1,23 @@
 """Test cases for the __main__ module."""
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
 import pytest
 from click.testing import CliRunner
 
 from mlf_core import __main__
 
+# cumulative import time budgets in microseconds for a cold start of mlf-core
+STARTUP_IMPORT_BUDGET = 750_000
+LINT_IMPORT_BUDGET = 1_500_000
+# import times depend on the machine, so the budgets are only checked if this environment variable is set
+CHECK_IMPORT_BUDGETS_ENV_VAR = "MLF_CORE_CHECK_IMPORT_BUDGETS"
+# heavy dependencies, which must only be imported by the commands requiring them
+HEAVY_MODULES = ["git", "github", "cookiecutter", "questionary"]
+
 
 @pytest.fixture
 def runner() -> CliRunner:
@@ -15,3 +29,70 @@ def test_main_succeeds(runner: CliRunner) -> None:
     """It exits with a status code of zero."""
     result = runner.invoke(__main__.mlf_core_cli)
     assert result.exit_code == 0
+
+
+@pytest.mark.parametrize("processes", ["0", "-1"])
+def test_bump_version_rejects_invalid_process_counts(runner: CliRunner, processes: str) -> None:
+    """It rejects process counts below one before bumping anything."""
+    result = runner.invoke(__main__.mlf_core_cli, ["bump-version", "--batch", "-p", processes, "1.0.0", "."])
+    assert result.exit_code == 2
+    assert "is not in the range x>=1" in result.output
+
+
+def import_times(args: List[str]) -> Tuple[int, Dict[str, int]]:
+    """Invoke mlf-core in a fresh interpreter using -X importtime.
+
+    Args:
+        args: The command line arguments passed to mlf-core.
+
+    Returns:
+        The total import time and the cumulative import time of every imported module in microseconds.
+    """
+    code = (
+        "from mlf_core.__main__ import mlf_core_cli\n"
+        "try:\n"
+        f"    mlf_core_cli({args!r}, prog_name='mlf-core', standalone_mode=False)\n"
+        "except SystemExit:\n"
+        "    pass\n"
+    )
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    total, modules = 0, {}
+    for line in process.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)", line)
+        if match:
+            modules[match.group(3)] = int(match.group(1))
+            # only top level imports count towards the total, nested ones are part of their cumulative time
+            if len(match.group(2)) == 1:
+                total += int(match.group(1))
+    return total, modules
+
+
+def assert_within_import_budget(total: int, budget: int) -> None:
+    """Check the total import time against a budget if the budgets are enabled by MLF_CORE_CHECK_IMPORT_BUDGETS.
+
+    Args:
+        total: The total import time in microseconds.
+        budget: The import time budget in microseconds.
+    """
+    if os.environ.get(CHECK_IMPORT_BUDGETS_ENV_VAR):
+        assert total < budget
+
+
+@pytest.mark.parametrize("args", [["--version"], ["list"]])
+def test_startup_imports_no_heavy_modules(args: List[str]) -> None:
+    """It starts without importing the dependencies of other commands (and within the import time budget if enabled)."""
+    total, modules = import_times(args)
+    assert "mlf_core.__main__" in modules
+    assert not [module for module in HEAVY_MODULES if module in modules]
+    assert not [module for module in modules if module.startswith("mlf_core.lint")]
+    assert_within_import_budget(total, STARTUP_IMPORT_BUDGET)
+
+
+def test_lint_imports_no_heavy_modules() -> None:
+    """It lints without importing git, Github or cookiecutter (and within the import time budget if enabled)."""
+    total, modules = import_times(["lint", "does-not-exist"])
+    assert "mlf_core.lint.lint" in modules
+    assert not [module for module in ("git", "github", "cookiecutter") if module in modules]
+    assert_within_import_budget(total, LINT_IMPORT_BUDGET)
@@ -0,0 +1,185 @@
+"""Test cases for the sync module."""
+import os
+import subprocess
+from pathlib import Path
+
+import git as gitpython
+import pytest
+
+from mlf_core.common.template_registry import load_template_registry
+from mlf_core.sync.fleet_sync import FleetSync, load_fleet_manifest
+from mlf_core.sync.sync import TemplateSync
+
+GIT_IDENTITY = {
+    "GIT_AUTHOR_NAME": "Homer",
+    "GIT_AUTHOR_EMAIL": "homer@example.com",
+    "GIT_COMMITTER_NAME": "Homer",
+    "GIT_COMMITTER_EMAIL": "homer@example.com",
+}
+
+
+def git(repo: Path, *args: str) -> str:
+    """Run a git command in a repository.
+
+    Args:
+        repo: The repository.
+        args: The arguments of the git command.
+
+    Returns:
+        The output of the command.
+    """
+    return subprocess.run(
+        ["git", *args], cwd=repo, check=True, stdout=subprocess.PIPE, universal_newlines=True
+    ).stdout.strip()
+
+
+def write_files(directory: Path, files: dict) -> None:
+    """Write files relative to a directory.
+
+    Args:
+        directory: The directory.
+        files: The contents of the files by their relative paths.
+    """
+    for path, content in files.items():
+        (directory / path).parent.mkdir(parents=True, exist_ok=True)
+        (directory / path).write_text(content)
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Fixture for a project, whose TEMPLATE branch contains an unchanged, a modified, a deleted and a blacklisted file."""
+    for name, value in GIT_IDENTITY.items():
+        monkeypatch.setenv(name, value)
+    project_dir = tmp_path / "project"
+    project_dir.mkdir()
+    git(project_dir, "init", "-q", "-b", "TEMPLATE")
+    write_files(
+        project_dir,
+        {
+            ".gitignore": "__pycache__/\n",
+            "README.rst": "unchanged\n",
+            "docs/index.rst": "old\n",
+            "deleted.txt": "deleted\n",
+            "CHANGELOG.rst": "kept\n",
+        },
+    )
+    git(project_dir, "add", ".")
+    git(project_dir, "commit", "-q", "-m", "Template")
+    git(project_dir, "checkout", "-q", "-b", "development")
+    write_files(project_dir, {"own.py": "print('own work')\n"})
+    git(project_dir, "add", ".")
+    git(project_dir, "commit", "-q", "-m", "Own work")
+    return project_dir
+
+
+@pytest.fixture
+def rendered_dir(tmp_path: Path) -> Path:
+    """Fixture for a rendered template, which modifies, adds and deletes files of the TEMPLATE branch."""
+    rendered = tmp_path / "rendered"
+    write_files(
+        rendered,
+        {
+            ".gitignore": "__pycache__/\n",
+            "README.rst": "unchanged\n",
+            "docs/index.rst": "new\n",
+            "added.sh": "echo added\n",
+        },
+    )
+    os.chmod(rendered / "added.sh", 0o755)
+    return rendered
+
+
+@pytest.fixture
+def syncer(project: Path) -> TemplateSync:
+    """Fixture for the syncer of the project, which blacklists the changelog."""
+    syncer = TemplateSync(project, "", gh_username="homer", token="token")
+    syncer.repo = gitpython.Repo(project)
+    syncer.blacklisted_globs = ["CHANGELOG.rst"]
+    return syncer
+
+
+def test_diff_template_project(syncer: TemplateSync, rendered_dir: Path) -> None:
+    """It writes only added or modified files and deletes files missing from the template, except blacklisted ones."""
+    files_to_write, files_to_delete = syncer.diff_template_project(str(rendered_dir), syncer.template_branch_commit())
+    assert files_to_write == ["added.sh", "docs/index.rst"]
+    assert files_to_delete == ["deleted.txt"]
+
+
+def test_diff_template_project_skips_ignored_files(syncer: TemplateSync, project: Path, rendered_dir: Path) -> None:
+    """It skips untracked files, which are ignored by the rendered project or the exclude file of the project."""
+    write_files(rendered_dir, {"__pycache__/x.pyc": "bytecode", "docs/build/index.html": "<html/>"})
+    (project / ".git" / "info").mkdir(exist_ok=True)
+    (project / ".git" / "info" / "exclude").write_text("build/\n")
+    files_to_write, files_to_delete = syncer.diff_template_project(str(rendered_dir), syncer.template_branch_commit())
+    assert files_to_write == ["added.sh", "docs/index.rst"]
+    assert files_to_delete == ["deleted.txt"]
+
+
+def test_commit_template_changes_with_git_plumbing(syncer: TemplateSync, project: Path, rendered_dir: Path) -> None:
+    """It commits the changes onto the TEMPLATE branch without touching the checked out branch or the working tree."""
+    head = git(project, "rev-parse", "HEAD")
+    template_commit = syncer.template_branch_commit()
+    files_to_write, files_to_delete = syncer.diff_template_project(str(rendered_dir), template_commit)
+
+    assert syncer.commit_template_changes(str(rendered_dir), files_to_write, files_to_delete, template_commit)
+    assert syncer.made_changes
+    assert git(project, "rev-parse", "TEMPLATE^") == template_commit.hexsha
+    assert git(project, "ls-tree", "-r", "--name-only", "TEMPLATE").split() == [
+        ".gitignore",
+        "CHANGELOG.rst",
+        "README.rst",
+        "added.sh",
+        "docs/index.rst",
+    ]
+    assert git(project, "show", "TEMPLATE:docs/index.rst") == "new"
+    assert git(project, "ls-tree", "TEMPLATE", "added.sh").startswith("100755 blob")
+    # the project branch and its working tree are unchanged
+    assert git(project, "rev-parse", "HEAD") == head
+    assert git(project, "symbolic-ref", "--short", "HEAD") == "development"
+    assert git(project, "status", "--porcelain") == ""
+
+
+def test_sync_applies_the_filters_of_the_project(syncer: TemplateSync, project: Path, rendered_dir: Path) -> None:
+    """It hashes and commits the rendered files with the end-of-line conversion of the project applied like git add."""
+    git(project, "config", "core.autocrlf", "true")
+    for path in ["README.rst", "docs/index.rst"]:
+        (rendered_dir / path).write_bytes((rendered_dir / path).read_bytes().replace(b"\n", b"\r\n"))
+    template_commit = syncer.template_branch_commit()
+    files_to_write, files_to_delete = syncer.diff_template_project(str(rendered_dir), template_commit)
+    assert files_to_write == ["added.sh", "docs/index.rst"]
+
+    assert syncer.commit_template_changes(str(rendered_dir), files_to_write, files_to_delete, template_commit)
+    assert git(project, "cat-file", "-s", "TEMPLATE:docs/index.rst") == str(len("new\n"))
+
+
+def test_commit_template_changes_without_changes(syncer: TemplateSync, project: Path) -> None:
+    """It does not create a commit if the rendered template equals the TEMPLATE branch."""
+    template_commit = syncer.template_branch_commit()
+    assert not syncer.commit_template_changes(str(project), [], [], template_commit)
+    assert not syncer.made_changes
+    assert git(project, "rev-parse", "TEMPLATE") == template_commit.hexsha
+
+
+def test_fleet_sync_reports_every_project(project: Path, tmp_path: Path) -> None:
+    """It syncs all projects of a manifest once, reports their status and fails if any project failed."""
+    template_version = load_template_registry().version("mlflow-pytorch")
+    write_files(
+        project,
+        {
+            ".mlf_core.yml": f"template_handle: mlflow-pytorch\ntemplate_version: '{template_version} # <<MLF-CORE_NO_BUMP>>'\n"
+        },
+    )
+    git(project, "add", ".")
+    git(project, "commit", "-q", "-m", "Add .mlf_core.yml")
+    manifest = tmp_path / "fleet.yml"
+    manifest.write_text("projects:\n  - project\n  - path: ./project\n  - missing\n")
+    assert load_fleet_manifest(str(manifest)) == [str(project), str(tmp_path / "missing")]
+
+    fleet = FleetSync(str(manifest), workers=2, token="token", gh_username="homer")
+    with pytest.raises(SystemExit) as exit_info:
+        fleet.sync()
+    assert exit_info.value.code == 1
+    assert [(result.status, result.error) for result in fleet.results] == [
+        ("up to date", None),
+        ("failed", "The project directory does not exist"),
+    ]
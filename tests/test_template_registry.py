@@ -0,0 +1,86 @@
+"""Test cases for the template_registry module."""
+import os
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from mlf_core.common import template_registry
+from mlf_core.common.load_yaml import load_yaml_file_read_only
+from mlf_core.common.template_registry import load_template_registry
+
+AVAILABLE_TEMPLATES = """mlflow:
+    pytorch:
+        name: MLflow PyTorch
+        handle: mlflow-pytorch
+        version: {version}
+"""
+
+
+@pytest.fixture
+def parsed(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    """Fixture for the paths of all parsed available_templates.yml files, which starts without any loaded registry."""
+    parsed_paths: List[str] = []
+
+    def load_yaml(path: str) -> dict:
+        parsed_paths.append(path)
+        return load_yaml_file_read_only(path)
+
+    monkeypatch.setattr(template_registry, "load_yaml_file_read_only", load_yaml)
+    monkeypatch.setattr(template_registry, "_registries", {})
+    return parsed_paths
+
+
+@pytest.fixture
+def available_templates(tmp_path: Path) -> Path:
+    """Fixture for an available_templates.yml file."""
+    path = tmp_path / "available_templates.yml"
+    path.write_text(AVAILABLE_TEMPLATES.format(version="1.0.0"))
+    return path
+
+
+def load_fresh_registry(path: Path, cache_path: Path) -> template_registry.TemplateRegistry:
+    """Load a registry like a new mlf-core process, which did not load any registry yet.
+
+    Args:
+        path: The available_templates.yml file.
+        cache_path: The pickle cache.
+
+    Returns:
+        The loaded registry.
+    """
+    template_registry._registries.clear()
+    return load_template_registry(str(path), str(cache_path))
+
+
+def test_registry_is_loaded_from_cache(available_templates: Path, tmp_path: Path, parsed: List[str]) -> None:
+    """It parses an unchanged available_templates.yml file only once, also across processes."""
+    cache_path = tmp_path / "cache" / "template_registry.pickle"
+    registry = load_template_registry(str(available_templates), str(cache_path))
+    assert load_template_registry(str(available_templates), str(cache_path)) is registry
+    assert load_fresh_registry(available_templates, cache_path).version("mlflow-pytorch") == "1.0.0"
+    assert parsed == [str(available_templates)]
+
+
+def test_registry_cache_is_invalidated(available_templates: Path, tmp_path: Path, parsed: List[str]) -> None:
+    """It parses the available_templates.yml file again if its modification time or size changed."""
+    cache_path = tmp_path / "template_registry.pickle"
+    load_fresh_registry(available_templates, cache_path)
+    # same size, but a different modification time
+    available_templates.write_text(AVAILABLE_TEMPLATES.format(version="2.0.0"))
+    os.utime(available_templates, ns=(0, 0))
+    assert load_fresh_registry(available_templates, cache_path).version("mlflow-pytorch") == "2.0.0"
+    # same modification time, but a different size
+    available_templates.write_text(AVAILABLE_TEMPLATES.format(version="10.0.0"))
+    os.utime(available_templates, ns=(0, 0))
+    assert load_fresh_registry(available_templates, cache_path).version("mlflow-pytorch") == "10.0.0"
+    assert len(parsed) == 3
+
+
+def test_corrupt_registry_cache_is_replaced(available_templates: Path, tmp_path: Path, parsed: List[str]) -> None:
+    """It parses the available_templates.yml file if the cache cannot be read and writes a valid cache afterwards."""
+    cache_path = tmp_path / "template_registry.pickle"
+    cache_path.write_bytes(b"not a pickle")
+    assert load_fresh_registry(available_templates, cache_path).version("mlflow-pytorch") == "1.0.0"
+    assert load_fresh_registry(available_templates, cache_path).version("mlflow-pytorch") == "1.0.0"
+    assert len(parsed) == 1
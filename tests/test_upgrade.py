@@ -0,0 +1,65 @@
+"""Test cases for the upgrade module."""
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.error import URLError
+
+import pytest
+
+from mlf_core import __main__
+from mlf_core.upgrade import upgrade
+from mlf_core.upgrade.upgrade import BackgroundUpgradeCheck, UpgradeCommand
+
+
+@pytest.fixture
+def offline(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> list:
+    """Fixture for an empty upgrade check cache and an unreachable PyPI, which records all requests."""
+    requests = []
+
+    def urlopen(request, timeout):
+        requests.append(request.full_url)
+        raise URLError("offline")
+
+    monkeypatch.setattr(upgrade, "UPGRADE_CHECK_CACHE_PATH", str(tmp_path / "upgrade_check.json"))
+    monkeypatch.setattr(upgrade.urllib.request, "urlopen", urlopen)
+    monkeypatch.delenv(upgrade.UPGRADE_CHECK_INTERVAL_ENV_VAR, raising=False)
+    return requests
+
+
+def test_skip_upgrade_check(monkeypatch: pytest.MonkeyPatch) -> None:
+    """It does not start the upgrade check if MLF_CORE_SKIP_UPGRADE_CHECK is set."""
+    monkeypatch.setenv(upgrade.SKIP_UPGRADE_CHECK_ENV_VAR, "1")
+    monkeypatch.setattr(BackgroundUpgradeCheck, "start", lambda self: pytest.fail("upgrade check started"))
+    monkeypatch.setattr(__main__, "mlf_core_cli", lambda: None)
+    monkeypatch.setattr(sys, "excepthook", sys.excepthook)
+    __main__.main()
+    assert not BackgroundUpgradeCheck.is_enabled()
+
+
+def test_fetch_latest_version_uses_fresh_cache(offline: list, monkeypatch: pytest.MonkeyPatch) -> None:
+    """It uses the cached latest version without querying PyPI until the upgrade check interval passed."""
+    UpgradeCommand.cache_latest_version("9.9.9")
+    assert UpgradeCommand.fetch_latest_version(use_cache=True) == "9.9.9"
+    assert offline == []
+
+    monkeypatch.setenv(upgrade.UPGRADE_CHECK_INTERVAL_ENV_VAR, "0")
+    assert UpgradeCommand.fetch_latest_version(use_cache=True) is None
+    assert offline == [upgrade.PYPI_MLF_CORE_URL]
+
+
+def test_report_does_not_wait_for_hanging_check(monkeypatch: pytest.MonkeyPatch) -> None:
+    """It reports nothing and returns after the request timeout if the upgrade check hangs."""
+    release = threading.Event()
+    monkeypatch.setattr(upgrade, "UPGRADE_CHECK_TIMEOUT", 0.1)
+    monkeypatch.setattr(UpgradeCommand, "fetch_latest_version", lambda use_cache: release.wait(10))
+    monkeypatch.setattr(
+        UpgradeCommand, "compare_with_latest_version", lambda version: pytest.fail("unfinished check reported")
+    )
+    upgrade_check = BackgroundUpgradeCheck().start()
+    start = time.monotonic()
+    try:
+        upgrade_check.report()
+        assert time.monotonic() - start < 5
+    finally:
+        release.set()